@@ -1,29 +1,139 @@
-from flask import Flask, render_template, request, jsonify, Response
+from flask import Flask, render_template, request, jsonify, Response, g
 from flask_cors import CORS
-import sqlite3
 import os
 import csv
 import io
-import subprocess
-from datetime import datetime, timedelta
+import zlib
+import json
+import base64
+import hashlib
+import functools
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from db import ConnectionPool
+import migrations
+import queries
+import timeseries
+import search
+from dispatch_queue import DispatchQueue
+from events import EventBroadcaster, ChangeWatcher
+from result_cache import ResultCache, VersionedCache
+from notification_outbox import NotificationOutbox
+from notification_digest import DigestScheduler, RateLimiter
+from notification_relay import NotificationRelay
+from health import HealthProber, CHECKS as HEALTH_CHECKS
+from session_registry import SessionRegistry, session_label, record_spawn, record_finish
+from clawdbot_transport import make_transport, TransportTimeout
+from slow_queries import SlowQueryLog
+from settings import Settings
+from leader import LeaderLock
+from metrics import MetricsRegistry, SQL_BUCKETS, statement_kind, start_trace, end_trace, current_trace
 
 app = Flask(__name__)
 CORS(app)
 
 # Configuration
-DATABASE = 'ai_activities.db'
-ENABLE_NOTIFICATIONS = os.environ.get('AI_TRACKER_NOTIFICATIONS', 'true').lower() == 'true'
+DATABASE = os.environ.get('AI_TRACKER_DATABASE', 'ai_activities.db')
+DB_POOL_SIZE = int(os.environ.get('AI_TRACKER_DB_POOL_SIZE', '16'))
+ENABLE_NOTIFICATIONS = os.environ.get('AI_TRACKER_NOTIFICATIONS', 'true').lower() == 'true'  # default for the shared setting
+SETTINGS_TTL = float(os.environ.get('AI_TRACKER_SETTINGS_TTL', '1'))  # seconds a worker caches shared settings
+LEADER_RETRY_SECONDS = float(os.environ.get('AI_TRACKER_LEADER_RETRY_SECONDS', '5'))  # until another worker takes over probing and delivery
+SHUTDOWN_DRAIN_SECONDS = float(os.environ.get('AI_TRACKER_DRAIN_SECONDS', '30'))  # finish dispatches and notifications on stop
 SERVER_PORT = int(os.environ.get('AI_TRACKER_PORT', '8080'))
 AUTO_EXECUTE = os.environ.get('AI_TRACKER_AUTO_EXECUTE', 'true').lower() == 'true'
 NOTIFICATION_CHANNEL = os.environ.get('AI_TRACKER_NOTIFICATION_CHANNEL', 'telegram')
+NOTIFICATION_COALESCE_SECONDS = float(os.environ.get('AI_TRACKER_NOTIFICATION_COALESCE_SECONDS', '5'))
+NOTIFICATION_QUEUE_SIZE = int(os.environ.get('AI_TRACKER_NOTIFICATION_QUEUE_SIZE', '200'))
+NOTIFICATION_DIGEST_SECONDS = float(os.environ.get('AI_TRACKER_NOTIFICATION_DIGEST_SECONDS', '60'))  # 0 sends every update
+NOTIFICATION_RATE_PER_MINUTE = float(os.environ.get('AI_TRACKER_NOTIFICATION_RATE_PER_MINUTE', '20'))  # per channel, 0 for no limit
+NOTIFICATION_BURST = int(os.environ.get('AI_TRACKER_NOTIFICATION_BURST', '5'))  # sends allowed back to back
+PAGE_SIZE_DEFAULT = 200  # GET /api/activities page size
+PAGE_SIZE_MAX = 1000
+SEARCH_PAGE_SIZE_DEFAULT = 20  # GET /api/search page size
+SEARCH_PAGE_SIZE_MAX = 100
+SEARCH_EXACT_LIMIT = 1000  # matches ranked by relevance and faceted exactly; broader queries go newest first
+EXPORT_BATCH_ROWS = 1000  # rows fetched and formatted per export chunk
+BULK_CHUNK_ROWS = 1000  # rows per bulk import transaction
+POSITION_GAP = 1024  # spacing between board positions, so a move rewrites one row
+MOVE_MAX = 500  # moves per POST /api/activities/move
+BULK_MAX_ERRORS = 100  # validation errors reported per bulk import
+EVENT_BUFFER_SIZE = int(os.environ.get('AI_TRACKER_EVENT_BUFFER_SIZE', '100'))  # per SSE client
+EVENT_KEEPALIVE_SECONDS = 15
+EVENT_POLL_SECONDS = float(os.environ.get('AI_TRACKER_EVENT_POLL_SECONDS', '1'))
+EVENT_MAX_ROWS = 100  # larger change sets are announced without rows
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('AI_TRACKER_RESULT_CACHE_MB', '8')) * 1024 * 1024
+RESULT_CACHE_TTL = int(os.environ.get('AI_TRACKER_RESULT_CACHE_TTL', '300'))  # seconds
+CALENDAR_DEFAULT_DAYS = 30  # ICS feed window when `from` is not given
+VEVENT_CACHE_SIZE = int(os.environ.get('AI_TRACKER_VEVENT_CACHE_SIZE', '10000'))
+HEALTH_INTERVAL_SECONDS = float(os.environ.get('AI_TRACKER_HEALTH_INTERVAL_SECONDS', '30'))  # between healthy probes
+HEALTH_BACKOFF_SECONDS = 5  # first retry after a failed probe, doubling per failure
+HEALTH_BACKOFF_MAX_SECONDS = float(os.environ.get('AI_TRACKER_HEALTH_BACKOFF_MAX_SECONDS', '300'))
+SQL_TIMING = os.environ.get('AI_TRACKER_SQL_TIMING', 'true').lower() == 'true'  # time every statement for /api/metrics
+SLOW_REQUEST_MS = float(os.environ.get('AI_TRACKER_SLOW_REQUEST_MS', '0'))  # log a SQL/Clawdbot breakdown above this; 0 is off
+SLOW_QUERY_MS = float(os.environ.get('AI_TRACKER_SLOW_QUERY_MS', '100'))  # log statements slower than this, with plans; 0 is off
+SLOW_QUERY_PLAN_TTL = 300  # seconds before a slow query's plan is captured again
 
 # Integration settings
 CLAWDBOT_TIMEOUT = 30  # seconds for Clawdbot operations
+DISPATCH_WORKERS = int(os.environ.get('AI_TRACKER_DISPATCH_WORKERS', '2'))
+DISPATCH_TIMEOUT = int(os.environ.get('AI_TRACKER_DISPATCH_TIMEOUT', str(CLAWDBOT_TIMEOUT)))
+DISPATCH_TIMEOUT_MAX = CLAWDBOT_TIMEOUT * 10  # longest timeout a client may ask for, in seconds
 SESSION_CLEANUP_POLICY = 'keep'  # keep sessions for debugging
+SESSION_REFRESH_SECONDS = float(os.environ.get('AI_TRACKER_SESSION_REFRESH_SECONDS', '10'))
+SESSION_HISTORY_LIMIT = 10  # spawns returned per activity
 DEFAULT_BROWSER = 'Safari'  # macOS default
+# 'cli' runs clawdbot per call; 'http' keeps a pooled connection to the gateway (CLI as fallback);
+# 'auto' uses http when a gateway url is set
+CLAWDBOT_TRANSPORT = os.environ.get('AI_TRACKER_CLAWDBOT_TRANSPORT', 'auto')
+CLAWDBOT_URL = os.environ.get('AI_TRACKER_CLAWDBOT_URL')  # e.g. http://127.0.0.1:18789
+CLAWDBOT_TOKEN = os.environ.get('AI_TRACKER_CLAWDBOT_TOKEN')
+CLAWDBOT_POOL_SIZE = int(os.environ.get('AI_TRACKER_CLAWDBOT_POOL_SIZE', '4'))
+
+metrics = MetricsRegistry()
+metrics.histogram('ai_tracker_http_request_duration_seconds',
+                  'Request latency by route, streamed bodies included', ('method', 'route', 'status'))
+metrics.counter('ai_tracker_http_request_sql_seconds_total', 'Time requests spent in SQL', ('method', 'route'))
+metrics.counter('ai_tracker_http_request_clawdbot_seconds_total', 'Time requests spent waiting on Clawdbot',
+                ('method', 'route'))
+metrics.histogram('ai_tracker_sql_statement_duration_seconds', 'SQL statement time, execute plus fetches',
+                  ('statement',), buckets=SQL_BUCKETS)
+metrics.counter('ai_tracker_sql_rows_total', 'Rows fetched, or changed by statements returning none', ('statement',))
+metrics.histogram('ai_tracker_clawdbot_call_duration_seconds', 'Clawdbot CLI runs and gateway calls',
+                  ('transport', 'operation', 'outcome'))
+metrics.counter('ai_tracker_sql_slow_statements_total', 'Statements over AI_TRACKER_SLOW_QUERY_MS', ('statement',))
+
+slow_query_log = SlowQueryLog(DATABASE, threshold_ms=SLOW_QUERY_MS, plan_ttl=SLOW_QUERY_PLAN_TTL)
+
+def observe_statement(sql, params, seconds, rows):
+    """SQL observer for db_pool connections (every thread, requests or not)"""
+    kind = statement_kind(sql)
+    metrics.observe('ai_tracker_sql_statement_duration_seconds', seconds, kind)
+    metrics.inc('ai_tracker_sql_rows_total', rows, kind)
+    if SLOW_QUERY_MS and seconds * 1000 >= SLOW_QUERY_MS:
+        metrics.inc('ai_tracker_sql_slow_statements_total', 1, kind)
+        slow_query_log.record(sql, params, seconds, rows)
+    trace = current_trace()
+    if trace is not None:
+        trace.add_statement(sql, seconds, rows)
+
+def observe_clawdbot_call(transport, operation, seconds, outcome):
+    """Transport observer: notifications, dispatch, session listings and health checks"""
+    metrics.observe('ai_tracker_clawdbot_call_duration_seconds', seconds, transport, operation, outcome)
+    trace = current_trace()
+    if trace is not None:
+        trace.add_call(transport, operation, seconds, outcome)
 
-def execute_task_via_clawdbot(activity_data):
-    """Enhanced task execution using full Clawdbot capabilities with proper tool routing"""
+clawdbot = make_transport(CLAWDBOT_TRANSPORT, url=CLAWDBOT_URL, token=CLAWDBOT_TOKEN, pool_size=CLAWDBOT_POOL_SIZE,
+                          observer=observe_clawdbot_call)
+
+def execute_task_via_clawdbot(activity_data, timeout=CLAWDBOT_TIMEOUT):
+    """Enhanced task execution using full Clawdbot capabilities with proper tool routing.
+
+    Runs on a dispatch queue worker. Returns True when the session was spawned;
+    re-raises TransportTimeout so the queue can record the timeout.
+    """
     try:
         title = activity_data.get('title', '')
         description = activity_data.get('description', '')
@@ -155,72 +265,83 @@ Execute this task with full Clawdbot capabilities. Be precise about tool selecti
 """
         
         # Enhanced spawning with better session management
-        session_label = f"ai-tracker-{ai_tool.lower() if ai_tool else 'auto'}-{task_id}"
-        
-        cmd = [
-            'clawdbot', 'sessions', 'spawn',
-            '--task', task_prompt,
-            '--label', session_label,
-            '--cleanup', 'keep',  # Keep for debugging and monitoring
-        ]
+        label = session_label(ai_tool, task_id)
         
         # Note: Removed agent-id routing since it's not in allowlist
         # All tasks will use current Claude session for now
         
-        # Execute with better error capture
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Keep sessions for debugging and monitoring
+        spawned_at = datetime.now()
+        result = clawdbot.spawn_session(task_prompt, label, cleanup=SESSION_CLEANUP_POLICY, timeout=timeout)
         
-        if result.returncode == 0:
+        if result.ok:
             print(f"🤖 Task dispatched successfully: {title}")
-            print(f"   Session: {session_label}")
+            print(f"   Session: {label}")
             print(f"   Capabilities: {capabilities}")
             
             # Store session info for tracking
-            conn = get_db()
-            conn.execute(
-                '''UPDATE activities 
-                   SET status = ?, updated_at = ?, 
-                       outcome_notes = ?
-                   WHERE id = ?''',
-                ('in-progress', datetime.now(),
-                 f"Dispatched to Clawdbot session: {session_label}",
-                 task_id)
-            )
-            conn.commit()
-            conn.close()
+            with db_connection() as conn:
+                conn.execute(
+                    '''UPDATE activities 
+                       SET status = ?, updated_at = ?, 
+                           outcome_notes = ?
+                       WHERE id = ?''',
+                    ('in-progress', datetime.now(),
+                     f"Dispatched to Clawdbot session: {label}",
+                     task_id)
+                )
+                session_key = None
+                if isinstance(result.data, dict):
+                    session_key = result.data.get('childSessionKey') or result.data.get('sessionKey')
+                record_spawn(conn, task_id, label, spawned_at.isoformat(), session_key)
+                conn.commit()
+            session_registry.poke()
+            return True
         else:
-            print(f"❌ Task dispatch failed: {result.stderr}")
+            print(f"❌ Task dispatch failed: {result.error}")
             # Mark as failed
-            conn = get_db()
+            with db_connection() as conn:
+                conn.execute(
+                    '''UPDATE activities 
+                       SET status = ?, outcome = ?, outcome_notes = ?, updated_at = ?
+                       WHERE id = ?''',
+                    ('todo', 'failed', f"Dispatch failed: {result.error}", 
+                     datetime.now(), task_id)
+                )
+                conn.commit()
+            return False
+    
+    except TransportTimeout:
+        print(f"⏰ Task dispatch timed out after {timeout}s: {title}")
+        with db_connection() as conn:
             conn.execute(
                 '''UPDATE activities 
                    SET status = ?, outcome = ?, outcome_notes = ?, updated_at = ?
                    WHERE id = ?''',
-                ('todo', 'failed', f"Dispatch failed: {result.stderr}", 
-                 datetime.now(), task_id)
+                ('todo', 'failed', f"Dispatch timed out after {timeout}s", datetime.now(), task_id)
             )
             conn.commit()
-            conn.close()
+        raise
         
     except Exception as e:
         print(f"❌ Task execution failed: {e}")
         # Update activity with error
         try:
-            conn = get_db()
-            conn.execute(
-                '''UPDATE activities 
-                   SET outcome = ?, outcome_notes = ?, updated_at = ?
-                   WHERE id = ?''',
-                ('failed', f"Execution error: {str(e)}", datetime.now(), task_id)
-            )
-            conn.commit()
-            conn.close()
+            with db_connection() as conn:
+                conn.execute(
+                    '''UPDATE activities 
+                       SET outcome = ?, outcome_notes = ?, updated_at = ?
+                       WHERE id = ?''',
+                    ('failed', f"Execution error: {str(e)}", datetime.now(), task_id)
+                )
+                conn.commit()
         except:
             pass
+        return False
 
 def send_notification(message, activity_data=None, notification_type='info'):
     """Enhanced notification system using full Clawdbot messaging capabilities"""
-    if not ENABLE_NOTIFICATIONS:
+    if not notifications_enabled():
         return
     
     try:
@@ -263,68 +384,188 @@ def send_notification(message, activity_data=None, notification_type='info'):
         else:
             notification = message
         
-        # Enhanced message sending with error handling
-        cmd = [
-            'clawdbot', 'message', 'send',
-            '--channel', 'telegram', 
-            '--message', notification
-        ]
-        
-        # Add message effects for certain notification types
-        if notification_type == 'success':
-            # Could add effects if supported: cmd.extend(['--effect', 'balloons'])
-            pass
-        elif notification_type == 'urgent':
-            # Could add priority if supported
-            pass
-        
-        # Execute with better error handling
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
-            print(f"📢 Notification sent successfully: {notification[:50]}...")
+        # Hand off to the digest scheduler; the outbox sender thread does the actual send.
+        # Only the leader delivers, so other workers relay it there through the database.
+        summary = message if activity_data is None else f"{message} — {activity_data.get('title')}"
+        key = activity_data.get('id') if activity_data else None
+        fields = dict(text=notification, kind=notification_type, activity=activity_data, key=key, summary=summary)
+        if service_leader.is_leader():
+            notification_digest.notify(**fields)
         else:
-            print(f"⚠️  Notification warning: {result.stderr}")
-            # Fallback: try without channel specification
-            fallback_cmd = ['clawdbot', 'message', 'send', '--message', notification]
-            subprocess.Popen(fallback_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            notification_relay.submit(**fields)
         
-    except subprocess.TimeoutExpired:
-        print("⏰ Notification timeout - continuing without blocking")
     except Exception as e:
         print(f"❌ Notification failed: {e}")
         pass  # Don't break the app if notifications fail
 
+def deliver_notification(notification):
+    """Send one message through Clawdbot (runs on the outbox sender thread)"""
+    try:
+        result = clawdbot.send_message(notification, channel=NOTIFICATION_CHANNEL, timeout=10)
+        
+        if result.ok:
+            print(f"📢 Notification sent successfully: {notification[:50]}...")
+            return True
+        
+        print(f"⚠️  Notification warning: {result.error}")
+        # Fallback: try without channel specification
+        return clawdbot.send_message(notification, timeout=10).ok
+        
+    except TransportTimeout:
+        print("⏰ Notification timeout")
+        return False
+
+notification_limiter = RateLimiter(per_minute=NOTIFICATION_RATE_PER_MINUTE, burst=NOTIFICATION_BURST)
+
+notification_outbox = NotificationOutbox(
+    deliver_notification,
+    maxsize=NOTIFICATION_QUEUE_SIZE,
+    coalesce_window=NOTIFICATION_COALESCE_SECONDS,
+    limiter=lambda: notification_limiter.wait(NOTIFICATION_CHANNEL)
+)
+
+notification_digest = DigestScheduler(notification_outbox.submit, interval=NOTIFICATION_DIGEST_SECONDS)
+
+db_pool = ConnectionPool(DATABASE, size=DB_POOL_SIZE, observer=observe_statement if SQL_TIMING else None)
+
 def get_db():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Pooled connection for the current request, released on app context teardown"""
+    if 'db' not in g:
+        g.db = db_pool.acquire()
+    return g.db
+
+@app.teardown_appcontext
+def release_db(exception):
+    conn = g.pop('db', None)
+    if conn is not None:
+        db_pool.release(conn)
+
+def db_connection():
+    """Pooled connection for code running outside a request (workers, startup)"""
+    return db_pool.connection()
+
+# Mutable at runtime and shared by every worker process, so kept in the database
+settings = Settings(db_connection, {'notifications_enabled': ENABLE_NOTIFICATIONS}, ttl=SETTINGS_TTL)
+
+# What the leader's prober and session registry last saw, for the other workers
+published = Settings(db_connection, {'integration_health': None, 'clawdbot_sessions': None}, ttl=SETTINGS_TTL)
+
+notification_relay = NotificationRelay(db_connection, notification_digest.notify, interval=EVENT_POLL_SECONDS)
+
+def notifications_enabled():
+    """The shared toggle, overridden while Clawdbot answers but has no message tool.
+
+    The override follows the latest health check and is never stored, so it
+    lifts by itself once the tool is back and doesn't outlive the process.
+    """
+    health = health_snapshot()
+    if health['clawdbot_available'] and not health['message_tool_available']:
+        return False
+    return settings.get('notifications_enabled')
+
+event_broadcaster = EventBroadcaster(buffer_size=EVENT_BUFFER_SIZE, keepalive=EVENT_KEEPALIVE_SECONDS)
+
+def publish_dispatch_event(job):
+    event_broadcaster.publish('dispatch', job)
+    if job['status'] in ('failed', 'timed_out') and notifications_enabled():
+        with db_connection() as conn:
+            activity = conn.execute(queries.ACTIVITY_BY_ID, (job['activity_id'],)).fetchone()
+        send_notification(f"Dispatch {job['status'].replace('_', ' ')}: {job['error']}",
+                          dict(activity) if activity else None, 'failed')
+
+dispatch_queue = DispatchQueue(
+    db_connection, execute_task_via_clawdbot,
+    workers=DISPATCH_WORKERS, default_timeout=DISPATCH_TIMEOUT,
+    on_transition=publish_dispatch_event
+)
+
+# Columns pushed with activity events; matches what the board renders
+ACTIVITY_EVENT_FIELDS = ['title', 'description', 'ai_tool', 'project', 'time_spent',
+                         'time_started', 'outcome', 'iteration_count']
+
+result_cache = ResultCache(max_bytes=RESULT_CACHE_MAX_BYTES, ttl=RESULT_CACHE_TTL)
+
+def poll_activity_changes(last_version):
+    """Change watcher probe: current data version plus the rows changed since last_version"""
+    with db_connection() as conn:
+        version = data_version(conn)
+        if last_version is None or version == last_version:
+            return version, None
+        delta = activity_changes_since(conn, last_version, version, ACTIVITY_EVENT_FIELDS, EVENT_MAX_ROWS)
+    # Writes from dispatch workers or other processes never pass through announce_writes
+    result_cache.bump()
+    if delta['has_more']:
+        # Too many to push; clients fetch the delta themselves
+        return version, {'since': last_version, 'version': version, 'changed': [], 'deleted': [], 'has_more': True}
+    return version, dict(delta, since=last_version)
+
+change_watcher = ChangeWatcher(event_broadcaster, poll_activity_changes, interval=EVENT_POLL_SECONDS)
+
+def route_label():
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+@app.before_request
+def start_request_trace():
+    g.trace = start_trace(f'{request.method} {route_label()}', keep_statements=SLOW_REQUEST_MS > 0)
+
+@app.after_request
+def finish_request_trace(response):
+    """Record the request once its body has been sent, so streamed exports count in full"""
+    trace = g.pop('trace', None)
+    if trace is None:
+        return response
+    method, route, status = request.method, route_label(), str(response.status_code)
+    
+    def finish():
+        seconds = time.perf_counter() - trace.started
+        end_trace()
+        metrics.observe('ai_tracker_http_request_duration_seconds', seconds, method, route, status)
+        metrics.inc('ai_tracker_http_request_sql_seconds_total', trace.sql_seconds, method, route)
+        metrics.inc('ai_tracker_http_request_clawdbot_seconds_total', trace.clawdbot_seconds, method, route)
+        if SLOW_REQUEST_MS and seconds * 1000 >= SLOW_REQUEST_MS:
+            print(trace.report(seconds))
+    
+    response.call_on_close(finish)
+    return response
+
+@app.after_request
+def announce_writes(response):
+    """Invalidate cached results and wake the change watcher after a successful write"""
+    if request.method in ('POST', 'PUT', 'PATCH', 'DELETE') and response.status_code < 400:
+        result_cache.bump()
+        change_watcher.poke()
+    return response
+
+def cached_response(view):
+    """Serve a GET endpoint from result_cache, keyed by path and query parameters.
+
+    A hit never touches the database. Entries are dropped by the next write
+    (see announce_writes and poll_activity_changes).
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        change_watcher.start()  # catches writes made outside request handlers
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        hit = result_cache.get(key)
+        if hit is not None:
+            body, status, headers = hit
+            response = Response(body, status=status, headers=headers)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        
+        generation = result_cache.generation
+        response = app.make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            body = response.get_data()
+            result_cache.put(key, generation, (body, response.status_code, list(response.headers.items())), len(body))
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
 
 def init_db():
-    conn = get_db()
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS activities (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT,
-            ai_tool TEXT,
-            project TEXT,
-            status TEXT DEFAULT 'todo',
-            position INTEGER DEFAULT 0,
-            time_spent INTEGER DEFAULT 0,
-            time_started TIMESTAMP,
-            outcome TEXT,
-            outcome_notes TEXT,
-            failure_reason TEXT,
-            iteration_count INTEGER DEFAULT 1,
-            calendar_event_id TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_at TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    """Bring the schema up to date (see migrations.py)"""
+    with db_connection() as conn:
+        migrations.migrate(conn)
 
 @app.route('/')
 def index():
@@ -332,12 +573,124 @@ def index():
 
 @app.route('/api/activities', methods=['GET'])
 def get_activities():
+    """One page of the board in (status, position, id) order, or a change feed.
+
+    Query params: limit, cursor, status (comma list, or "open" for non-done),
+    project, ai_tool, created_from/created_to, updated_from/updated_to,
+    fields (comma list of columns to return). With since=<version> the
+    response lists only rows changed and ids deleted after that version.
+    """
+    args = request.args
+    limit = min(max(args.get('limit', PAGE_SIZE_DEFAULT, type=int), 1), PAGE_SIZE_MAX)
+    
+    fields = None
+    if args.get('fields'):
+        fields = [f.strip() for f in args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in queries.ACTIVITY_FIELDS]
+        if unknown:
+            return jsonify({'error': f"Unknown field(s): {', '.join(unknown)}"}), 400
+    
+    # Read the version before the rows: anything written in between is
+    # re-sent by the next delta, never missed
     conn = get_db()
-    activities = conn.execute(
-        'SELECT * FROM activities ORDER BY status, position'
-    ).fetchall()
-    conn.close()
-    return jsonify([dict(row) for row in activities])
+    version = data_version(conn)
+    etag = make_etag(version, request.query_string)
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+    
+    if 'since' in args:
+        since = args.get('since', type=int)
+        if since is None or since < 0:
+            return jsonify({'error': 'since must be a non-negative version'}), 400
+        body = activity_changes_since(conn, since, version, fields, limit)
+    else:
+        body = activities_page(conn, args, fields, limit)
+        if isinstance(body, tuple):
+            return body
+        body['version'] = version
+    
+    response = jsonify(body)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def activities_page(conn, args, fields, limit):
+    after = None
+    if args.get('cursor'):
+        try:
+            after = decode_cursor(args['cursor'])
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+    
+    statuses = [s.strip() for s in args.get('status', '').split(',') if s.strip()]
+    open_only = statuses == ['open']
+    
+    sql, params = queries.activities_page(
+        fields=fields,
+        statuses=None if open_only else statuses,
+        open_only=open_only,
+        project=args.get('project'),
+        ai_tool=args.get('ai_tool'),
+        created_from=args.get('created_from'),
+        created_to=args.get('created_to'),
+        updated_from=args.get('updated_from'),
+        updated_to=args.get('updated_to'),
+        after=after,
+        limit=limit
+    )
+    activities = [dict(row) for row in conn.execute(sql, params).fetchall()]
+    
+    next_cursor = None
+    if len(activities) == limit:
+        last = activities[-1]
+        next_cursor = encode_cursor((last['status'], last['position'], last['id']))
+    
+    return {'activities': activities, 'next_cursor': next_cursor}
+
+def activity_changes_since(conn, since, version, fields, limit):
+    """Rows changed and ids deleted in (since, version], at most `limit` rows per call"""
+    changed = [dict(row) for row in conn.execute(queries.activity_changes(fields), (since, limit)).fetchall()]
+    has_more = len(changed) == limit
+    upto = max([version, since] + [row['version'] for row in changed[-1:]])
+    if has_more:
+        upto = changed[-1]['version']
+    deleted = [row['id'] for row in conn.execute(queries.TOMBSTONES_BETWEEN, (since, upto)).fetchall()]
+    return {'changed': changed, 'deleted': deleted, 'version': upto, 'has_more': has_more}
+
+def data_version(conn):
+    """Global version bumped by every write to activities (see migration 4)"""
+    return conn.execute(queries.SYNC_VERSION).fetchone()['version']
+
+def make_etag(*parts):
+    return hashlib.sha1(':'.join(str(p) for p in parts).encode()).hexdigest()
+
+def not_modified(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError('bad cursor')
+    if not (isinstance(key, list) and len(key) == 3):
+        raise ValueError('bad cursor')
+    return tuple(key)
+
+@app.route('/api/activities/<int:id>', methods=['GET'])
+def get_activity(id):
+    conn = get_db()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
+    if not activity:
+        return jsonify({'error': 'Activity not found'}), 404
+    response = jsonify(dict(activity))
+    response.set_etag(str(activity['version']))  # for If-Match on PATCH
+    return response
 
 @app.route('/api/activities', methods=['POST'])
 def create_activity():
@@ -346,9 +699,11 @@ def create_activity():
     cursor = conn.execute(
         '''INSERT INTO activities (title, description, ai_tool, project, status, position, 
            time_spent, outcome, outcome_notes, failure_reason, iteration_count, calendar_event_id)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+           VALUES (?, ?, ?, ?, ?, COALESCE(?, (SELECT MAX(position) FROM activities WHERE status = ?) + ?, 0),
+                   ?, ?, ?, ?, ?, ?)''',
         (data.get('title'), data.get('description'), data.get('ai_tool'),
-         data.get('project'), data.get('status', 'todo'), data.get('position', 0),
+         data.get('project'), data.get('status', 'todo'),
+         data.get('position'), data.get('status', 'todo'), POSITION_GAP,  # new cards go to the end of their column
          data.get('time_spent', 0), data.get('outcome'), data.get('outcome_notes'),
          data.get('failure_reason'), data.get('iteration_count', 1), 
          data.get('calendar_event_id'))
@@ -356,32 +711,283 @@ def create_activity():
     activity_id = cursor.lastrowid
     conn.commit()
     
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (activity_id,)).fetchone()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (activity_id,)).fetchone()
     activity_dict = dict(activity)
-    conn.close()
     
     # Send notification for new activity
-    send_notification("New activity created!", activity_dict)
+    send_notification("New activity created!", activity_dict, 'created')
     
-    # AUTO-EXECUTE: Attempt to execute the task via Clawdbot (if enabled)
+    # AUTO-EXECUTE: Queue the task for Clawdbot (if enabled)
     if AUTO_EXECUTE and activity_dict.get('status') == 'todo':
-        execute_task_via_clawdbot(activity_dict)
+        job = dispatch_queue.enqueue(activity_id)
+        activity_dict['dispatch_job_id'] = job['id']
     
     return jsonify(activity_dict), 201
 
+# Columns a bulk import may set -> accepted JSON types. id and version are
+# assigned by the database and ignored, so an NDJSON export can be re-imported.
+BULK_FIELDS = {
+    'title': str, 'description': str, 'ai_tool': str, 'project': str, 'status': str,
+    'position': int, 'time_spent': int, 'outcome': str, 'outcome_notes': str,
+    'failure_reason': str, 'iteration_count': int, 'calendar_event_id': str,
+    'created_at': str, 'updated_at': str, 'completed_at': str,
+}
+BULK_IGNORED_FIELDS = ('id', 'version', 'time_started')
+ACTIVITY_STATUSES = ('todo', 'in-progress', 'done')
+
+BULK_INSERT = '''
+    INSERT INTO activities (title, description, ai_tool, project, status, position,
+        time_spent, outcome, outcome_notes, failure_reason, iteration_count, calendar_event_id,
+        created_at, updated_at, completed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP), ?)
+'''
+
+@app.route('/api/activities/bulk', methods=['POST'])
+def bulk_import_activities():
+    """Import many activities from NDJSON (one object per line) or a JSON array.
+
+    Rows are validated and inserted BULK_CHUNK_ROWS per transaction; invalid
+    rows are skipped and reported. Sends one summary notification instead of
+    one per row, and never auto-executes imported tasks.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+        records = ndjson_records(request.stream)
+    elif request.mimetype == 'application/json':
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, list):
+            return jsonify({'error': 'Expected a JSON array of activities'}), 400
+        records = ((n, record, None) for n, record in enumerate(payload, 1))
+    else:
+        return jsonify({'error': 'Send application/x-ndjson or a JSON array'}), 415
+    
+    conn = get_db()
+    inserted, errors, error_count = 0, [], 0
+    chunk = []
+    for n, record, error in records:
+        if error is None:
+            values, error = bulk_row(record)
+        if error:
+            error_count += 1
+            if len(errors) < BULK_MAX_ERRORS:
+                errors.append({'row': n, 'error': error})
+            continue
+        chunk.append(values)
+        if len(chunk) >= BULK_CHUNK_ROWS:
+            conn.executemany(BULK_INSERT, chunk)
+            conn.commit()
+            inserted += len(chunk)
+            chunk = []
+    if chunk:
+        conn.executemany(BULK_INSERT, chunk)
+        conn.commit()
+        inserted += len(chunk)
+    
+    if inserted:
+        send_notification(f"📥 Bulk import: {inserted} activities added"
+                          + (f", {error_count} rows skipped" if error_count else ""), notification_type='imported')
+    
+    return jsonify({'inserted': inserted, 'skipped': error_count, 'errors': errors})
+
+def ndjson_records(stream):
+    """Yield (line number, object, parse error) for each non-blank NDJSON line"""
+    # request.stream is unbuffered; iterating it directly reads byte by byte
+    for n, line in enumerate(io.BufferedReader(stream, 64 * 1024), 1):
+        if not line.strip():
+            continue
+        try:
+            yield n, json.loads(line), None
+        except ValueError as e:
+            yield n, None, f'Invalid JSON: {e}'
+
+def field_error(record, fields, ignored=()):
+    """Check a JSON object against a column -> type map; returns an error message or None"""
+    unknown = [k for k in record if k not in fields and k not in ignored]
+    if unknown:
+        return f"Unknown field(s): {', '.join(unknown)}"
+    for field, kind in fields.items():
+        value = record.get(field)
+        if value is not None and (not isinstance(value, kind) or isinstance(value, bool)):
+            return f'{field} must be {"an integer" if kind is int else "a string"}'
+    return None
+
+def bulk_row(record):
+    """Validate one imported activity; returns (BULK_INSERT params, None) or (None, error)"""
+    if not isinstance(record, dict):
+        return None, 'Expected a JSON object'
+    error = field_error(record, BULK_FIELDS, BULK_IGNORED_FIELDS)
+    if error:
+        return None, error
+    if not (record.get('title') or '').strip():
+        return None, 'title is required'
+    status = record.get('status') or 'todo'
+    if status not in ACTIVITY_STATUSES:
+        return None, f"status must be one of {', '.join(ACTIVITY_STATUSES)}"
+    for field in ('created_at', 'updated_at', 'completed_at'):
+        if record.get(field):
+            try:
+                datetime.fromisoformat(record[field])
+            except ValueError:
+                return None, f'{field} must be an ISO timestamp'
+    
+    return (
+        record['title'], record.get('description'), record.get('ai_tool'), record.get('project'),
+        status, record.get('position') or 0, record.get('time_spent') or 0,
+        record.get('outcome'), record.get('outcome_notes'), record.get('failure_reason'),
+        record.get('iteration_count') or 1, record.get('calendar_event_id'),
+        record.get('created_at'), record.get('updated_at'), record.get('completed_at')
+    ), None
+
+# Renumber one board column POSITION_GAP apart, leaving the card being moved out
+REBALANCE_COLUMN = f'''
+    UPDATE activities SET position = ranked.slot * {POSITION_GAP}
+    FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY position, id) AS slot
+          FROM activities WHERE status = ? AND id != ?) AS ranked
+    WHERE activities.id = ranked.id AND activities.position != ranked.slot * {POSITION_GAP}
+    RETURNING activities.id
+'''
+
+MOVE_ACTIVITY = '''
+    UPDATE activities
+    SET status = ?, position = ?, updated_at = ?,
+        completed_at = CASE WHEN ? != 'done' THEN NULL
+                            WHEN status = 'done' AND completed_at IS NOT NULL THEN completed_at
+                            ELSE ? END
+    WHERE id = ?
+'''
+
+class MoveError(Exception):
+    """A move that cannot be applied; the whole batch is rolled back"""
+
+@app.route('/api/activities/move', methods=['POST'])
+def move_activities():
+    """Apply a batch of board moves in one transaction.
+
+    Body: {"moves": [{"id": 7, "status": "done", "after": 12}, ...]}. Each move
+    puts a card right after (`after`) or right before (`before`) another card
+    of the target column, at an explicit `position`, or at the end of the
+    column when none is given. `status` defaults to the card's current column.
+    A new position is the midpoint of its neighbours, so a move normally
+    rewrites one row; a column is renumbered only when a gap runs out.
+    """
+    moves = (request.get_json(silent=True) or {}).get('moves')
+    if not isinstance(moves, list) or not moves:
+        return jsonify({'error': 'Expected {"moves": [...]}'}), 400
+    if len(moves) > MOVE_MAX:
+        return jsonify({'error': f'At most {MOVE_MAX} moves per request'}), 400
+    
+    conn = get_db()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        touched, rebalanced, status_changes = set(), 0, []
+        for n, move in enumerate(moves, 1):
+            try:
+                old_status, changed_ids = apply_move(conn, move)
+            except MoveError as e:
+                raise MoveError(f'moves[{n - 1}]: {e}')
+            touched.update(changed_ids)
+            rebalanced += len(changed_ids) - 1
+            if old_status != move.get('status', old_status):
+                status_changes.append((move['id'], old_status))
+        conn.commit()
+    except MoveError as e:
+        conn.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception:
+        conn.rollback()
+        raise
+    
+    rows = [dict(r) for r in conn.execute(queries.ACTIVITIES_BY_IDS, (json.dumps(sorted(touched)),))]
+    moved = {r['id']: r for r in rows}
+    
+    # One notification per batch, as a drag and drop between columns always did
+    status_names = {"todo": "To Do", "in-progress": "In Progress", "done": "Done"}
+    if len(status_changes) == 1:
+        activity_id, old_status = status_changes[0]
+        new_status = moved[activity_id]['status']
+        send_notification(
+            f"Activity moved: {status_names.get(old_status, old_status)} → {status_names.get(new_status, new_status)}",
+            moved[activity_id], 'moved'
+        )
+    elif status_changes:
+        send_notification(f"🔀 {len(status_changes)} activities moved between columns", notification_type='moved')
+    
+    return jsonify({'activities': rows, 'rebalanced': rebalanced})
+
+def apply_move(conn, move):
+    """Move one card inside the caller's transaction.
+
+    Returns (previous status, ids of every row written).
+    """
+    if not isinstance(move, dict) or not isinstance(move.get('id'), int):
+        raise MoveError('each move needs an integer id')
+    card = conn.execute(queries.ACTIVITY_SLOT, (move['id'],)).fetchone()
+    if card is None:
+        raise MoveError(f"activity {move['id']} not found")
+    status = move.get('status', card['status'])
+    if status not in ACTIVITY_STATUSES:
+        raise MoveError(f"status must be one of {', '.join(ACTIVITY_STATUSES)}")
+    
+    changed = {card['id']}
+    position = move.get('position')
+    if position is None:
+        position = free_position(conn, card['id'], status, move.get('after'), move.get('before'))
+        if position is None:
+            # No integer left between the neighbours: spread the column out and retry
+            changed.update(r['id'] for r in conn.execute(REBALANCE_COLUMN, (status, card['id'])).fetchall())
+            position = free_position(conn, card['id'], status, move.get('after'), move.get('before'))
+    elif not isinstance(position, int) or isinstance(position, bool):
+        raise MoveError('position must be an integer')
+    
+    now = datetime.now().isoformat()
+    conn.execute(MOVE_ACTIVITY, (status, position, now, status, now, card['id']))
+    return card['status'], changed
+
+def free_position(conn, activity_id, status, after=None, before=None):
+    """A position between the requested neighbours, or None when they are adjacent"""
+    if after is not None:
+        previous = column_anchor(conn, after, status, activity_id)
+        following = conn.execute(queries.COLUMN_NEXT,
+                                 (status, activity_id, previous['position'], previous['id'])).fetchone()
+    elif before is not None:
+        following = column_anchor(conn, before, status, activity_id)
+        previous = conn.execute(queries.COLUMN_PREVIOUS,
+                                (status, activity_id, following['position'], following['id'])).fetchone()
+    else:
+        previous = conn.execute(queries.COLUMN_LAST, (status, activity_id)).fetchone()
+        following = None
+    
+    if previous is None and following is None:
+        return POSITION_GAP
+    if following is None:
+        return previous['position'] + POSITION_GAP
+    if previous is None:
+        return following['position'] - POSITION_GAP
+    if following['position'] - previous['position'] < 2:
+        return None
+    return (previous['position'] + following['position']) // 2
+
+def column_anchor(conn, anchor_id, status, activity_id):
+    if anchor_id == activity_id:
+        raise MoveError('a card cannot be placed next to itself')
+    anchor = conn.execute(queries.ACTIVITY_SLOT, (anchor_id,)).fetchone()
+    if anchor is None or anchor['status'] != status:
+        raise MoveError(f'activity {anchor_id} is not in the {status} column')
+    return anchor
+
 @app.route('/api/activities/<int:id>', methods=['PUT'])
 def update_activity(id):
     data = request.json
     conn = get_db()
     
     # Get the old activity to detect status changes
-    old_activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
+    old_activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
     old_status = dict(old_activity)['status'] if old_activity else None
     
     # Check if status changed to done
     completed_at = None
     if data.get('status') == 'done':
-        existing = conn.execute('SELECT status, completed_at FROM activities WHERE id = ?', (id,)).fetchone()
+        existing = conn.execute(queries.ACTIVITY_COMPLETION, (id,)).fetchone()
         if existing and existing['status'] != 'done':
             completed_at = datetime.now().isoformat()
         elif existing and existing['completed_at']:
@@ -392,7 +998,8 @@ def update_activity(id):
     conn.execute(
         '''UPDATE activities 
            SET title = ?, description = ?, ai_tool = ?, project = ?, 
-               status = ?, position = ?, time_spent = ?, outcome = ?, 
+               status = COALESCE(?, status), position = COALESCE(?, position),
+               time_spent = ?, outcome = ?, 
                outcome_notes = ?, failure_reason = ?, iteration_count = ?, 
                calendar_event_id = ?, updated_at = ?, completed_at = ?
            WHERE id = ?''',
@@ -404,59 +1011,152 @@ def update_activity(id):
     )
     conn.commit()
     
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
     activity_dict = dict(activity)
-    conn.close()
     
     # Send notification for status changes (drag & drop between columns)
-    new_status = data.get('status')
+    new_status = activity_dict['status']
     if old_status and old_status != new_status:
         status_names = {"todo": "To Do", "in-progress": "In Progress", "done": "Done"}
         send_notification(
             f"Activity moved: {status_names.get(old_status, old_status)} → {status_names.get(new_status, new_status)}", 
-            activity_dict
+            activity_dict, 'moved'
         )
     
     return jsonify(activity_dict)
 
+# Columns PATCH may set; timestamps follow from the write itself
+PATCH_FIELDS = {k: v for k, v in BULK_FIELDS.items() if k not in ('created_at', 'updated_at', 'completed_at')}
+
+def patch_statement(fields, check_version):
+    """UPDATE ... RETURNING for the supplied columns.
+
+    The row claims the next data version itself (migration 7), so RETURNING
+    reports the version a follow-up If-Match must send. completed_at is set
+    when the status becomes done and cleared when it leaves done.
+    Params: field values, [updated_at, (status, now) if status is set], id, [expected version]
+    """
+    assignments = [f'{field} = ?' for field in fields] + ['updated_at = ?']
+    if 'status' in fields:
+        assignments.append('''completed_at = CASE WHEN ? != 'done' THEN NULL
+                                         WHEN status = 'done' AND completed_at IS NOT NULL THEN completed_at
+                                         ELSE ? END''')
+    assignments.append('version = (SELECT version FROM sync_state WHERE id = 1) + 1')
+    return (f"UPDATE activities SET {', '.join(assignments)} "
+            f"WHERE id = ?{' AND version = ?' if check_version else ''} RETURNING *")
+
+@app.route('/api/activities/<int:id>', methods=['PATCH'])
+def patch_activity(id):
+    """Update only the supplied columns in one UPDATE ... RETURNING.
+
+    Send the version last seen as `If-Match: "<version>"` (or `"version"` in
+    the body) to fail with 409 instead of overwriting a newer write, such as
+    a timer stopping while the edit form was open.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    data = dict(data)
+    expected = data.pop('version', None)
+    if request.if_match and not request.if_match.star_tag:
+        tags = request.if_match.as_set()
+        if len(tags) != 1 or not next(iter(tags)).isdigit():
+            return jsonify({'error': 'If-Match must be one activity version'}), 400
+        expected = int(next(iter(tags)))
+    if expected is not None and (not isinstance(expected, int) or isinstance(expected, bool)):
+        return jsonify({'error': 'version must be an integer'}), 400
+    
+    error = field_error(data, PATCH_FIELDS)
+    if error:
+        return jsonify({'error': error}), 400
+    if not data:
+        return jsonify({'error': 'No fields to update'}), 400
+    if 'title' in data and not (data['title'] or '').strip():
+        return jsonify({'error': 'title is required'}), 400
+    if 'status' in data and data['status'] not in ACTIVITY_STATUSES:
+        return jsonify({'error': f"status must be one of {', '.join(ACTIVITY_STATUSES)}"}), 400
+    
+    fields = list(data)
+    now = datetime.now().isoformat()
+    params = [data[f] for f in fields] + [now]
+    if 'status' in data:
+        params += [data['status'], now]
+    params.append(id)
+    if expected is not None:
+        params.append(expected)
+    
+    conn = get_db()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        # Only a status change needs the old row, for its notification
+        old_status = None
+        if 'status' in data:
+            before = conn.execute(queries.ACTIVITY_SLOT, (id,)).fetchone()
+            old_status = before['status'] if before else None
+        row = conn.execute(patch_statement(fields, expected is not None), params).fetchone()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    
+    if row is None:
+        current = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
+        if current is None:
+            return jsonify({'error': 'Activity not found'}), 404
+        response = jsonify({'error': 'Activity was changed by another write', 'activity': dict(current)})
+        response.set_etag(str(current['version']))
+        return response, 409
+    
+    activity_dict = dict(row)
+    if old_status and old_status != activity_dict['status']:
+        status_names = {"todo": "To Do", "in-progress": "In Progress", "done": "Done"}
+        send_notification(
+            f"Activity moved: {status_names.get(old_status, old_status)} → {status_names.get(activity_dict['status'], activity_dict['status'])}",
+            activity_dict, 'moved'
+        )
+    
+    response = jsonify(activity_dict)
+    response.set_etag(str(activity_dict['version']))
+    return response
+
 @app.route('/api/activities/<int:id>', methods=['DELETE'])
 def delete_activity(id):
     conn = get_db()
     conn.execute('DELETE FROM activities WHERE id = ?', (id,))
     conn.commit()
-    conn.close()
     return '', 204
 
 @app.route('/api/activities/<int:id>/timer/start', methods=['POST'])
 def start_timer(id):
     conn = get_db()
+    # A running timer keeps its start time, so a second click doesn't drop tracked time
     conn.execute(
-        'UPDATE activities SET time_started = ?, status = ? WHERE id = ?',
+        'UPDATE activities SET time_started = COALESCE(time_started, ?), status = ? WHERE id = ?',
         (datetime.now().isoformat(), 'in-progress', id)
     )
     conn.commit()
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
-    conn.close()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
     return jsonify(dict(activity))
 
 @app.route('/api/activities/<int:id>/timer/stop', methods=['POST'])
 def stop_timer(id):
+    """Stop the timer and record the interval as a time session"""
     conn = get_db()
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
-    
-    if activity and activity['time_started']:
-        started = datetime.fromisoformat(activity['time_started'])
-        elapsed = int((datetime.now() - started).total_seconds())
-        new_time = (activity['time_spent'] or 0) + elapsed
-        
-        conn.execute(
-            'UPDATE activities SET time_spent = ?, time_started = NULL WHERE id = ?',
-            (new_time, id)
-        )
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
+        if activity and activity['time_started']:
+            elapsed = timeseries.record_session(conn, activity, activity['time_started'], datetime.now())
+            conn.execute(
+                'UPDATE activities SET time_spent = ?, time_started = NULL WHERE id = ?',
+                ((activity['time_spent'] or 0) + elapsed, id)
+            )
         conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
-    conn.close()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
     return jsonify(dict(activity))
 
 @app.route('/api/activities/<int:id>/iteration', methods=['POST'])
@@ -467,70 +1167,40 @@ def increment_iteration(id):
         (id,)
     )
     conn.commit()
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
-    conn.close()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
     return jsonify(dict(activity))
 
 # Dashboard & Analytics
 @app.route('/api/dashboard', methods=['GET'])
+@cached_response
 def get_dashboard():
+    """Analytics over the last `days` days of activity (days=0 for all time)"""
     conn = get_db()
     
     # Get date range from query params
-    days = int(request.args.get('days', 30))
-    start_date = (datetime.now() - timedelta(days=days)).isoformat()
+    try:
+        days = int(request.args.get('days', '30'))
+    except ValueError:
+        days = -1
+    if days < 0:
+        return jsonify({'error': 'days must be a non-negative integer'}), 400
+    start_day = rollup_start_day(days)
     
     # Overall stats
-    total = conn.execute('SELECT COUNT(*) as count FROM activities').fetchone()['count']
-    completed = conn.execute(
-        'SELECT COUNT(*) as count FROM activities WHERE status = "done"'
-    ).fetchone()['count']
-    total_time = conn.execute(
-        'SELECT SUM(time_spent) as total FROM activities'
-    ).fetchone()['total'] or 0
+    overview = conn.execute(queries.DASHBOARD_OVERVIEW, (start_day,)).fetchone()
+    total, completed, total_time = overview['total'], overview['completed'], overview['total_time']
     
     # Outcome stats
-    outcomes = conn.execute('''
-        SELECT outcome, COUNT(*) as count 
-        FROM activities 
-        WHERE outcome IS NOT NULL AND outcome != "" 
-        GROUP BY outcome
-    ''').fetchall()
+    outcomes = conn.execute(queries.DASHBOARD_OUTCOMES, (start_day,)).fetchall()
     
     # Tool stats
-    tool_stats = conn.execute('''
-        SELECT ai_tool, COUNT(*) as total,
-               SUM(CASE WHEN outcome = 'success' THEN 1 ELSE 0 END) as successes,
-               SUM(CASE WHEN outcome = 'partial' THEN 1 ELSE 0 END) as partials,
-               SUM(CASE WHEN outcome = 'failed' THEN 1 ELSE 0 END) as failures,
-               SUM(time_spent) as total_time,
-               AVG(time_spent) as avg_time,
-               AVG(iteration_count) as avg_iterations
-        FROM activities 
-        WHERE ai_tool IS NOT NULL AND ai_tool != ""
-        GROUP BY ai_tool
-    ''').fetchall()
+    tool_stats = conn.execute(queries.DASHBOARD_TOOL_STATS, (start_day,)).fetchall()
     
     # Failure reasons
-    failure_reasons = conn.execute('''
-        SELECT failure_reason, COUNT(*) as count 
-        FROM activities 
-        WHERE failure_reason IS NOT NULL AND failure_reason != ""
-        GROUP BY failure_reason 
-        ORDER BY count DESC
-    ''').fetchall()
+    failure_reasons = conn.execute(queries.DASHBOARD_FAILURE_REASONS, (start_day,)).fetchall()
     
     # Project stats
-    project_stats = conn.execute('''
-        SELECT project, COUNT(*) as total,
-               SUM(CASE WHEN status = 'done' THEN 1 ELSE 0 END) as completed,
-               SUM(time_spent) as total_time
-        FROM activities 
-        WHERE project IS NOT NULL AND project != ""
-        GROUP BY project
-    ''').fetchall()
-    
-    conn.close()
+    project_stats = conn.execute(queries.DASHBOARD_PROJECT_STATS, (start_day,)).fetchall()
     
     return jsonify({
         'overview': {
@@ -543,22 +1213,195 @@ def get_dashboard():
         'outcomes': [dict(row) for row in outcomes],
         'tool_stats': [dict(row) for row in tool_stats],
         'failure_reasons': [dict(row) for row in failure_reasons],
-        'project_stats': [dict(row) for row in project_stats]
+        'project_stats': [dict(row) for row in project_stats],
+        'days': days
+    })
+
+def rollup_start_day(days):
+    """First rollup day in a `days` window; rollup days are UTC like created_at's default"""
+    if not days:
+        return ''
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d')
+
+@app.route('/api/search', methods=['GET'])
+@cached_response
+def search_activities():
+    """Full-text search over titles, descriptions and outcome notes.
+
+    Query params: q, status (comma list), ai_tool, project, limit, offset.
+    Words match whole words; when that finds less than a page, the last word
+    also matches as a prefix (search as you type). Up to SEARCH_EXACT_LIMIT
+    matches are ranked by relevance with exact totals and facets. Broader
+    queries would have to score every match, so they are listed newest
+    first, with facets from the newest SEARCH_EXACT_LIMIT matches and no
+    total. Matched words come back wrapped in <mark> in the *_html fields,
+    with the rest of the text HTML-escaped.
+    """
+    args = request.args
+    match = search.match_expression(args.get('q'))
+    limit = args.get('limit', SEARCH_PAGE_SIZE_DEFAULT, type=int)
+    offset = args.get('offset', 0, type=int)
+    if match is None:
+        return jsonify({'error': 'q must contain at least one word'}), 400
+    if limit is None or not 1 <= limit <= SEARCH_PAGE_SIZE_MAX:
+        return jsonify({'error': f'limit must be between 1 and {SEARCH_PAGE_SIZE_MAX}'}), 400
+    if offset is None or offset < 0:
+        return jsonify({'error': 'offset must be a non-negative integer'}), 400
+    filters = {
+        'statuses': [s.strip() for s in args.get('status', '').split(',') if s.strip()],
+        'ai_tool': args.get('ai_tool'),
+        'project': args.get('project'),
+    }
+    
+    conn = get_db()
+    matches = conn.execute(queries.SEARCH_MATCH_COUNT, (match, SEARCH_EXACT_LIMIT + 1)).fetchone()[0]
+    if matches < limit:
+        # Too few whole-word hits to fill a page: the last word may still be being typed
+        match = search.match_expression(args.get('q'), prefix=True)
+        matches = conn.execute(queries.SEARCH_MATCH_COUNT, (match, SEARCH_EXACT_LIMIT + 1)).fetchone()[0]
+    exact = matches <= SEARCH_EXACT_LIMIT
+    
+    results = []
+    page = queries.search_results(match, limit=limit, offset=offset,
+                                  order='rank' if exact else 'recent', **filters)
+    for row in conn.execute(*page):
+        result = {f: row[f] for f in queries.SEARCH_FIELDS}
+        result['title_html'] = search.render_marked(row['title_marked'])
+        result['description_html'] = search.render_marked(row['description_marked'])
+        result['outcome_notes_html'] = search.render_marked(row['outcome_notes_marked'])
+        if exact:
+            result['score'] = -row['rank']  # bm25 is more negative for better matches
+        results.append(result)
+    
+    facets = {facet: {} for facet in queries.SEARCH_FACETS}
+    counted = 0
+    for row in conn.execute(*queries.search_facets(match, sample=None if exact else SEARCH_EXACT_LIMIT, **filters)):
+        counted += row['count']
+        for facet in queries.SEARCH_FACETS:
+            facets[facet][row[facet]] = facets[facet].get(row[facet], 0) + row['count']
+    
+    if exact:
+        next_offset = offset + limit if offset + limit < counted else None
+    else:
+        next_offset = offset + limit if len(results) == limit else None
+    
+    return jsonify({
+        'query': args.get('q'),
+        'order': 'relevance' if exact else 'recent',
+        'results': results,
+        'total': counted if exact else None,
+        'offset': offset,
+        'next_offset': next_offset,
+        'facets': {
+            facet: [{'value': value, 'count': count}
+                    for value, count in sorted(counts.items(), key=lambda item: -item[1])]
+            for facet, counts in facets.items()
+        },
+        'facets_sampled': not exact
+    })
+
+# Tracked time per bucket from time_buckets; hour buckets are limited to a month
+TIMESERIES_DEFAULT_DAYS = 30
+TIMESERIES_MAX_HOURS = 31 * 24
+
+@app.route('/api/analytics/timeseries', methods=['GET'])
+@cached_response
+def get_timeseries():
+    """Tracked timer time bucketed by hour, day or week, in total or per tool/project.
+
+    Query params: granularity (hour|day|week, default day), group_by
+    (ai_tool|project, default none), from / to (ISO dates, `to` exclusive,
+    default the last 30 days). Each series has one value per bucket label.
+    """
+    granularity = request.args.get('granularity', 'day')
+    group_by = request.args.get('group_by') or 'all'
+    if granularity not in ('hour', 'day', 'week'):
+        return jsonify({'error': 'granularity must be hour, day or week'}), 400
+    if group_by not in timeseries.DIMENSIONS:
+        return jsonify({'error': 'group_by must be ai_tool or project'}), 400
+    try:
+        end = datetime.fromisoformat(request.args['to']) if request.args.get('to') else \
+            timeseries.bucket_start(datetime.now(), 'day') + timedelta(days=1)
+        start = datetime.fromisoformat(request.args['from']) if request.args.get('from') else \
+            end - timedelta(days=TIMESERIES_DEFAULT_DAYS)
+    except ValueError:
+        return jsonify({'error': 'from and to must be ISO dates'}), 400
+    
+    size = 'hour' if granularity == 'hour' else 'day'
+    start, end = timeseries.bucket_start(start, size), timeseries.bucket_start(end, size)
+    if granularity == 'week':
+        start -= timedelta(days=start.weekday())
+        end += timedelta(days=-end.weekday() % 7)
+    if end <= start:
+        return jsonify({'error': 'to must be after from'}), 400
+    if granularity == 'hour' and end - start > timedelta(hours=TIMESERIES_MAX_HOURS):
+        return jsonify({'error': f'hour granularity covers at most {TIMESERIES_MAX_HOURS // 24} days'}), 400
+    
+    label, step = timeseries.SIZES[size]
+    if granularity == 'week':
+        step = timedelta(days=7)
+    labels, cursor = [], start
+    while cursor < end:
+        labels.append(cursor.strftime(label))
+        cursor += step
+    
+    conn = get_db()
+    if granularity == 'week':
+        rows = conn.execute(queries.TIMESERIES_WEEKS,
+                            (group_by, start.strftime(label), end.strftime(label))).fetchall()
+    else:
+        rows = conn.execute(queries.TIMESERIES_BUCKETS,
+                            (size, group_by, start.strftime(label), end.strftime(label))).fetchall()
+    
+    index = {bucket: n for n, bucket in enumerate(labels)}
+    series = {}
+    for row in rows:
+        values = series.setdefault(row['value'], [0] * len(labels))
+        values[index[row['bucket']]] += row['seconds']
+    
+    return jsonify({
+        'granularity': granularity,
+        'group_by': None if group_by == 'all' else group_by,
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'buckets': labels,
+        'series': sorted(
+            ({'key': key or None, 'total': sum(values), 'seconds': values} for key, values in series.items()),
+            key=lambda s: -s['total']
+        )
     })
 
 # Export
 @app.route('/api/export/csv', methods=['GET'])
 def export_csv():
-    conn = get_db()
-    activities = conn.execute('''
-        SELECT id, title, description, ai_tool, project, status, time_spent, 
-               outcome, outcome_notes, failure_reason, iteration_count, 
-               created_at, completed_at
-        FROM activities 
-        ORDER BY created_at DESC
-    ''').fetchall()
-    conn.close()
+    """Stream the CSV export in batches; gzip-encoded when the client accepts it.
+
+    Query params: project, ai_tool, created_from (inclusive), created_to (exclusive).
+    """
+    sql, params = queries.export_rows(
+        project=request.args.get('project'),
+        ai_tool=request.args.get('ai_tool'),
+        created_from=request.args.get('created_from'),
+        created_to=request.args.get('created_to')
+    )
+    use_gzip = request.accept_encodings['gzip'] > 0
+    
+    body = csv_rows(sql, params)
+    if use_gzip:
+        body = gzip_stream(body)
     
+    response = Response(
+        body,
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=ai_activities_{datetime.now().strftime("%Y%m%d")}.csv'}
+    )
+    response.headers['Vary'] = 'Accept-Encoding'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def csv_rows(sql, params):
+    """Yield the export as CSV text, one chunk per batch of rows"""
     output = io.StringIO()
     writer = csv.writer(output)
     
@@ -568,54 +1411,98 @@ def export_csv():
         'Time Spent (seconds)', 'Time Spent (formatted)', 'Outcome', 
         'Outcome Notes', 'Failure Reason', 'Iterations', 'Created', 'Completed'
     ])
+    yield output.getvalue()
     
-    # Data
-    for activity in activities:
-        time_spent = activity['time_spent'] or 0
-        hours = time_spent // 3600
-        minutes = (time_spent % 3600) // 60
-        time_formatted = f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
+    for activities in export_batches(sql, params):
+        output.seek(0)
+        output.truncate()
         
-        writer.writerow([
-            activity['id'], activity['title'], activity['description'],
-            activity['ai_tool'], activity['project'], activity['status'],
-            time_spent, time_formatted, activity['outcome'],
-            activity['outcome_notes'], activity['failure_reason'],
-            activity['iteration_count'], activity['created_at'], activity['completed_at']
-        ])
-    
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': f'attachment; filename=ai_activities_{datetime.now().strftime("%Y%m%d")}.csv'}
+        # Data
+        for activity in activities:
+            time_spent = activity['time_spent'] or 0
+            hours = time_spent // 3600
+            minutes = (time_spent % 3600) // 60
+            time_formatted = f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
+            
+            writer.writerow([
+                activity['id'], activity['title'], activity['description'],
+                activity['ai_tool'], activity['project'], activity['status'],
+                time_spent, time_formatted, activity['outcome'],
+                activity['outcome_notes'], activity['failure_reason'],
+                activity['iteration_count'], activity['created_at'], activity['completed_at']
+            ])
+        
+        yield output.getvalue()
+
+def export_batches(sql, params):
+    """Yield fetchmany() batches of EXPORT_BATCH_ROWS rows for a streamed response.
+
+    Uses its own pooled connection: the request's connection is released
+    before a streamed body is consumed.
+    """
+    with db_connection() as conn:
+        # A full export would otherwise map up to mmap_size of the file into our RSS;
+        # plain reads keep it to the bounded page cache
+        conn.execute('PRAGMA mmap_size = 0')
+        cursor = conn.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+            conn.execute(f"PRAGMA mmap_size = {db_pool.pragmas['mmap_size']}")
+
+@app.route('/api/export/ndjson', methods=['GET'])
+def export_ndjson():
+    """Stream every column as one JSON object per line, in id order.
+
+    Same filters and gzip negotiation as the CSV export; the output can be
+    fed back to POST /api/activities/bulk.
+    """
+    sql, params = queries.export_rows(
+        project=request.args.get('project'),
+        ai_tool=request.args.get('ai_tool'),
+        created_from=request.args.get('created_from'),
+        created_to=request.args.get('created_to'),
+        columns=queries.ACTIVITY_FIELDS
+    )
+    use_gzip = request.accept_encodings['gzip'] > 0
+    
+    body = (''.join(json.dumps(dict(row)) + '\n' for row in rows) for rows in export_batches(sql, params))
+    if use_gzip:
+        body = gzip_stream(body)
+    
+    response = Response(
+        body,
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename=ai_activities_{datetime.now().strftime("%Y%m%d")}.ndjson'}
     )
+    response.headers['Vary'] = 'Accept-Encoding'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def gzip_stream(chunks):
+    """Gzip-compress a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
 
 @app.route('/api/export/report', methods=['GET'])
+@cached_response
 def export_report():
     conn = get_db()
     
     # Get summary data
-    overview = conn.execute('''
-        SELECT COUNT(*) as total,
-               SUM(CASE WHEN status = 'done' THEN 1 ELSE 0 END) as completed,
-               SUM(time_spent) as total_time,
-               AVG(CASE WHEN status = 'done' THEN time_spent END) as avg_time
-        FROM activities
-    ''').fetchone()
-    
-    tool_stats = conn.execute('''
-        SELECT ai_tool, COUNT(*) as total,
-               SUM(CASE WHEN outcome = 'success' THEN 1 ELSE 0 END) as successes,
-               ROUND(SUM(CASE WHEN outcome = 'success' THEN 1 ELSE 0 END) * 100.0 / 
-                     NULLIF(COUNT(CASE WHEN outcome IS NOT NULL AND outcome != '' THEN 1 END), 0), 1) as success_rate,
-               SUM(time_spent) as total_time
-        FROM activities 
-        WHERE ai_tool IS NOT NULL AND ai_tool != ""
-        GROUP BY ai_tool
-    ''').fetchall()
-    
-    conn.close()
+    overview = conn.execute(queries.REPORT_OVERVIEW).fetchone()
+    
+    tool_stats = conn.execute(queries.REPORT_TOOL_STATS).fetchall()
     
     # Format time helper
     def format_time(seconds):
@@ -658,82 +1545,160 @@ def export_report():
     )
 
 # Calendar Integration (ICS format)
+vevent_cache = VersionedCache(max_entries=VEVENT_CACHE_SIZE)
+
 @app.route('/api/calendar/ics', methods=['GET'])
 def export_ics():
-    conn = get_db()
-    activities = conn.execute('''
-        SELECT * FROM activities 
-        WHERE created_at >= date('now', '-30 days')
-        ORDER BY created_at DESC
-    ''').fetchall()
-    conn.close()
-    
-    ics_lines = [
+    """Calendar feed of activities created in [from, to), default the last 30 days.
+
+    Subscribed calendars poll this; ETag and Last-Modified let an unchanged
+    feed answer 304 from a single index-only query.
+    """
+    try:
+        start = parse_calendar_bound(request.args.get('from'))
+        end = parse_calendar_bound(request.args.get('to'))
+    except ValueError:
+        return jsonify({'error': 'from and to must be ISO dates'}), 400
+    if start is None:
+        start = (datetime.now(timezone.utc) - timedelta(days=CALENDAR_DEFAULT_DAYS)).strftime('%Y-%m-%d')
+    if end is None:
+        end = '9999-12-31'
+    
+    stamp = get_db().execute(queries.CALENDAR_STAMP, (start, end)).fetchone()
+    # Row versions catch every edit, the count catches deletes
+    etag = make_etag('ics', stamp['version'], stamp['events'], start, end)
+    last_modified = parse_timestamp(stamp['updated_at'])
+    
+    if request.if_none_match:
+        unchanged = request.if_none_match.contains(etag)
+    else:
+        unchanged = bool(request.if_modified_since and last_modified
+                         and last_modified <= request.if_modified_since)
+    if unchanged:
+        response = not_modified(etag)
+    else:
+        response = Response(
+            ics_feed(start, end),
+            mimetype='text/calendar',
+            headers={'Content-Disposition': 'attachment; filename=ai_activities.ics'}
+        )
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
+def parse_calendar_bound(value):
+    """Validate a from/to parameter and put it in created_at's stored form (or None)"""
+    if not value:
+        return None
+    datetime.fromisoformat(value)
+    return value.replace('T', ' ')
+
+def parse_timestamp(value):
+    """Stored timestamp -> aware UTC datetime, never in the future (None if missing)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace(' ', 'T'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()  # written with datetime.now(): local time
+    return min(parsed.astimezone(timezone.utc), datetime.now(timezone.utc)).replace(microsecond=0)
+
+def ics_feed(start, end):
+    """Yield the calendar in batches; VEVENT blocks come from vevent_cache when the row is unchanged"""
+    yield "\r\n".join([
         "BEGIN:VCALENDAR",
         "VERSION:2.0",
         "PRODID:-//AI Activity Tracker//EN",
         "CALSCALE:GREGORIAN",
         "METHOD:PUBLISH"
-    ]
+    ]) + "\r\n"
     
-    for activity in activities:
-        created = datetime.fromisoformat(activity['created_at'].replace(' ', 'T'))
-        duration = activity['time_spent'] or 1800  # Default 30 min
-        end = created + timedelta(seconds=duration)
-        
-        ics_lines.extend([
-            "BEGIN:VEVENT",
-            f"UID:{activity['id']}@ai-tracker",
-            f"DTSTAMP:{datetime.now().strftime('%Y%m%dT%H%M%SZ')}",
-            f"DTSTART:{created.strftime('%Y%m%dT%H%M%S')}",
-            f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}",
-            f"SUMMARY:[{activity['ai_tool'] or 'AI'}] {activity['title']}",
-            f"DESCRIPTION:Project: {activity['project'] or 'N/A'}\\nOutcome: {activity['outcome'] or 'N/A'}\\nIterations: {activity['iteration_count']}",
-            f"CATEGORIES:{activity['ai_tool'] or 'AI'},{activity['project'] or 'General'}",
-            "END:VEVENT"
-        ])
-    
-    ics_lines.append("END:VCALENDAR")
+    for activities in export_batches(queries.CALENDAR_RANGE, (start, end)):
+        yield ''.join(vevent(activity) for activity in activities)
     
-    return Response(
-        "\r\n".join(ics_lines),
-        mimetype='text/calendar',
-        headers={'Content-Disposition': 'attachment; filename=ai_activities.ics'}
-    )
+    yield "END:VCALENDAR\r\n"
+
+def vevent(activity):
+    block = vevent_cache.get(activity['id'], activity['version'])
+    if block is None:
+        block = render_vevent(activity)
+        vevent_cache.put(activity['id'], activity['version'], block)
+    return block
+
+def render_vevent(activity):
+    created = datetime.fromisoformat(activity['created_at'].replace(' ', 'T'))
+    duration = activity['time_spent'] or 1800  # Default 30 min
+    end = created + timedelta(seconds=duration)
+    
+    return "\r\n".join([
+        "BEGIN:VEVENT",
+        f"UID:{activity['id']}@ai-tracker",
+        f"DTSTAMP:{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}",
+        f"DTSTART:{created.strftime('%Y%m%dT%H%M%S')}",
+        f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}",
+        f"SUMMARY:[{ics_text(activity['ai_tool'] or 'AI')}] {ics_text(activity['title'])}",
+        f"DESCRIPTION:Project: {ics_text(activity['project'] or 'N/A')}\\nOutcome: {ics_text(activity['outcome'] or 'N/A')}\\nIterations: {activity['iteration_count']}",
+        f"CATEGORIES:{ics_text(activity['ai_tool'] or 'AI')},{ics_text(activity['project'] or 'General')}",
+        "END:VEVENT"
+    ]) + "\r\n"
+
+def ics_text(value):
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    return (str(value or '').replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
 
 # Notification endpoints (preserved from original)
 @app.route('/api/notifications/toggle', methods=['POST'])
 def toggle_notifications():
     """Toggle notifications on/off"""
-    global ENABLE_NOTIFICATIONS
-    ENABLE_NOTIFICATIONS = not ENABLE_NOTIFICATIONS
-    return jsonify({'enabled': ENABLE_NOTIFICATIONS})
+    enabled = settings.set('notifications_enabled', not settings.get('notifications_enabled', fresh=True))
+    return jsonify({'enabled': enabled})
 
 @app.route('/api/notifications/status', methods=['GET'])
 def notification_status():
-    """Get notification status"""
-    return jsonify({'enabled': ENABLE_NOTIFICATIONS})
+    """Get notification status with digest, rate limit and outbox counters"""
+    outbox = notification_outbox.stats()
+    digest = notification_digest.stats()
+    return jsonify({
+        'enabled': notifications_enabled(),
+        'sent': outbox['sent'],
+        'merged': outbox['coalesced'] + outbox['merged'] + digest['digested'],
+        'deferred': outbox['deferred'],
+        'digest': digest,
+        'rate_limit': notification_limiter.stats(),
+        'outbox': outbox,
+        'relay': notification_relay.stats(),
+        'delivering': service_leader.is_leader(),
+    })
 
 @app.route('/api/test-notification', methods=['POST'])
 def test_notification():
     """Test notification system"""
-    send_notification("🧪 Test notification from Enhanced AI Activity Tracker!")
+    send_notification("🧪 Test notification from Enhanced AI Activity Tracker!", notification_type='test')
     return jsonify({'success': True})
 
 @app.route('/api/activities/<int:id>/execute', methods=['POST'])
 def execute_task(id):
     """Manually execute a task via Clawdbot"""
     conn = get_db()
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
-    conn.close()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
     
     if not activity:
         return jsonify({'error': 'Activity not found'}), 404
     
     activity_dict = dict(activity)
-    execute_task_via_clawdbot(activity_dict)
+    data = request.get_json(silent=True) or {}
+    timeout = data.get('timeout')
+    if timeout is not None and (not isinstance(timeout, int) or isinstance(timeout, bool)
+                                or not 0 < timeout <= DISPATCH_TIMEOUT_MAX):
+        return jsonify({'error': f'timeout must be an integer from 1 to {DISPATCH_TIMEOUT_MAX} seconds'}), 400
+    job = dispatch_queue.enqueue(id, timeout=timeout)
     
-    return jsonify({'success': True, 'message': f'Task "{activity_dict["title"]}" dispatched to Clawdbot'})
+    return dispatch_accepted(job, f'Task "{activity_dict["title"]}" queued for Clawdbot')
 
 @app.route('/api/activities/<int:id>/complete', methods=['POST'])
 def complete_task(id):
@@ -752,72 +1717,201 @@ def complete_task(id):
          datetime.now(),
          id)
     )
+    record_finish(conn, id, 'completed', datetime.now().isoformat())
     conn.commit()
     
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
-    conn.close()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
     
     if activity:
         activity_dict = dict(activity)
         outcome = activity_dict.get('outcome', 'success')
         outcome_emoji = {"success": "✅", "partial": "🟡", "failed": "❌"}.get(outcome, "✅")
-        send_notification(f"Task completed: {outcome_emoji} {outcome.title()}", activity_dict)
+        send_notification(f"Task completed: {outcome_emoji} {outcome.title()}", activity_dict,
+                          'failed' if outcome == 'failed' else 'completed')
     
     return jsonify({'success': True})
 
 @app.route('/api/sessions/status', methods=['GET'])
 def get_sessions_status():
-    """Get status of Clawdbot sessions related to activities"""
-    try:
-        # Use sessions_list to get current spawned sessions
-        result = subprocess.run(['clawdbot', 'sessions', 'list', '--limit', '20'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            # Parse session info (this would need proper JSON parsing)
-            return jsonify({'sessions': result.stdout, 'success': True})
-        else:
-            return jsonify({'error': result.stderr, 'success': False})
-    except Exception as e:
-        return jsonify({'error': str(e), 'success': False})
+    """Tracker sessions from the latest Clawdbot listing, indexed by the session registry"""
+    snapshot = sessions_snapshot()
+    return jsonify(dict(snapshot, success=snapshot['error'] is None))
+
+@app.route('/api/activities/<int:id>/session', methods=['GET'])
+def get_activity_session(id):
+    """Live session state for one activity plus its recent spawns"""
+    conn = get_db()
+    if not conn.execute(queries.ACTIVITY_SLOT, (id,)).fetchone():
+        return jsonify({'error': 'Activity not found'}), 404
+    history = conn.execute(queries.ACTIVITY_SESSIONS, (id, SESSION_HISTORY_LIMIT)).fetchall()
+    snapshot = sessions_snapshot()
+    return jsonify({
+        'activity_id': id,
+        'live': next((e for e in snapshot['sessions'] if e['activity_id'] == id), None),
+        'sessions': [dict(row) for row in history],
+        'checked_at': snapshot['checked_at'],
+    })
+
+def sessions_snapshot():
+    """Latest session listing: the registry's own in the leader, the one it published elsewhere"""
+    if service_leader.is_leader():
+        return session_registry.snapshot()
+    return published.get('clawdbot_sessions') or session_registry.snapshot()
+
+def publish_session_changes(entries):
+    event_broadcaster.publish('sessions', entries)
+
+def publish_sessions(snapshot):
+    published.set('clawdbot_sessions', snapshot)
+
+session_registry = SessionRegistry(
+    db_connection, clawdbot, interval=SESSION_REFRESH_SECONDS,
+    available=lambda: health_prober.snapshot()['sessions_spawn_available'],
+    on_change=publish_session_changes, on_refresh=publish_sessions
+)
 
 @app.route('/api/integration/health', methods=['GET'])
 def integration_health():
-    """Check integration health with Clawdbot"""
-    health_status = {
-        'clawdbot_available': False,
-        'notifications_enabled': ENABLE_NOTIFICATIONS,
-        'sessions_spawn_available': False,
-        'message_tool_available': False,
-        'timestamp': datetime.now().isoformat()
+    """Latest Clawdbot health snapshot from the background prober; never runs a check itself.
+
+    ?refresh=1 asks the prober to check now; the result arrives as a `health` event.
+    Only the worker running the prober can do that; elsewhere the next scheduled check applies.
+    """
+    if service_leader.is_leader() and request.args.get('refresh') == '1':
+        health_prober.poke()
+    return jsonify(integration_snapshot())
+
+@app.route('/api/integration/health/status', methods=['GET'])
+def integration_health_status():
+    """Prober counters (probes run, failed probes, result changes) and Clawdbot transport counters"""
+    return jsonify(dict(health_prober.stats(), transport=clawdbot.stats(), leader=service_leader.stats()))
+
+def health_snapshot():
+    """Latest Clawdbot health check: the prober's own in the leader, the one it published elsewhere"""
+    if service_leader.is_leader():
+        return health_prober.snapshot()
+    return published.get('integration_health') or health_prober.snapshot()
+
+def integration_snapshot(snapshot=None):
+    """Health snapshot with the current notification setting"""
+    return dict(snapshot or health_snapshot(), notifications_enabled=notifications_enabled())
+
+def integration_changed(snapshot, previous):
+    """Prober callback: report the change, push it to /api/events clients and replay it to new ones"""
+    if previous is None:
+        print("✅ Clawdbot is available" if snapshot['clawdbot_available']
+              else "⚠️  Clawdbot not available - tasks won't auto-execute")
+        if snapshot['clawdbot_available'] and not snapshot['message_tool_available']:
+            print("⚠️  Message tool not available - notifications paused until it is")
+    else:
+        state = ('healthy' if all(snapshot[key] for key, _ in HEALTH_CHECKS)
+                 else 'degraded' if snapshot['clawdbot_available'] else 'down')
+        print(f"🔍 Clawdbot integration {state}: " + ', '.join(
+            f"{key}={snapshot[key]}" for key, _ in HEALTH_CHECKS))
+    event_broadcaster.publish('health', integration_snapshot(health_prober.snapshot()), sticky=True)
+    if snapshot['sessions_spawn_available']:
+        session_registry.poke()
+
+def publish_health(snapshot):
+    published.set('integration_health', snapshot)
+
+health_prober = HealthProber(
+    probe=clawdbot.check, interval=HEALTH_INTERVAL_SECONDS, backoff=HEALTH_BACKOFF_SECONDS,
+    max_backoff=HEALTH_BACKOFF_MAX_SECONDS, on_change=integration_changed, on_probe=publish_health
+)
+
+def poll_published_health(last_version):
+    """Follower watcher probe: the leader's check results (times left out) and the event to push"""
+    snapshot = health_snapshot()
+    if snapshot['checked_at'] is None:
+        return None, None
+    version = {k: v for k, v in snapshot.items() if k not in ('checked_at', 'next_check_at', 'consecutive_failures')}
+    return version, integration_snapshot(snapshot)
+
+def poll_published_sessions(last_version):
+    """Follower watcher probe: the leader's latest listing and the entries that differ from the last one"""
+    sessions = sessions_snapshot()['sessions']
+    return sessions, [e for e in sessions if e not in (last_version or [])]
+
+# Followers pass on the leader's health and session events to their own /api/events clients
+health_watcher = ChangeWatcher(event_broadcaster, poll_published_health, event='health',
+                               interval=EVENT_POLL_SECONDS, sticky=True)
+session_watcher = ChangeWatcher(event_broadcaster, poll_published_sessions, event='sessions',
+                                interval=EVENT_POLL_SECONDS)
+
+def start_event_watchers():
+    change_watcher.start()
+    if not service_leader.is_leader():
+        health_watcher.start()
+        session_watcher.start()
+
+@app.route('/api/events', methods=['GET'])
+def events():
+    """Server-Sent Events: activity changes, dispatch job transitions and health"""
+    start_event_watchers()
+    return Response(
+        event_broadcaster.stream(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/cache/status', methods=['GET'])
+def cache_status():
+    """Result cache hit, miss and eviction counters"""
+    return jsonify(result_cache.stats())
+
+@app.route('/api/events/status', methods=['GET'])
+def events_status():
+    """Connected SSE clients and broadcaster counters"""
+    return jsonify(event_broadcaster.stats())
+
+def component_stats():
+    """Numeric counters from each component's stats(), as {(component, stat): value}"""
+    components = {
+        'db_pool': db_pool.stats(),
+        'result_cache': result_cache.stats(),
+        'events': event_broadcaster.stats(),
+        'notification_outbox': notification_outbox.stats(),
+        'notification_digest': notification_digest.stats(),
+        'clawdbot_transport': clawdbot.stats(),
+        'session_registry': session_registry.stats(),
+        'notification_relay': notification_relay.stats(),
+        'service_leader': service_leader.stats(),
+        'slow_queries': slow_query_log.stats(),
     }
-    
-    try:
-        # Test clawdbot availability
-        result = subprocess.run(['clawdbot', '--version'], 
-                              capture_output=True, text=True, timeout=5)
-        health_status['clawdbot_available'] = result.returncode == 0
-        
-        # Test sessions spawn
-        result = subprocess.run(['clawdbot', 'sessions', 'list'], 
-                              capture_output=True, text=True, timeout=5)
-        health_status['sessions_spawn_available'] = result.returncode == 0
-        
-        # Test message tool (just command availability)
-        result = subprocess.run(['clawdbot', 'message', '--help'], 
-                              capture_output=True, text=True, timeout=5)
-        health_status['message_tool_available'] = result.returncode == 0
-        
-    except Exception as e:
-        health_status['error'] = str(e)
-    
-    return jsonify(health_status)
+    return {(component, stat): value
+            for component, stats in components.items()
+            for stat, value in stats.items()
+            if isinstance(value, (int, float))}
+
+metrics.gauge('ai_tracker_component_stat', 'Counters and sizes reported by the app\'s components',
+              component_stats, ('component', 'stat'))
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Request, SQL and Clawdbot latencies plus component counters, in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/admin/slow-queries', methods=['GET'])
+def get_slow_queries():
+    """Statements over the slow-query threshold, grouped by normalized SQL, with their query plans"""
+    sort = request.args.get('sort', 'total')
+    if sort not in ('total', 'max', 'count', 'recent'):
+        return jsonify({'error': 'sort must be total, max, count or recent'}), 400
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+    return jsonify(slow_query_log.report(sort=sort, limit=limit))
+
+@app.route('/api/admin/slow-queries', methods=['DELETE'])
+def reset_slow_queries():
+    """Forget collected slow queries, e.g. after adding an index"""
+    slow_query_log.reset()
+    return jsonify({'message': 'Slow query log cleared'})
 
 @app.route('/api/activities/<int:id>/retry', methods=['POST'])
 def retry_task(id):
     """Retry a failed task execution"""
     conn = get_db()
-    activity = conn.execute('SELECT * FROM activities WHERE id = ?', (id,)).fetchone()
-    conn.close()
+    activity = conn.execute(queries.ACTIVITY_BY_ID, (id,)).fetchone()
     
     if not activity:
         return jsonify({'error': 'Activity not found'}), 404
@@ -825,7 +1919,6 @@ def retry_task(id):
     activity_dict = dict(activity)
     
     # Reset status and clear previous failure notes
-    conn = get_db()
     conn.execute(
         '''UPDATE activities 
            SET status = 'todo', outcome = NULL, outcome_notes = NULL, 
@@ -834,14 +1927,44 @@ def retry_task(id):
         (datetime.now(), id)
     )
     conn.commit()
-    conn.close()
     
     # Re-execute the task
-    execute_task_via_clawdbot(activity_dict)
+    job = dispatch_queue.enqueue(id)
     
-    return jsonify({'success': True, 'message': f'Task "{activity_dict["title"]}" retry dispatched'})
+    return dispatch_accepted(job, f'Task "{activity_dict["title"]}" retry queued')
+
+def dispatch_accepted(job, message):
+    """202 response pointing the client at the dispatch job"""
+    status_url = f"/api/dispatch/jobs/{job['id']}"
+    response = jsonify({
+        'success': True,
+        'message': message,
+        'job_id': job['id'],
+        'job_status': job['status'],
+        'status_url': status_url
+    })
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    return response
+
+@app.route('/api/dispatch/jobs', methods=['GET'])
+def list_dispatch_jobs():
+    """List recent dispatch jobs, optionally for one activity or status"""
+    activity_id = request.args.get('activity_id', type=int)
+    status = request.args.get('status')
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    return jsonify(dispatch_queue.list_jobs(activity_id=activity_id, status=status, limit=limit))
+
+@app.route('/api/dispatch/jobs/<int:job_id>', methods=['GET'])
+def get_dispatch_job(job_id):
+    """Get the state of a single dispatch job"""
+    job = dispatch_queue.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
 
 @app.route('/api/capabilities', methods=['GET'])
+@cached_response
 def get_capabilities():
     """Get available Clawdbot capabilities for task planning"""
     capabilities = {
@@ -865,65 +1988,79 @@ def get_capabilities():
     
     return jsonify(capabilities)
 
-def check_clawdbot_integration():
-    """Check Clawdbot integration on startup"""
-    print("🔍 Checking Clawdbot integration...")
+def start_leader_services():
+    """Start what runs in one process per database; called once this process holds the leader lock"""
+    health_watcher.stop()
+    session_watcher.stop()
+    # A previous leader's results are stale; followers show unchecked until the first probe here
+    published.set('integration_health', None)
+    published.set('clawdbot_sessions', None)
+    health_prober.start()  # the first Clawdbot check runs while the server binds
+    session_registry.start()
+    notification_relay.start()
+
+# Probing, session listing and notification delivery run in whichever process holds this lock
+service_leader = LeaderLock(DATABASE + '.leader', on_acquire=start_leader_services, interval=LEADER_RETRY_SECONDS)
+
+def start_background_services():
+    """Start dispatch workers and watchers; once per serving process (after any fork).
+    One process also becomes the leader and starts the leader services."""
+    dispatch_queue.start()
+    service_leader.start()  # later attempts run on its own thread, never in a request
+    start_event_watchers()
+
+def begin_shutdown():
+    """First step of a graceful stop: end event streams so in-flight requests can finish"""
+    event_broadcaster.close_all()
+
+shutdown_started = threading.Event()
+shutdown_lock = threading.Lock()
+
+def stop_background_services(timeout=SHUTDOWN_DRAIN_SECONDS):
+    """Drain and stop: running dispatches finish (queued jobs stay in dispatch_jobs for
+    the next process), held digests and pending notifications are sent, watchers stop.
+    Runs once per process; later calls return at once."""
+    with shutdown_lock:
+        if shutdown_started.is_set():
+            return
+        shutdown_started.set()
+    deadline = time.monotonic() + timeout
+    def remaining():
+        return max(0.0, deadline - time.monotonic())
     
-    try:
-        # Check if clawdbot is available
-        result = subprocess.run(['clawdbot', '--version'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            print("✅ Clawdbot is available")
-        else:
-            print("⚠️  Clawdbot not available - tasks won't auto-execute")
-            return False
-            
-        # Check sessions capability
-        result = subprocess.run(['clawdbot', 'sessions', 'list', '--limit', '1'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            print("✅ Sessions spawn capability available")
-        else:
-            print("⚠️  Sessions not available - limited functionality")
-            
-        # Check message capability  
-        result = subprocess.run(['clawdbot', 'message', '--help'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            print("✅ Message tool available for notifications")
-        else:
-            print("⚠️  Message tool not available - notifications disabled")
-            global ENABLE_NOTIFICATIONS
-            ENABLE_NOTIFICATIONS = False
-            
-        print("🎯 Integration check complete")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Integration check failed: {e}")
-        print("⚠️  Running in standalone mode - no auto-execution")
-        return False
+    begin_shutdown()
+    service_leader.stop(timeout=min(5, remaining()))  # a stopping follower never takes over
+    dispatch_queue.stop(timeout=remaining())
+    notification_relay.stop(timeout=min(5, remaining()))  # relayed notifications join the digest
+    notification_digest.flush()
+    notification_outbox.stop(drain=True, timeout=remaining())
+    for service in (session_registry, health_prober, change_watcher, health_watcher, session_watcher):
+        service.stop(timeout=min(5, remaining()))
+    service_leader.release()  # another worker takes over within AI_TRACKER_LEADER_RETRY_SECONDS
+    outbox = notification_outbox.stats()
+    print(f"👋 Drained in {timeout - remaining():.1f}s: {outbox['sent']} notifications sent, "
+          f"{outbox['dropped']} dropped")
+    db_pool.close_all()
 
 if __name__ == '__main__':
     print("🚀 Starting AI Activity Tracker Pro...")
     print(f"📊 Server port: {SERVER_PORT}")
-    print(f"🔔 Notifications: {'Enabled' if ENABLE_NOTIFICATIONS else 'Disabled'}")
     print(f"🤖 Auto-execute: {'Enabled' if AUTO_EXECUTE else 'Disabled'}")
     print(f"📱 Notification channel: {NOTIFICATION_CHANNEL}")
+    print(f"🔌 Clawdbot transport: {clawdbot.name}" + (f" ({CLAWDBOT_URL}, CLI fallback)" if clawdbot.name == 'http' else ''))
     
     # Initialize database
     init_db()
     print("✅ Database initialized")
+    print(f"🔔 Notifications: {'Enabled' if notifications_enabled() else 'Disabled'}")
     
-    # Check Clawdbot integration
-    integration_ok = check_clawdbot_integration()
-    
-    if integration_ok:
-        print("🎉 AI Activity Tracker Pro ready with full Clawdbot integration!")
-    else:
-        print("📋 AI Activity Tracker Pro ready in tracking-only mode")
+    # Start background workers in the serving process only (not the reloader watcher)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_services()
+        print(f"🧵 Dispatch workers: {DISPATCH_WORKERS} (timeout {DISPATCH_TIMEOUT}s)")
+        print("🔍 Checking Clawdbot integration in the background...")
     
+    print("🎉 AI Activity Tracker Pro ready")
     print(f"🌐 Access your tracker at: http://localhost:{SERVER_PORT}")
     print("=" * 60)
     
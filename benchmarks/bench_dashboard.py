@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Dashboard benchmark
+Compares the original full-table dashboard aggregates with the activity_rollup
+queries at several table sizes, and checks that both return the same numbers.
+
+    python benchmarks/bench_dashboard.py                     # 10k, 100k, 1M rows
+    python benchmarks/bench_dashboard.py --sizes 10000 50000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import migrations
+import queries
+from db import PRAGMAS
+
+# The six queries get_dashboard ran before the rollups
+LEGACY_QUERIES = {
+    'total': 'SELECT COUNT(*) as count FROM activities',
+    'completed': 'SELECT COUNT(*) as count FROM activities WHERE status = "done"',
+    'total_time': 'SELECT SUM(time_spent) as total FROM activities',
+    'outcomes': '''SELECT outcome, COUNT(*) as count FROM activities
+                   WHERE outcome IS NOT NULL AND outcome != "" GROUP BY outcome''',
+    'tool_stats': '''SELECT ai_tool, COUNT(*) as total,
+                            SUM(CASE WHEN outcome = 'success' THEN 1 ELSE 0 END) as successes,
+                            SUM(CASE WHEN outcome = 'partial' THEN 1 ELSE 0 END) as partials,
+                            SUM(CASE WHEN outcome = 'failed' THEN 1 ELSE 0 END) as failures,
+                            SUM(time_spent) as total_time, AVG(time_spent) as avg_time,
+                            AVG(iteration_count) as avg_iterations
+                     FROM activities WHERE ai_tool IS NOT NULL AND ai_tool != "" GROUP BY ai_tool''',
+    'failure_reasons': '''SELECT failure_reason, COUNT(*) as count FROM activities
+                          WHERE failure_reason IS NOT NULL AND failure_reason != ""
+                          GROUP BY failure_reason ORDER BY count DESC''',
+    'project_stats': '''SELECT project, COUNT(*) as total,
+                               SUM(CASE WHEN status = 'done' THEN 1 ELSE 0 END) as completed,
+                               SUM(time_spent) as total_time
+                        FROM activities WHERE project IS NOT NULL AND project != "" GROUP BY project''',
+}
+
+ROLLUP_QUERIES = {
+    'overview': queries.DASHBOARD_OVERVIEW,
+    'outcomes': queries.DASHBOARD_OUTCOMES,
+    'tool_stats': queries.DASHBOARD_TOOL_STATS,
+    'failure_reasons': queries.DASHBOARD_FAILURE_REASONS,
+    'project_stats': queries.DASHBOARD_PROJECT_STATS,
+}
+
+TOOLS = ['Claude', 'ChatGPT', 'Copilot', 'Cursor', 'Gemini', 'Codex', None]
+PROJECTS = [f'project-{n}' for n in range(20)] + [None]
+OUTCOMES = ['success', 'partial', 'failed', None]
+FAILURES = ['hallucination', 'context limit', 'wrong tool', 'timeout', None]
+STATUSES = ['todo', 'in-progress', 'done']
+
+
+def connect(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    for name, value in PRAGMAS.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def seed(conn, rows, rng):
+    """Insert `rows` activities through the normal triggers; returns rows/second"""
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    batch = []
+    for n in range(rows):
+        outcome = rng.choice(OUTCOMES)
+        batch.append((
+            f'Task {n}', rng.choice(TOOLS), rng.choice(PROJECTS), rng.choice(STATUSES),
+            n, rng.randint(0, 7200), outcome,
+            rng.choice(FAILURES) if outcome == 'failed' else None, rng.randint(1, 5),
+            (now - timedelta(seconds=rng.randint(0, 365 * 86400))).strftime('%Y-%m-%d %H:%M:%S'),
+        ))
+        if len(batch) == 10000 or n == rows - 1:
+            conn.execute('BEGIN')
+            conn.executemany(
+                '''INSERT INTO activities (title, ai_tool, project, status, position, time_spent,
+                   outcome, failure_reason, iteration_count, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', batch)
+            conn.execute('COMMIT')
+            batch = []
+    return rows / (time.perf_counter() - started)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run_legacy(conn):
+    return {name: [dict(r) for r in conn.execute(sql).fetchall()] for name, sql in LEGACY_QUERIES.items()}
+
+
+def run_rollup(conn, start_day):
+    return {name: [dict(r) for r in conn.execute(sql, (start_day,)).fetchall()] for name, sql in ROLLUP_QUERIES.items()}
+
+
+def same(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and abs(a - b) < 1e-6
+    return a == b
+
+
+def check(legacy, rollup):
+    """Both paths must report the same all-time numbers"""
+    overview = rollup['overview'][0]
+    assert overview['total'] == legacy['total'][0]['count']
+    assert overview['completed'] == legacy['completed'][0]['count']
+    assert overview['total_time'] == (legacy['total_time'][0]['total'] or 0)
+    for name in ('outcomes', 'tool_stats', 'failure_reasons', 'project_stats'):
+        assert len(legacy[name]) == len(rollup[name]), name
+        for old, new in zip(legacy[name], rollup[name]):
+            for key in old:
+                assert same(old[key], new[key]), (name, key, old[key], new[key])
+
+
+def bench(rows, repeat, seed_value):
+    workdir = tempfile.mkdtemp(prefix='bench_dashboard_')
+    conn = connect(os.path.join(workdir, 'bench.db'))
+    migrations.migrate(conn)
+    insert_rate = seed(conn, rows, random.Random(seed_value))
+    conn.execute('ANALYZE')
+
+    check(run_legacy(conn), run_rollup(conn, ''))
+    month_ago = (datetime.now(timezone.utc) - timedelta(days=30)).strftime('%Y-%m-%d')
+    groups = conn.execute('SELECT COUNT(*) FROM activity_rollup').fetchone()[0]
+    result = {
+        'rows': rows,
+        'groups': groups,
+        'insert_rows_per_s': insert_rate,
+        'legacy_ms': timed(lambda: run_legacy(conn), repeat),
+        'rollup_all_ms': timed(lambda: run_rollup(conn, ''), repeat),
+        'rollup_30d_ms': timed(lambda: run_rollup(conn, month_ago), repeat),
+    }
+    conn.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per path (median reported)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'groups':>8} {'insert/s':>10} {'legacy ms':>10} {'rollup ms':>10} {'30d ms':>8} {'speedup':>8}")
+    for rows in args.sizes:
+        r = bench(rows, args.repeat, args.seed)
+        print(f"{r['rows']:>10} {r['groups']:>8} {r['insert_rows_per_s']:>10.0f} {r['legacy_ms']:>10.1f} "
+              f"{r['rollup_all_ms']:>10.1f} {r['rollup_30d_ms']:>8.1f} {r['legacy_ms'] / r['rollup_all_ms']:>7.1f}x")
+    print("✅ Rollup results match the full-table aggregates")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
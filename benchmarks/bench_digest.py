@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Notification digest benchmark
+Replays a burst of task completions (a share of them failed) through the
+digest scheduler, rate limiter and outbox the app uses, with an in-memory
+channel in place of Clawdbot. Reports events against messages actually
+sent, and how long failures took to reach the channel.
+
+    python benchmarks/bench_digest.py                      # 200 completions over 10s
+    python benchmarks/bench_digest.py --events 1000 --duration 30 --digest 5 --rate 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from notification_digest import DigestScheduler, RateLimiter
+from notification_outbox import NotificationOutbox
+
+TOOLS = ['Claude', 'GPT-4', 'Gemini', 'Copilot']
+PROJECTS = ['The Decode', 'Website', 'Research']
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else 0.0
+
+
+def run(events, duration, digest_seconds, per_minute, burst, failure_rate, seed):
+    rng = random.Random(seed)
+    sent = []
+    failures_seen = {}
+    lock = threading.Lock()
+
+    def deliver(text):
+        with lock:
+            sent.append(text)
+            for marker in list(failures_seen):
+                if failures_seen[marker] is None and marker in text:
+                    failures_seen[marker] = time.perf_counter()
+        return True
+
+    limiter = RateLimiter(per_minute=per_minute, burst=burst)
+    outbox = NotificationOutbox(deliver, maxsize=events, coalesce_window=0.5,
+                                limiter=lambda: limiter.wait('bench'))
+    digest = DigestScheduler(outbox.submit, interval=digest_seconds)
+
+    failed_at = {}
+    started = time.perf_counter()
+    for n in range(events):
+        activity = {'id': n, 'title': f'Task {n}', 'ai_tool': rng.choice(TOOLS), 'project': rng.choice(PROJECTS)}
+        failed = rng.random() < failure_rate
+        text = f"Task completed: {'❌ Failed' if failed else '✅ Success'} — {activity['title']} [#{n}]"
+        if failed:
+            with lock:
+                failures_seen[f'[#{n}]'] = None
+            failed_at[f'[#{n}]'] = time.perf_counter()
+        digest.notify(text, kind='failed' if failed else 'completed', activity=activity, key=n)
+        time.sleep(max(0.0, started + duration * (n + 1) / events - time.perf_counter()))
+
+    digest.flush()
+    outbox.stop(drain=True, timeout=digest_seconds + 60 * burst / max(per_minute, 1) + 10)
+    latencies = [failures_seen[m] - failed_at[m] for m in failed_at if failures_seen[m] is not None]
+    return {
+        'events': events,
+        'messages': len(sent),
+        'failures': len(failed_at),
+        'failure_p50_s': percentile(latencies, 50),
+        'failure_max_s': max(latencies, default=0.0),
+        'digest': digest.stats(),
+        'outbox': outbox.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds the completions are spread over')
+    parser.add_argument('--digest', type=float, default=2.0, help='digest window in seconds')
+    parser.add_argument('--rate', type=float, default=60.0, help='sends per minute per channel')
+    parser.add_argument('--burst', type=int, default=5)
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'events':>7} {'messages':>9} {'digests':>8} {'deferred':>9} {'merged':>7} "
+          f"{'fail p50 s':>11} {'fail max s':>11}")
+    for mode, digest_seconds, rate in (('per-event', 0, 0), ('digest', args.digest, args.rate)):
+        r = run(args.events, args.duration, digest_seconds, rate, args.burst, args.failure_rate, args.seed)
+        print(f"{mode:>10} {r['events']:>7} {r['messages']:>9} {r['digest']['digests']:>8} "
+              f"{r['outbox']['deferred']:>9} {r['outbox']['merged']:>7} "
+              f"{r['failure_p50_s']:>11.2f} {r['failure_max_s']:>11.2f}")
+        if r['outbox']['dropped'] or r['digest']['held']:
+            print(f"❌ {r['outbox']['dropped']} dropped, {r['digest']['held']} still held")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
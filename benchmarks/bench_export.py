@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - CSV export memory benchmark
+Measures peak RSS while exporting the whole table, for the streaming export
+and for the old fetchall/StringIO implementation. Each measurement runs in a
+fresh process so earlier runs don't inflate the peak.
+
+    python benchmarks/bench_export.py                        # 10k, 100k, 1M rows
+    python benchmarks/bench_export.py --sizes 10000 100000 --no-legacy
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def proc_status_mb(field):
+    """A memory field from /proc/self/status in MB, or None off Linux"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mb():
+    # VmHWM starts fresh at exec; ru_maxrss can carry over the parent's peak
+    peak = proc_status_mb('VmHWM')
+    return peak if peak is not None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def anon_rss_mb():
+    """Heap-like (anonymous) resident memory; RSS also counts SQLite's mmap'd file pages"""
+    return proc_status_mb('RssAnon') or 0.0
+
+
+def child(db_path, mode):
+    """Export once in this process and print the measurements as JSON"""
+    os.environ.update(AI_TRACKER_DATABASE=db_path, AI_TRACKER_NOTIFICATIONS='false',
+                      AI_TRACKER_AUTO_EXECUTE='false')
+    import app as tracker
+
+    tracker.init_db()
+    baseline = peak_rss_mb()
+    anon_baseline = anon_peak = anon_rss_mb()
+    started = time.perf_counter()
+    size = 0
+    first_chunk = None
+
+    if mode == 'legacy':
+        # The original implementation: every row, one StringIO, one string
+        with tracker.db_connection() as conn:
+            sql, params = tracker.queries.export_rows()
+            activities = conn.execute(sql, params).fetchall()
+            output = io.StringIO()
+            writer = csv.writer(output)
+            for activity in activities:
+                writer.writerow(list(activity))
+            body = output.getvalue()
+        size = len(body.encode())
+        anon_peak = anon_rss_mb()
+        first_chunk = time.perf_counter() - started
+    else:
+        headers = {'Accept-Encoding': 'gzip'} if mode == 'gzip' else {}
+        with tracker.app.test_request_context('/api/export/csv', headers=headers):
+            response = tracker.export_csv()
+        for chunk in response.response:
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+            size += len(chunk.encode() if isinstance(chunk, str) else chunk)
+            anon_peak = max(anon_peak, anon_rss_mb())
+
+    print(json.dumps({
+        'baseline_mb': baseline,
+        'peak_mb': peak_rss_mb(),
+        'anon_growth_mb': anon_peak - anon_baseline,
+        'bytes': size,
+        'seconds': time.perf_counter() - started,
+        'first_chunk_ms': (first_chunk or 0) * 1000,
+    }))
+
+
+def measure(db_path, mode):
+    out = subprocess.run([sys.executable, __file__, '--child', db_path, mode],
+                         capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--no-legacy', action='store_true', help='skip the fetchall/StringIO comparison')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--child', nargs=2, metavar=('DB', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return 0
+
+    import bench_dashboard
+    import migrations
+
+    modes = ['stream', 'gzip'] + ([] if args.no_legacy else ['legacy'])
+    print(f"{'rows':>10} {'mode':>7} {'MB out':>8} {'seconds':>8} {'1st chunk ms':>12} "
+          f"{'RSS base MB':>11} {'RSS peak MB':>11} {'growth MB':>9} {'heap growth MB':>14}")
+    for rows in args.sizes:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='bench_export_'), 'bench.db')
+        conn = bench_dashboard.connect(db_path)
+        migrations.migrate(conn)
+        bench_dashboard.seed(conn, rows, random.Random(args.seed))
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')  # keep WAL recovery out of the children's RSS
+        conn.close()
+        for mode in modes:
+            r = measure(db_path, mode)
+            print(f"{rows:>10} {mode:>7} {r['bytes'] / 1e6:>8.1f} {r['seconds']:>8.2f} {r['first_chunk_ms']:>12.1f} "
+                  f"{r['baseline_mb']:>11.1f} {r['peak_mb']:>11.1f} {r['peak_mb'] - r['baseline_mb']:>9.1f} "
+                  f"{r['anon_growth_mb']:>14.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Bulk import benchmark
+Import throughput (rows/second) of POST /api/activities/bulk with NDJSON and
+JSON array bodies, against one POST /api/activities per row. Runs the Flask
+app in-process on a temporary database with notifications and auto-execute off.
+
+    python benchmarks/bench_import.py                 # 10k and 100k rows
+    python benchmarks/bench_import.py --sizes 50000 --single 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+WORKDIR = tempfile.mkdtemp(prefix='bench_import_')
+os.environ['AI_TRACKER_DATABASE'] = os.path.join(WORKDIR, 'bench.db')
+os.environ['AI_TRACKER_NOTIFICATIONS'] = 'false'
+os.environ['AI_TRACKER_AUTO_EXECUTE'] = 'false'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import app as tracker  # noqa: E402
+
+TOOLS = ['Claude', 'ChatGPT', 'Copilot', 'Cursor', 'Gemini']
+OUTCOMES = ['success', 'partial', 'failed', None]
+
+
+def make_rows(count, rng):
+    return [{
+        'title': f'Imported task {n}',
+        'description': 'Historical activity imported for benchmarking ' * 2,
+        'ai_tool': rng.choice(TOOLS),
+        'project': f'project-{rng.randint(0, 19)}',
+        'status': rng.choice(['todo', 'in-progress', 'done']),
+        'time_spent': rng.randint(0, 7200),
+        'outcome': rng.choice(OUTCOMES),
+        'iteration_count': rng.randint(1, 5),
+        'created_at': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00',
+    } for n in range(count)]
+
+
+def reset():
+    with tracker.db_connection() as conn:
+        conn.execute('DELETE FROM activities')
+        conn.commit()
+
+
+def run(client, label, rows, send):
+    reset()
+    started = time.perf_counter()
+    inserted = send(client, rows)
+    elapsed = time.perf_counter() - started
+    assert inserted == len(rows), (label, inserted)
+    print(f"{label:>14} {len(rows):>9} {elapsed:>9.2f} {len(rows) / elapsed:>10.0f}")
+    return len(rows) / elapsed
+
+
+def send_ndjson(client, rows):
+    body = '\n'.join(json.dumps(r) for r in rows)
+    return client.post('/api/activities/bulk', data=body, content_type='application/x-ndjson').json['inserted']
+
+
+def send_array(client, rows):
+    return client.post('/api/activities/bulk', json=rows).json['inserted']
+
+
+def send_single(client, rows):
+    for row in rows:
+        client.post('/api/activities', json=row)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--single', type=int, default=2000, help='rows for the one-POST-per-row baseline')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    tracker.init_db()
+    client = tracker.app.test_client()
+    rng = random.Random(args.seed)
+
+    print(f"{'mode':>14} {'rows':>9} {'seconds':>9} {'rows/s':>10}")
+    single = run(client, 'single POST', make_rows(args.single, rng), send_single)
+    for size in args.sizes:
+        rows = make_rows(size, rng)
+        ndjson = run(client, 'bulk NDJSON', rows, send_ndjson)
+        run(client, 'bulk array', rows, send_array)
+    print(f"Bulk NDJSON is {ndjson / single:.0f}x the single-POST rate")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
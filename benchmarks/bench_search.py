@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Full-text search benchmark
+Seeds activities with Zipf-distributed text and times what GET /api/search
+runs (capped count, one page, facets) for rare, mid-frequency and common
+words, two-word queries, prefixes and filtered searches.
+
+    python benchmarks/bench_search.py                        # 100k and 1M activities
+    python benchmarks/bench_search.py --sizes 50000 --repeat 9
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+import queries
+import search
+from bench_dashboard import PROJECTS, STATUSES, TOOLS, connect, timed
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'su', 'ta', 'ri', 'po', 'de', 'fu', 'ga', 'hi', 'jo', 'be', 'cu', 'vy']
+VOCABULARY = [''.join(p) for p in itertools.product(SYLLABLES, repeat=3)][:4000]
+
+
+def sentence(rng, weights, words):
+    return ' '.join(rng.choices(VOCABULARY, cum_weights=weights, k=words))
+
+
+def seed(conn, rows, rng):
+    """Insert `rows` activities through the normal triggers; returns rows/second"""
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+    started = time.perf_counter()
+    batch = []
+    for n in range(rows):
+        batch.append((
+            sentence(rng, weights, rng.randint(3, 8)), sentence(rng, weights, rng.randint(15, 40)),
+            sentence(rng, weights, rng.randint(0, 12)) or None,
+            rng.choice(TOOLS), rng.choice(PROJECTS), rng.choice(STATUSES), n,
+        ))
+        if len(batch) == 10000 or n == rows - 1:
+            conn.execute('BEGIN')
+            conn.executemany(
+                '''INSERT INTO activities (title, description, outcome_notes, ai_tool, project, status, position)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''', batch)
+            conn.execute('COMMIT')
+            batch = []
+    return rows / (time.perf_counter() - started)
+
+
+def search_once(conn, text, exact_limit, limit=20, **filters):
+    """The queries GET /api/search runs: capped count(s), one page, facets"""
+    match = search.match_expression(text)
+    matches = conn.execute(queries.SEARCH_MATCH_COUNT, (match, exact_limit + 1)).fetchone()[0]
+    if matches < limit:
+        match = search.match_expression(text, prefix=True)
+        matches = conn.execute(queries.SEARCH_MATCH_COUNT, (match, exact_limit + 1)).fetchone()[0]
+    exact = matches <= exact_limit
+    conn.execute(*queries.search_results(match, limit=limit, order='rank' if exact else 'recent', **filters)).fetchall()
+    facets = conn.execute(*queries.search_facets(match, sample=None if exact else exact_limit, **filters)).fetchall()
+    return sum(r['count'] for r in facets), exact
+
+
+def bench(rows, repeat, seed_value, exact_limit):
+    conn = connect(os.path.join(tempfile.mkdtemp(prefix='bench_search_'), 'bench.db'))
+    migrations.migrate(conn)
+    rate = seed(conn, rows, random.Random(seed_value))
+    search.optimize(conn)
+    conn.execute('ANALYZE')
+
+    cases = [
+        ('rare word', VOCABULARY[3000], {}),
+        ('mid word', VOCABULARY[300], {}),
+        ('common word', VOCABULARY[20], {}),
+        ('two words', f'{VOCABULARY[20]} {VOCABULARY[300]}', {}),
+        ('prefix 3', VOCABULARY[300][:3], {}),
+        ('prefix 5', VOCABULARY[300][:5], {}),
+        ('filtered', VOCABULARY[300], {'statuses': ['done'], 'ai_tool': 'Claude'}),
+    ]
+    print(f"\n{rows} activities ({rate:.0f} inserts/s)")
+    print(f"{'query':>12} {'matches':>9} {'order':>10} {'ms':>8}")
+    for label, text, filters in cases:
+        matches, exact = search_once(conn, text, rows, **filters)  # uncapped, for the report
+        _, exact = search_once(conn, text, exact_limit, **filters)
+        ms = timed(lambda: search_once(conn, text, exact_limit, **filters), repeat)
+        print(f"{label:>12} {matches:>9} {'relevance' if exact else 'recent':>10} {ms:>8.1f}")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per query (median reported)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--exact-limit', type=int, default=1000,
+                        help="matches ranked by relevance (app.py's SEARCH_EXACT_LIMIT)")
+    args = parser.parse_args()
+
+    for rows in args.sizes:
+        bench(rows, args.repeat, args.seed, args.exact_limit)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
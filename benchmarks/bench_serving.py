@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Serving mode benchmark
+Runs the HTTP load test (load_test.py) once against the Flask development
+server (app.py) and once against serve.py's gunicorn workers, on the same
+seeded data and request mix, and prints throughput and latency side by side.
+Each run's full per-route results are kept as JSON.
+
+    python benchmarks/bench_serving.py                                  # 8 client threads, 20s per run
+    python benchmarks/bench_serving.py --workers 4 --server-threads 16 --threads 32 --duration 60
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run(mode, args):
+    output = f"{args.output_prefix}_{mode}.json"
+    command = [sys.executable, os.path.join(HERE, 'load_test.py'), '--server', mode,
+               '--threads', str(args.threads), '--duration', str(args.duration),
+               '--activities', str(args.activities), '--seed', str(args.seed),
+               '--workers', str(args.workers), '--server-threads', str(args.server_threads),
+               '--output', output]
+    print(f"🚦 {mode}: {' '.join(command[1:])}")
+    completed = subprocess.run(command, stdout=subprocess.DEVNULL)
+    if not os.path.exists(output):
+        raise RuntimeError(f"load_test.py --server {mode} failed (exit {completed.returncode})")
+    with open(output) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8, help='client threads')
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds of load per run')
+    parser.add_argument('--activities', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=min(os.cpu_count() or 1, 4), help='serve.py worker processes')
+    parser.add_argument('--server-threads', type=int, default=16, help='serve.py request threads per worker')
+    parser.add_argument('--output-prefix', default='serving', help='writes <prefix>_dev.json and <prefix>_production.json')
+    args = parser.parse_args()
+
+    results = {mode: run(mode, args) for mode in ('dev', 'production')}
+
+    print(f"\n{'server':<28} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'err':>5}")
+    for mode, result in results.items():
+        t = result['total']
+        label = 'app.py (dev server)' if mode == 'dev' else f"serve.py ({args.workers}x{args.server_threads})"
+        print(f"{label:<28} {t['requests']:>7} {t['throughput_rps']:>8} {t['p50_ms']:>8} {t['p90_ms']:>8} "
+              f"{t['p99_ms']:>8} {t['max_ms']:>8} {t['errors']:>5}")
+    dev, production = results['dev']['total'], results['production']['total']
+    if dev['throughput_rps']:
+        print(f"\nThroughput {production['throughput_rps'] / dev['throughput_rps']:.2f}x the dev server "
+              f"on {os.cpu_count()} CPU(s)")
+    return 1 if dev['errors'] or production['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
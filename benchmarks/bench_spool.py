@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Notification spool benchmark
+Queues thousands of messages in a spool directory, then drains it through the
+pooled HTTP transport against the local Clawdbot stub with 1 and 8 senders.
+A share of sends fails on purpose; the run checks that every message is
+delivered exactly once after retries and that nothing is left behind.
+
+    python benchmarks/bench_spool.py                         # 5000 messages, 5% failures
+    python benchmarks/bench_spool.py --messages 20000 --workers 1 4 16 --latency 0.02
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from clawdbot_transport import HttpTransport
+from notification_service import SpoolSender, spool_message
+from stub_clawdbot import start_server
+
+
+def bench(url, state, messages, workers, failure_rate, seed):
+    spool_dir = tempfile.mkdtemp(prefix='bench_spool_')
+    started = time.perf_counter()
+    for n in range(messages):
+        spool_message(f'Benchmark message {n}', spool_dir)
+    spool_rate = messages / (time.perf_counter() - started)
+
+    transport = HttpTransport(url, pool_size=workers)
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def send(message):
+        with lock:
+            fail = rng.random() < failure_rate
+        return not fail and transport.send_message(message, channel='telegram').ok
+
+    before = state.counters['message']
+    sender = SpoolSender(spool_dir, send, workers=workers, backoff=0.01, max_backoff=0.05, max_attempts=20)
+    started = time.perf_counter()
+    sender.run(until_empty=True)
+    elapsed = time.perf_counter() - started
+    sender.close()
+    transport.close()
+
+    left = sum(len(os.listdir(os.path.join(spool_dir, sub))) for sub in ('new', 'cur', 'dead'))
+    return {
+        'spool_per_s': spool_rate,
+        'sent_per_s': sender.counters['sent'] / elapsed,
+        'delivered': state.counters['message'] - before,
+        'retried': sender.counters['retried'],
+        'dead': sender.counters['dead'],
+        'left': left,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--latency', type=float, default=0.005, help='seconds the stub takes per message')
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    server, state, url = start_server(latency=args.latency)
+    print(f"{'senders':>8} {'spooled/s':>10} {'sent/s':>8} {'delivered':>10} {'retried':>8} {'dead':>5} {'left':>5}")
+    for workers in args.workers:
+        r = bench(url, state, args.messages, workers, args.failure_rate, args.seed)
+        print(f"{workers:>8} {r['spool_per_s']:>10.0f} {r['sent_per_s']:>8.0f} {r['delivered']:>10} "
+              f"{r['retried']:>8} {r['dead']:>5} {r['left']:>5}")
+        if r['delivered'] != args.messages or r['left']:
+            print(f"❌ expected {args.messages} deliveries and an empty spool")
+            return 1
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Time series benchmark
+Times a year of daily and weekly per-tool totals read from time_buckets against
+summing the same year straight from time_sessions, at several session counts.
+
+    python benchmarks/bench_timeseries.py                    # 10k, 100k, 500k sessions
+    python benchmarks/bench_timeseries.py --sizes 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+import queries
+import timeseries
+from bench_dashboard import PROJECTS, TOOLS, connect, timed
+
+# What the endpoint would cost without buckets (sessions crossing midnight aside)
+SESSIONS_BY_DAY = '''
+    SELECT date(started_at) as bucket, COALESCE(ai_tool, '') as value, SUM(seconds) as seconds
+    FROM time_sessions
+    WHERE started_at >= ? AND started_at < ?
+    GROUP BY 1, 2
+'''
+
+
+def seed(conn, sessions, rng):
+    """Record `sessions` timer intervals over the last year; returns sessions/second"""
+    now = datetime.now().replace(microsecond=0)
+    started = time.perf_counter()
+    conn.execute('BEGIN')
+    for n in range(sessions):
+        start = now - timedelta(seconds=rng.randint(0, 365 * 86400))
+        activity = {'id': n, 'ai_tool': rng.choice(TOOLS), 'project': rng.choice(PROJECTS)}
+        timeseries.record_session(conn, activity, start.isoformat(), start + timedelta(seconds=rng.randint(60, 3 * 3600)))
+        if n % 10000 == 9999:
+            conn.execute('COMMIT')
+            conn.execute('BEGIN')
+    conn.execute('COMMIT')
+    return sessions / (time.perf_counter() - started)
+
+
+def bench(sessions, repeat, seed_value):
+    conn = connect(os.path.join(tempfile.mkdtemp(prefix='bench_timeseries_'), 'bench.db'))
+    migrations.migrate(conn)
+    rate = seed(conn, sessions, random.Random(seed_value))
+    conn.execute('ANALYZE')
+
+    end = datetime.now() + timedelta(days=1)
+    start = end - timedelta(days=366)
+    days = (start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+    result = {
+        'sessions': sessions,
+        'buckets': conn.execute('SELECT COUNT(*) FROM time_buckets').fetchone()[0],
+        'record_per_s': rate,
+        'sessions_ms': timed(lambda: conn.execute(SESSIONS_BY_DAY, days).fetchall(), repeat),
+        'days_ms': timed(lambda: conn.execute(queries.TIMESERIES_BUCKETS, ('day', 'ai_tool') + days).fetchall(), repeat),
+        'weeks_ms': timed(lambda: conn.execute(queries.TIMESERIES_WEEKS, ('ai_tool',) + days).fetchall(), repeat),
+    }
+    conn.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per query (median reported)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'sessions':>10} {'buckets':>8} {'record/s':>9} {'sessions ms':>12} {'days ms':>8} {'weeks ms':>9}")
+    for sessions in args.sizes:
+        r = bench(sessions, args.repeat, args.seed)
+        print(f"{r['sessions']:>10} {r['buckets']:>8} {r['record_per_s']:>9.0f} {r['sessions_ms']:>12.1f} "
+              f"{r['days_ms']:>8.1f} {r['weeks_ms']:>9.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Clawdbot transport benchmark
+Sends notifications through each transport against the local Clawdbot stub
+and reports messages per second and per-message latency: the CLI transport
+(one fake `clawdbot` process per message), the pooled HTTP transport, and
+HTTP without connection reuse for comparison.
+
+    python benchmarks/bench_transport.py                     # 500 messages, 1 and 4 senders
+    python benchmarks/bench_transport.py --messages 2000 --threads 1 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from clawdbot_transport import CliTransport, HttpTransport, Result
+from stub_clawdbot import start_server, write_fake_cli
+
+
+class OneShotHttp:
+    """requests.post per message: a new TCP connection every time"""
+
+    def __init__(self, url):
+        self.url = url + '/tools/invoke'
+
+    def send_message(self, message, channel=None, timeout=10):
+        response = requests.post(self.url, json={'tool': 'message', 'args': {'action': 'send', 'message': message}},
+                                 timeout=timeout)
+        return Result(response.ok)
+
+
+def run(transport, messages, threads):
+    """-> (messages/second, p50 ms, p99 ms, failures)"""
+    def send(n):
+        started = time.perf_counter()
+        ok = transport.send_message(f'Benchmark message {n}', channel='telegram').ok
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(send, range(messages)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(seconds * 1000 for seconds, _ in results)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return messages / elapsed, statistics.median(latencies), p99, sum(1 for _, ok in results if not ok)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the stub adds to every call')
+    args = parser.parse_args()
+
+    server, state, url = start_server(latency=args.latency)
+    cli_dir = tempfile.mkdtemp(prefix='bench_transport_')
+    write_fake_cli(cli_dir, args.latency)
+    os.environ['PATH'] = cli_dir + os.pathsep + os.environ['PATH']
+
+    transports = [
+        ('cli', lambda threads: CliTransport()),
+        ('http pooled', lambda threads: HttpTransport(url, pool_size=threads)),
+        ('http one-shot', lambda threads: OneShotHttp(url)),
+    ]
+    print(f"{'transport':>14} {'threads':>8} {'msgs/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7}")
+    for name, make in transports:
+        for threads in args.threads:
+            transport = make(threads)
+            run(transport, min(20, args.messages), threads)  # warm up
+            rate, p50, p99, failed = run(transport, args.messages, threads)
+            print(f"{name:>14} {threads:>8} {rate:>9.0f} {p50:>8.2f} {p99:>8.2f} {failed:>7}")
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
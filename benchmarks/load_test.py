@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - HTTP load test
+Seeds a scratch database, starts the tracker against a fake Clawdbot (the
+gateway stub, or the fake CLI with --transport cli), and drives every route
+in app.py from several threads: board pages, cards, moves, timers, the
+dashboard, search, analytics, exports, the calendar feed, notifications,
+dispatch and the event stream. Latency percentiles and throughput per route
+are written to a JSON file; --compare prints the change against an earlier
+run, so two commits can be compared on the same seed. --server production
+runs serve.py (gunicorn workers) instead of the Flask development server.
+
+    python benchmarks/load_test.py                                     # 8 threads for 30s
+    python benchmarks/load_test.py --threads 16 --duration 60 --activities 50000 --output after.json
+    python benchmarks/load_test.py --compare before.json --output after.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8080         # a tracker that is already running
+    python benchmarks/load_test.py --server production --workers 4 --server-threads 16
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from seed_data import PROJECTS, TOOLS, connect, generate  # noqa: E402
+from stub_clawdbot import write_fake_cli  # noqa: E402
+import migrations  # noqa: E402
+
+SEARCH_WORDS = ['login', 'export', 'tests', 'schema', 'cache*', 'deploy', 'webhook', 'docs', 'latency']
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return None
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def summarize(latencies, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p90_ms': _ms(percentile(latencies, 90)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+        'max_ms': _ms(latencies[-1] if latencies else None),
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class Recorder:
+    """Latencies and status counts per route, shared by the driver threads"""
+
+    def __init__(self):
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds, status):
+        with self._lock:
+            entry = self.routes.setdefault(route, {'latencies': [], 'statuses': {}, 'errors': 0})
+            entry['latencies'].append(seconds)
+            entry['statuses'][str(status)] = entry['statuses'].get(str(status), 0) + 1
+            if status == 'error' or status >= 500:
+                entry['errors'] += 1
+
+    def report(self, elapsed):
+        with self._lock:
+            routes = {route: dict(summarize(entry['latencies'], elapsed), errors=entry['errors'],
+                                  statuses=entry['statuses'])
+                      for route, entry in sorted(self.routes.items())}
+            every = [s for entry in self.routes.values() for s in entry['latencies']]
+            errors = sum(entry['errors'] for entry in self.routes.values())
+        return dict(summarize(every, elapsed), errors=errors), routes
+
+
+class Client:
+    """One driver thread: a keep-alive session, a seeded RNG and the activity ids it knows about"""
+
+    def __init__(self, base_url, recorder, rng, ids, timeout):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.rng = rng
+        self.ids = ids
+        self.timeout = timeout
+        self.mine = []  # created by this thread, so safe to delete
+        self.session = requests.Session()
+
+    def call(self, route, method, path, stream=False, first_line=False, **kwargs):
+        """Time one request, reading the whole body (or only its first line)"""
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.timeout,
+                                            stream=stream or first_line, **kwargs)
+            if first_line:
+                next(response.iter_lines(), None)
+                response.close()
+            elif stream:
+                for _ in response.iter_content(65536):
+                    pass
+            status = response.status_code
+        except requests.RequestException:
+            response, status = None, 'error'
+        self.recorder.record(route, time.perf_counter() - started, status)
+        return response
+
+    def json(self, response):
+        try:
+            return response.json() if response is not None and response.ok else None
+        except ValueError:
+            return None
+
+    def some_id(self):
+        return self.rng.choice(self.mine) if self.mine and self.rng.random() < 0.3 else self.rng.choice(self.ids)
+
+    def new_activity(self):
+        tool = self.rng.choice(TOOLS)[0]
+        return {'title': f'Load test {self.rng.randrange(10 ** 6)}', 'description': 'Created by load_test.py',
+                'ai_tool': tool, 'project': self.rng.choice(PROJECTS), 'status': 'todo'}
+
+
+# Scenarios: (weight, function(client)). Most traffic is reads, as from the board UI.
+
+def board_page(c):
+    c.call('GET /api/activities', 'GET', '/api/activities', params={'limit': 200})
+
+
+def board_filtered(c):
+    c.call('GET /api/activities?filters', 'GET', '/api/activities',
+           params={'status': 'open', 'ai_tool': c.rng.choice(TOOLS)[0] or 'Claude', 'limit': 100})
+
+
+def board_changes(c):
+    c.call('GET /api/activities?since', 'GET', '/api/activities', params={'since': c.rng.randint(0, 50)})
+
+
+def get_activity(c):
+    c.call('GET /api/activities/<id>', 'GET', f'/api/activities/{c.some_id()}')
+
+
+def index_page(c):
+    c.call('GET /', 'GET', '/')
+
+
+def create_activity(c):
+    body = c.json(c.call('POST /api/activities', 'POST', '/api/activities', json=c.new_activity()))
+    if body and 'id' in body:
+        c.mine.append(body['id'])
+
+
+def bulk_import(c):
+    rows = [dict(c.new_activity(), status=c.rng.choice(['todo', 'done'])) for _ in range(20)]
+    c.call('POST /api/activities/bulk', 'POST', '/api/activities/bulk', json=rows)
+
+
+def move_cards(c):
+    moves = [{'id': c.some_id(), 'status': c.rng.choice(['todo', 'in-progress', 'done'])}
+             for _ in range(c.rng.randint(1, 3))]
+    c.call('POST /api/activities/move', 'POST', '/api/activities/move', json={'moves': moves})
+
+
+def update_activity(c):
+    c.call('PUT /api/activities/<id>', 'PUT', f'/api/activities/{c.some_id()}',
+           json={'title': f'Edited {c.rng.randrange(1000)}', 'status': c.rng.choice(['todo', 'in-progress'])})
+
+
+def patch_activity(c):
+    c.call('PATCH /api/activities/<id>', 'PATCH', f'/api/activities/{c.some_id()}',
+           json={'outcome_notes': f'Note {c.rng.randrange(1000)}'})
+
+
+def delete_activity(c):
+    if c.mine:
+        c.call('DELETE /api/activities/<id>', 'DELETE', f'/api/activities/{c.mine.pop()}')
+
+
+def timer(c):
+    activity_id = c.some_id()
+    c.call('POST /api/activities/<id>/timer/start', 'POST', f'/api/activities/{activity_id}/timer/start')
+    c.call('POST /api/activities/<id>/timer/stop', 'POST', f'/api/activities/{activity_id}/timer/stop')
+
+
+def iteration(c):
+    c.call('POST /api/activities/<id>/iteration', 'POST', f'/api/activities/{c.some_id()}/iteration')
+
+
+def dashboard(c):
+    c.call('GET /api/dashboard', 'GET', '/api/dashboard')
+
+
+def search(c):
+    c.call('GET /api/search', 'GET', '/api/search', params={'q': c.rng.choice(SEARCH_WORDS)})
+
+
+def timeseries(c):
+    c.call('GET /api/analytics/timeseries', 'GET', '/api/analytics/timeseries',
+           params={'granularity': c.rng.choice(['day', 'hour']),
+                   'group_by': c.rng.choice(['all', 'ai_tool', 'project'])})
+
+
+def export_csv(c):
+    c.call('GET /api/export/csv', 'GET', '/api/export/csv', stream=True, headers={'Accept-Encoding': 'gzip'})
+
+
+def export_ndjson(c):
+    c.call('GET /api/export/ndjson', 'GET', '/api/export/ndjson', stream=True)
+
+
+def export_report(c):
+    c.call('GET /api/export/report', 'GET', '/api/export/report', stream=True)
+
+
+def calendar(c):
+    start = date.today() - timedelta(days=c.rng.choice([7, 30, 90]))
+    c.call('GET /api/calendar/ics', 'GET', '/api/calendar/ics', params={'from': start.isoformat()})
+
+
+def notifications(c):
+    c.call('GET /api/notifications/status', 'GET', '/api/notifications/status')
+
+
+def notification_toggle(c):
+    # Twice, so notifications end up as they were
+    c.call('POST /api/notifications/toggle', 'POST', '/api/notifications/toggle')
+    c.call('POST /api/notifications/toggle', 'POST', '/api/notifications/toggle')
+
+
+def send_test_notification(c):
+    c.call('POST /api/test-notification', 'POST', '/api/test-notification')
+
+
+def execute(c):
+    c.call('POST /api/activities/<id>/execute', 'POST', f'/api/activities/{c.some_id()}/execute')
+
+
+def complete(c):
+    c.call('POST /api/activities/<id>/complete', 'POST', f'/api/activities/{c.some_id()}/complete',
+           json={'outcome': c.rng.choices(['success', 'partial', 'failed'], [70, 20, 10])[0]})
+
+
+def retry(c):
+    c.call('POST /api/activities/<id>/retry', 'POST', f'/api/activities/{c.some_id()}/retry')
+
+
+def dispatch_jobs(c):
+    body = c.json(c.call('GET /api/dispatch/jobs', 'GET', '/api/dispatch/jobs', params={'limit': 20}))
+    jobs = body or []
+    if jobs:
+        c.call('GET /api/dispatch/jobs/<id>', 'GET', f"/api/dispatch/jobs/{c.rng.choice(jobs)['id']}")
+
+
+def sessions(c):
+    c.call('GET /api/sessions/status', 'GET', '/api/sessions/status')
+    c.call('GET /api/activities/<id>/session', 'GET', f'/api/activities/{c.some_id()}/session')
+
+
+def health(c):
+    c.call('GET /api/integration/health', 'GET', '/api/integration/health')
+    c.call('GET /api/integration/health/status', 'GET', '/api/integration/health/status')
+
+
+def status_pages(c):
+    c.call('GET /api/cache/status', 'GET', '/api/cache/status')
+    c.call('GET /api/events/status', 'GET', '/api/events/status')
+    c.call('GET /api/capabilities', 'GET', '/api/capabilities')
+
+
+def event_stream(c):
+    c.call('GET /api/events (first line)', 'GET', '/api/events', first_line=True)
+
+
+SCENARIOS = [
+    (20, board_page), (6, board_filtered), (4, board_changes), (10, get_activity), (2, index_page),
+    (6, create_activity), (1, bulk_import), (6, move_cards), (5, update_activity), (4, patch_activity),
+    (3, delete_activity), (4, timer), (3, iteration), (6, dashboard), (6, search), (3, timeseries),
+    (1, export_csv), (1, export_ndjson), (1, export_report), (2, calendar), (2, notifications),
+    (0.2, notification_toggle), (0.5, send_test_notification), (2, execute), (2, complete), (1, retry),
+    (2, dispatch_jobs), (2, sessions), (1, health), (2, status_pages), (1, event_stream),
+]
+
+
+def drive(base_url, ids, threads, duration, seed, timeout):
+    """Run the scenario mix from `threads` threads for `duration` seconds; returns (total, routes)"""
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+    weights = [weight for weight, _ in SCENARIOS]
+
+    def worker(n):
+        client = Client(base_url, recorder, random.Random(seed * 1000 + n), ids, timeout)
+        while time.monotonic() < deadline:
+            client.rng.choices(SCENARIOS, weights)[0][1](client)
+        client.session.close()
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return recorder.report(time.perf_counter() - started)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args[1]} exited with status {process.returncode}")
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not answer within {timeout}s")
+
+
+def start_tracker(args, workdir):
+    """Seeded database, fake Clawdbot and the tracker itself; returns (base url, processes, seed rate)"""
+    database = os.path.join(workdir, 'load.db')
+    conn = connect(database)
+    migrations.migrate(conn)
+    rate = generate(conn, args.activities, args.seed)
+    conn.close()
+
+    bin_dir = os.path.join(workdir, 'bin')
+    write_fake_cli(bin_dir, args.clawdbot_latency, args.clawdbot_failure_rate, args.clawdbot_jitter)
+    env = dict(os.environ, PATH=bin_dir + os.pathsep + os.environ.get('PATH', ''),
+               AI_TRACKER_DATABASE=database, AI_TRACKER_PORT=str(free_port()),
+               AI_TRACKER_SPOOL_DIR=os.path.join(workdir, 'spool'), PYTHONUNBUFFERED='1')
+    processes = []
+    if args.transport == 'http':
+        stub_port = free_port()
+        processes.append(subprocess.Popen(
+            [sys.executable, os.path.join(HERE, 'stub_clawdbot.py'), '--port', str(stub_port),
+             '--latency', str(args.clawdbot_latency), '--jitter', str(args.clawdbot_jitter),
+             '--failure-rate', str(args.clawdbot_failure_rate), '--seed', str(args.seed)],
+            stdout=subprocess.DEVNULL, start_new_session=True))
+        env['AI_TRACKER_CLAWDBOT_URL'] = f'http://127.0.0.1:{stub_port}'
+    env['AI_TRACKER_CLAWDBOT_TRANSPORT'] = args.transport
+
+    if args.server == 'production':
+        command = [os.path.join(ROOT, 'serve.py'), '--bind', f"127.0.0.1:{env['AI_TRACKER_PORT']}",
+                   '--workers', str(args.workers), '--threads', str(args.server_threads)]
+        env['AI_TRACKER_DRAIN_SECONDS'] = '5'
+    else:
+        command = [os.path.join(ROOT, 'app.py')]
+    log = open(os.path.join(workdir, 'tracker.log'), 'w')
+    processes.append(subprocess.Popen([sys.executable] + command, cwd=ROOT, env=env,
+                                      stdout=log, stderr=subprocess.STDOUT, start_new_session=True))
+    base_url = f"http://127.0.0.1:{env['AI_TRACKER_PORT']}"
+    wait_for(base_url + '/api/capabilities', processes[-1])
+    return base_url, processes, rate
+
+
+def stop(processes):
+    for process in processes:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)  # the dev server's reloader runs the app in a child
+        except ProcessLookupError:
+            continue
+        try:
+            process.wait(15)  # serve.py drains its workers first
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def known_ids(base_url):
+    """Activity ids from the first board pages of an already running tracker"""
+    ids, cursor = [], None
+    while len(ids) < 5000:
+        body = requests.get(base_url + '/api/activities', timeout=30,
+                            params={'limit': 1000, 'fields': 'id', **({'cursor': cursor} if cursor else {})}).json()
+        ids += [row['id'] for row in body['activities']]
+        cursor = body.get('next_cursor')
+        if not cursor:
+            break
+    return ids
+
+
+def print_report(total, routes, baseline=None):
+    base_routes = (baseline or {}).get('routes', {})
+    header = f"{'route':<42} {'reqs':>6} {'rps':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'err':>4}"
+    print(header + (f" {'p50 Δ':>8} {'p99 Δ':>8}" if baseline else ''))
+    for route, r in list(routes.items()) + [('TOTAL', total)]:
+        line = (f"{route:<42} {r['requests']:>6} {r['throughput_rps']:>7} {r['p50_ms']:>8} {r['p90_ms']:>8} "
+                f"{r['p99_ms']:>8} {r['errors']:>4}")
+        before = (baseline or {}).get('total') if route == 'TOTAL' else base_routes.get(route)
+        if before:
+            line += ''.join(f" {change(before.get(key), r.get(key)):>8}" for key in ('p50_ms', 'p99_ms'))
+        print(line)
+
+
+def change(before, after):
+    if not before or after is None:
+        return '-'
+    return f"{(after - before) / before * 100:+.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='load an already running tracker instead of starting one')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of load')
+    parser.add_argument('--activities', type=int, default=10000, help='rows seeded into the scratch database')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--transport', choices=['http', 'cli'], default='http', help='fake Clawdbot to run against')
+    parser.add_argument('--server', choices=['dev', 'production'], default='dev',
+                        help='app.py (Flask development server) or serve.py (gunicorn)')
+    parser.add_argument('--workers', type=int, default=4, help='serve.py worker processes')
+    parser.add_argument('--server-threads', type=int, default=16, help='serve.py request threads per worker')
+    parser.add_argument('--clawdbot-latency', type=float, default=0.05, help='seconds per fake Clawdbot call')
+    parser.add_argument('--clawdbot-jitter', type=float, default=0.05)
+    parser.add_argument('--clawdbot-failure-rate', type=float, default=0.05)
+    parser.add_argument('--timeout', type=float, default=30.0, help='per request')
+    parser.add_argument('--output', default='load_results.json')
+    parser.add_argument('--compare', help='earlier --output file to compare against')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database and tracker log')
+    args = parser.parse_args()
+
+    processes, workdir, seed_rate = [], None, None
+    try:
+        if args.url:
+            base_url = args.url.rstrip('/')
+            ids = known_ids(base_url)
+        else:
+            workdir = tempfile.mkdtemp(prefix='ai-tracker-load-')
+            base_url, processes, seed_rate = start_tracker(args, workdir)
+            ids = list(range(1, args.activities + 1))
+        if not ids:
+            print("❌ No activities to load; seed some first (benchmarks/seed_data.py)")
+            return 1
+        print(f"🚦 {args.threads} threads for {args.duration:.0f}s against {base_url} ({len(ids)} activities)")
+        started_at = datetime.now().isoformat(timespec='seconds')
+        total, routes = drive(base_url, ids, args.threads, args.duration, args.seed, args.timeout)
+    finally:
+        stop(processes)
+        if workdir and not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+            workdir = None
+
+    result = {
+        'meta': {
+            'commit': git_commit(), 'started_at': started_at, 'url': args.url, 'threads': args.threads,
+            'duration_s': args.duration, 'activities': args.activities if not args.url else len(ids),
+            'seed': args.seed, 'transport': args.transport, 'clawdbot_latency': args.clawdbot_latency,
+            'server': None if args.url else args.server,
+            'server_workers': args.workers if args.server == 'production' and not args.url else None,
+            'server_threads': args.server_threads if args.server == 'production' and not args.url else None,
+            'clawdbot_jitter': args.clawdbot_jitter, 'clawdbot_failure_rate': args.clawdbot_failure_rate,
+            'seed_rows_per_s': round(seed_rate) if seed_rate else None,
+            'python': platform.python_version(), 'cpus': os.cpu_count(), 'workdir': workdir,
+        },
+        'total': total,
+        'routes': routes,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(total, routes, baseline)
+    print(f"📄 Results written to {args.output}")
+    return 1 if total['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
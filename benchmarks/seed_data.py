@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Synthetic data generator
+Fills a tracker database with activities that look like real use: a few
+tools and projects do most of the work, outcomes depend on the tool, time
+spent is long-tailed, and work happens on weekdays in office hours. Done
+activities get timer sessions, so the time-series charts have data too.
+The same --seed and --until always produce the same rows.
+
+    python benchmarks/seed_data.py --activities 10000                 # into ai_activities.db
+    python benchmarks/seed_data.py --activities 100000 --database /tmp/load.db --days 365
+"""
+
+import argparse
+import itertools
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import migrations
+import timeseries
+from db import PRAGMAS
+
+POSITION_GAP = 1024  # as in app.py
+
+# (tool, share of activities, P(success), P(partial)); the rest fail
+TOOLS = [
+    ('Claude', 34, 0.74, 0.16),
+    ('ChatGPT', 24, 0.66, 0.20),
+    ('Copilot', 15, 0.62, 0.22),
+    ('Cursor', 12, 0.70, 0.18),
+    ('Gemini', 8, 0.60, 0.22),
+    ('Codex', 4, 0.58, 0.24),
+    (None, 3, 0.65, 0.20),
+]
+TOOL_WEIGHTS = list(itertools.accumulate(share for _, share, _, _ in TOOLS))
+PROJECTS = ['The Decode', 'Website', 'Mobile App', 'Data Pipeline', 'Research', 'Docs', 'Infra',
+            'Billing', 'Onboarding', 'Analytics', 'Support Bot', 'Design System']
+FAILURE_REASONS = [('hallucination', 30), ('context limit', 25), ('wrong approach', 20),
+                   ('timeout', 15), ('tool error', 10)]
+VERBS = ['Build', 'Fix', 'Refactor', 'Write', 'Review', 'Debug', 'Document', 'Migrate', 'Optimize', 'Test']
+NOUNS = ['login flow', 'API client', 'search index', 'dashboard charts', 'CSV export', 'payment webhook',
+         'onboarding emails', 'unit tests', 'deploy script', 'database schema', 'release notes',
+         'rate limiter', 'chat interface', 'calendar sync', 'error handling', 'caching layer']
+DETAILS = ['using the existing helpers', 'without breaking the public API', 'for the next release',
+           'after the customer report', 'behind a feature flag', 'with tests', 'and update the docs',
+           'to cut latency', 'for mobile users', 'as discussed in standup']
+
+
+def connect(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    for name, value in PRAGMAS.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def working_time(rng, now, days):
+    """A moment in the last `days`, mostly on weekdays between 9 and 19"""
+    while True:
+        moment = now - timedelta(seconds=rng.randint(0, days * 86400))
+        if moment.weekday() >= 5 and rng.random() < 0.8:
+            continue
+        if not 9 <= moment.hour < 19 and rng.random() < 0.85:
+            continue
+        return moment.replace(microsecond=0)
+
+
+def make_activity(rng, now, days, project_weights):
+    """One activity row plus the timer session it was tracked in (None when not started)"""
+    tool, _, p_success, p_partial = rng.choices(TOOLS, cum_weights=TOOL_WEIGHTS)[0]
+    project = rng.choices(PROJECTS, cum_weights=project_weights)[0] if rng.random() < 0.9 else None
+    created = working_time(rng, now, days)
+    age_days = (now - created).total_seconds() / 86400
+    # Old work is almost all done; the board's open columns hold recent activities
+    if age_days > 14 or rng.random() < 0.55:
+        status = 'done'
+    else:
+        status = 'in-progress' if rng.random() < 0.35 else 'todo'
+
+    outcome = failure_reason = completed_at = None
+    time_spent = 0
+    iterations = 1
+    session = None
+    if status != 'todo':
+        time_spent = min(8 * 3600, int(rng.lognormvariate(math.log(1200), 0.9)))
+        iterations = 1 + min(9, int(rng.expovariate(1.2)))
+        started = created + timedelta(seconds=rng.randint(0, 3600))
+        session = (started, started + timedelta(seconds=time_spent))
+    if status == 'done':
+        roll = rng.random()
+        outcome = 'success' if roll < p_success else 'partial' if roll < p_success + p_partial else 'failed'
+        if outcome == 'failed':
+            failure_reason = rng.choices([r for r, _ in FAILURE_REASONS], [w for _, w in FAILURE_REASONS])[0]
+        completed_at = session[1] + timedelta(seconds=rng.randint(0, 600))
+
+    title = f"{rng.choice(VERBS)} {rng.choice(NOUNS)}"
+    description = f"{title} {rng.choice(DETAILS)}." if rng.random() < 0.85 else None
+    row = {
+        'title': title, 'description': description, 'ai_tool': tool, 'project': project,
+        'status': status, 'time_spent': time_spent, 'outcome': outcome,
+        'outcome_notes': f"Finished {outcome}" if outcome else None, 'failure_reason': failure_reason,
+        'iteration_count': iterations, 'created_at': created.strftime('%Y-%m-%d %H:%M:%S'),
+        'updated_at': (completed_at or created).strftime('%Y-%m-%d %H:%M:%S'),
+        'completed_at': completed_at.isoformat() if completed_at else None,
+    }
+    return row, session
+
+
+INSERT_ACTIVITY = '''
+    INSERT INTO activities (title, description, ai_tool, project, status, position, time_spent,
+                            outcome, outcome_notes, failure_reason, iteration_count,
+                            created_at, updated_at, completed_at)
+    VALUES (:title, :description, :ai_tool, :project, :status, :position, :time_spent,
+            :outcome, :outcome_notes, :failure_reason, :iteration_count,
+            :created_at, :updated_at, :completed_at)
+'''
+
+
+def generate(conn, activities, seed=42, days=180, until=None, batch_size=5000):
+    """Insert `activities` rows (and their timer sessions) through the normal triggers; returns rows/second.
+
+    Rows are spread over the `days` before `until` (default: midnight today).
+    """
+    rng = random.Random(seed)
+    now = until or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    project_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(PROJECTS) + 1)))
+    positions = {
+        status: (conn.execute('SELECT MAX(position) FROM activities WHERE status = ?', (status,)).fetchone()[0] or 0)
+        for status in ('todo', 'in-progress', 'done')
+    }
+    started = time.perf_counter()
+    for first in range(0, activities, batch_size):
+        conn.execute('BEGIN')
+        for n in range(first, min(activities, first + batch_size)):
+            row, session = make_activity(rng, now, days, project_weights)
+            positions[row['status']] += POSITION_GAP
+            row['position'] = positions[row['status']]
+            activity_id = conn.execute(INSERT_ACTIVITY, row).lastrowid
+            if session:
+                timeseries.record_session(conn, {'id': activity_id, 'ai_tool': row['ai_tool'], 'project': row['project']},
+                                          session[0].isoformat(), session[1])
+        conn.execute('COMMIT')
+    return activities / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default=os.environ.get('AI_TRACKER_DATABASE', 'ai_activities.db'))
+    parser.add_argument('--activities', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=180, help='spread created_at over this many days')
+    parser.add_argument('--until', type=datetime.fromisoformat, help='newest timestamp, YYYY-MM-DD (default: today)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    conn = connect(args.database)
+    migrations.migrate(conn)
+    rate = generate(conn, args.activities, args.seed, args.days, args.until)
+    total = conn.execute('SELECT COUNT(*) FROM activities').fetchone()[0]
+    conn.close()
+    print(f"✅ Added {args.activities} activities to {args.database} ({rate:.0f} rows/s, {total} in total)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - SQLite concurrency stress test
+Hammers the write endpoints from many threads against a scratch database and
+fails if any request hits "database is locked" or another server error.
+
+    python benchmarks/stress_db.py --threads 16 --ops 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--ops', type=int, default=200, help='operations per thread')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ai-tracker-stress-')
+    os.environ['AI_TRACKER_DATABASE'] = os.path.join(workdir, 'stress.db')
+    os.environ['AI_TRACKER_NOTIFICATIONS'] = 'false'
+    os.environ['AI_TRACKER_AUTO_EXECUTE'] = 'false'
+    sys.path.insert(0, ROOT)
+    import app as tracker
+
+    tracker.init_db()
+    errors = []
+    ops_done = [0]
+    lock = threading.Lock()
+
+    def writer(n):
+        rng = random.Random(args.seed + n)
+        client = tracker.app.test_client()
+        mine = []
+        for i in range(args.ops):
+            choice = rng.random()
+            if not mine or choice < 0.3:
+                r = client.post('/api/activities', json={'title': f'stress {n}-{i}', 'ai_tool': 'Claude'})
+                if r.status_code == 201:
+                    mine.append(r.get_json()['id'])
+            elif choice < 0.55:
+                r = client.put(f'/api/activities/{rng.choice(mine)}',
+                               json={'title': f'edit {n}-{i}', 'status': rng.choice(['todo', 'in-progress', 'done'])})
+            elif choice < 0.7:
+                r = client.post(f'/api/activities/{rng.choice(mine)}/timer/start')
+            elif choice < 0.85:
+                r = client.post(f'/api/activities/{rng.choice(mine)}/timer/stop')
+            else:
+                r = client.post(f'/api/activities/{rng.choice(mine)}/iteration')
+            if r.status_code >= 500:
+                with lock:
+                    errors.append(r.get_data(as_text=True)[:200])
+        with lock:
+            ops_done[0] += args.ops
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    locked = [e for e in errors if 'locked' in e]
+    print(f"ops: {ops_done[0]}  threads: {args.threads}  elapsed: {elapsed:.2f}s  "
+          f"ops/s: {ops_done[0] / elapsed:.0f}")
+    print(f"server errors: {len(errors)}  lock errors: {len(locked)}")
+    print(f"pool: {tracker.db_pool.stats()}")
+    for e in errors[:5]:
+        print(f"  {e}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
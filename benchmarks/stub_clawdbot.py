@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Clawdbot stub
+A local stand-in for Clawdbot, for trying the tracker and benchmarking its
+transports without a real gateway. It serves POST /tools/invoke the way the
+HTTP transport calls it (message, sessions_spawn, sessions_list) and can write
+a fake `clawdbot` CLI script that answers the same commands. Both take a
+latency (plus random jitter) per call and fail a given share of calls.
+
+    python benchmarks/stub_clawdbot.py --port 18789       # then run the tracker with
+    AI_TRACKER_CLAWDBOT_URL=http://127.0.0.1:18789 python app.py
+
+    python benchmarks/stub_clawdbot.py --cli-dir /tmp/fakebin --latency 0.2 --failure-rate 0.1
+    PATH=/tmp/fakebin:$PATH python app.py                  # fake CLI instead of the gateway
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import stat
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_CLI = '''#!{python}
+import json, random, sys, time
+args = sys.argv[1:]
+time.sleep({latency} + random.uniform(0, {jitter}))
+if args[:2] in (['message', 'send'], ['sessions', 'spawn'], ['sessions', 'list']) and random.random() < {failure_rate}:
+    sys.exit('Error: stub failure')
+if args[:2] == ['sessions', 'list']:
+    print(json.dumps({{'sessions': []}}) if '--json' in args else 'No sessions')
+elif args[:2] == ['sessions', 'spawn']:
+    print(json.dumps({{'childSessionKey': 'agent:main:subagent:cli', 'status': 'accepted'}}))
+elif args[:1] == ['--version']:
+    print('clawdbot stub')
+'''
+
+
+class StubState:
+    """Takes `latency` plus up to `jitter` seconds per call and fails `failure_rate` of them"""
+
+    def __init__(self, latency=0.0, failure_rate=0.0, jitter=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.jitter = jitter
+        self.sessions = []
+        self.counters = {'message': 0, 'sessions_spawn': 0, 'sessions_list': 0, 'errors': 0, 'failures': 0}
+        self._rng = random.Random(seed)
+        self._keys = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def invoke(self, tool, args):
+        """-> (HTTP status, response body)"""
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+            fail = self.failure_rate and self._rng.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            if tool not in self.counters:
+                self.counters['errors'] += 1
+                return 404, {'ok': False, 'error': {'type': 'not_found', 'message': f'Tool not available: {tool}'}}
+            if fail:
+                self.counters['failures'] += 1
+                return 502, {'ok': False, 'error': {'type': 'tool_error', 'message': 'Stub failure'}}
+            self.counters[tool] += 1
+            if tool == 'message':
+                return 200, {'ok': True, 'result': {'messageId': self.counters['message'], 'channel': args.get('channel')}}
+            if tool == 'sessions_spawn':
+                key = f'agent:main:subagent:{next(self._keys)}'
+                self.sessions.append({'key': key, 'label': args.get('label'), 'status': 'running',
+                                      'createdAt': int(time.time() * 1000)})
+                return 200, {'ok': True, 'result': {'status': 'accepted', 'childSessionKey': key}}
+            return 200, {'ok': True, 'result': {'sessions': self.sessions[-int(args.get('limit', 50)):][::-1]}}
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real gateway
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if self.path != '/tools/invoke':
+                status, reply = 404, {'ok': False, 'error': {'message': 'Not found'}}
+            else:
+                request = json.loads(body or b'{}')
+                status, reply = state.invoke(request.get('tool'), request.get('args') or {})
+            data = json.dumps(reply).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(port=0, latency=0.0, failure_rate=0.0, jitter=0.0, seed=None):
+    """Serve the stub on a daemon thread; returns (server, state, base url)"""
+    state = StubState(latency, failure_rate, jitter, seed)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='clawdbot-stub', daemon=True).start()
+    return server, state, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def write_fake_cli(directory, latency=0.0, failure_rate=0.0, jitter=0.0):
+    """Write an executable `clawdbot` script into directory; put it first on PATH to use it"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, 'clawdbot')
+    with open(path, 'w') as f:
+        f.write(FAKE_CLI.format(python=sys.executable, latency=latency, failure_rate=failure_rate, jitter=jitter))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=18789)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every call')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many more seconds, at random')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='share of calls that fail')
+    parser.add_argument('--seed', type=int, help='makes the gateway stub\'s failures repeatable')
+    parser.add_argument('--cli-dir', help='write the fake CLI here and exit')
+    args = parser.parse_args()
+
+    if args.cli_dir:
+        path = write_fake_cli(args.cli_dir, args.latency, args.failure_rate, args.jitter)
+        print(f"🤖 Fake clawdbot CLI written to {path}")
+        return 0
+
+    server, state, url = start_server(args.port, args.latency, args.failure_rate, args.jitter, args.seed)
+    print(f"🤖 Clawdbot stub listening on {url}/tools/invoke")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        print(f"\n👋 Stub stopped: {state.counters}")
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
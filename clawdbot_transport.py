@@ -0,0 +1,267 @@
+"""
+AI Activity Tracker - Clawdbot Transport
+Every call the tracker makes to Clawdbot (messages, session spawns, session
+listings, health checks) goes through one transport object. CliTransport
+runs the `clawdbot` CLI once per call. HttpTransport keeps a pooled keep-alive
+session to the Clawdbot gateway's tools endpoint (POST /tools/invoke), so a
+message costs one HTTP request instead of a fork/exec and a CLI start-up.
+When the gateway can't be reached, HttpTransport falls back to the CLI for a
+while before trying the gateway again. A transport's `observer`, if set, is
+told the duration and outcome of every call.
+"""
+
+import json
+import subprocess
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from health import CHECKS, run_checks
+
+TRANSPORTS = ('auto', 'cli', 'http')
+
+
+class TransportTimeout(TimeoutError):
+    """Clawdbot didn't answer within the call's timeout"""
+
+
+class Result:
+    """Outcome of one call: `ok`, the decoded `data` (or raw output) and an `error` message"""
+
+    def __init__(self, ok, data=None, error=None):
+        self.ok = ok
+        self.data = data
+        self.error = error
+
+    def __repr__(self):
+        return f'Result(ok={self.ok}, error={self.error!r})'
+
+
+def _observe(transport, operation, started, outcome):
+    """Report one call to `transport.observer(transport name, operation, seconds, outcome)`"""
+    if transport.observer is None:
+        return
+    try:
+        transport.observer(transport.name, operation, time.perf_counter() - started, outcome)
+    except Exception as e:
+        print(f"❌ Transport observer error: {e}")
+
+
+def _operation(args):
+    """message, sessions_spawn, sessions_list, ... from CLI arguments (the gateway's tool names)"""
+    words = [arg for arg in args[:2] if not arg.startswith('-')]
+    if words[:1] == ['message']:
+        return 'message'
+    return '_'.join(words) or 'version'
+
+
+def _decoded(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class CliTransport:
+    """One `clawdbot` process per call"""
+
+    name = 'cli'
+
+    def __init__(self, command='clawdbot', observer=None):
+        self.command = command
+        self.observer = observer
+        self.json_listing = None  # whether `sessions list` accepts --json; None until known
+        self.counters = {'calls': 0, 'failures': 0, 'timeouts': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+
+    def run(self, args, timeout):
+        self._count('calls')
+        started = time.perf_counter()
+        try:
+            result = subprocess.run([self.command] + args, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._count('timeouts')
+            _observe(self, _operation(args), started, 'timeout')
+            raise TransportTimeout(f"clawdbot {' '.join(args[:2])} timed out after {timeout}s")
+        except OSError as e:  # clawdbot isn't installed
+            self._count('failures')
+            _observe(self, _operation(args), started, 'failed')
+            return Result(False, error=str(e))
+        if result.returncode != 0:
+            self._count('failures')
+            _observe(self, _operation(args), started, 'failed')
+            return Result(False, result.stdout, result.stderr.strip() or f'exit status {result.returncode}')
+        _observe(self, _operation(args), started, 'ok')
+        return Result(True, _decoded(result.stdout))
+
+    def send_message(self, message, channel=None, timeout=10):
+        args = ['message', 'send'] + (['--channel', channel] if channel else []) + ['--message', message]
+        return self.run(args, timeout)
+
+    def spawn_session(self, task, label, cleanup='keep', timeout=30):
+        return self.run(['sessions', 'spawn', '--task', task, '--label', label, '--cleanup', cleanup], timeout)
+
+    def list_sessions(self, limit=50, timeout=10):
+        """Listing as decoded JSON, or as plain text once the CLI has refused --json"""
+        args = ['sessions', 'list', '--limit', str(limit)]
+        if self.json_listing is not False:
+            result = self.run(args + ['--json'], timeout)
+            if result.ok:
+                self.json_listing = True
+            if result.ok or self.json_listing:
+                return result
+        result = self.run(args, timeout)
+        if result.ok and self.json_listing is None:
+            self.json_listing = False
+        return result
+
+    def check(self, timeout=5):
+        started = time.perf_counter()
+        checks = run_checks(timeout, self.command)
+        _observe(self, 'check', started, 'ok' if all(checks.get(key) for key, _ in CHECKS) else 'failed')
+        return checks
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, transport=self.name)
+
+    def close(self):
+        pass
+
+
+class HttpTransport:
+    """Pooled keep-alive requests to the gateway, with the CLI as a fallback.
+
+    A connection failure switches calls to `fallback` for `retry_after`
+    seconds; errors the gateway reports are returned as they are.
+    """
+
+    name = 'http'
+
+    def __init__(self, url, token=None, pool_size=4, fallback=None, retry_after=30.0, observer=None):
+        self.url = url.rstrip('/') + '/tools/invoke'
+        self.observer = observer
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self.session = requests.Session()
+        self.session.mount(self.url.split('://')[0] + '://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        if token:
+            self.session.headers['Authorization'] = f'Bearer {token}'
+        self.counters = {'calls': 0, 'failures': 0, 'timeouts': 0, 'fallbacks': 0}
+        self._down_until = 0
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+
+    def _gateway_down(self):
+        if self.fallback is None:
+            return False
+        with self._lock:
+            return time.monotonic() < self._down_until
+
+    def _mark_down(self):
+        with self._lock:
+            self._down_until = time.monotonic() + self.retry_after
+
+    def invoke(self, tool, args, timeout):
+        """Call one gateway tool; returns None when the gateway can't be reached"""
+        self._count('calls')
+        started = time.perf_counter()
+        try:
+            response = self.session.post(self.url, json={'tool': tool, 'args': args}, timeout=timeout)
+        except (requests.ConnectTimeout, requests.ConnectionError):
+            # ConnectTimeout is also a Timeout: the gateway never got the call, so fall back
+            self._count('failures')
+            _observe(self, tool, started, 'unreachable')
+            self._mark_down()
+            return None
+        except requests.Timeout:
+            self._count('timeouts')
+            _observe(self, tool, started, 'timeout')
+            raise TransportTimeout(f'{tool} timed out after {timeout}s')
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if response.status_code >= 400 or not body.get('ok', False):
+            self._count('failures')
+            error = body.get('error')
+            if isinstance(error, dict):
+                error = error.get('message')
+            _observe(self, tool, started, 'failed')
+            return Result(False, body, error or f'HTTP {response.status_code}')
+        _observe(self, tool, started, 'ok')
+        return Result(True, body.get('result'))
+
+    def _call(self, tool, args, timeout, fallback):
+        if not self._gateway_down():
+            result = self.invoke(tool, args, timeout)
+            if result is not None:
+                return result
+        if self.fallback is None:
+            return Result(False, error=f'Clawdbot gateway unreachable at {self.url}')
+        self._count('fallbacks')
+        return fallback()
+
+    def send_message(self, message, channel=None, timeout=10):
+        args = {'action': 'send', 'message': message}
+        if channel:
+            args['channel'] = channel
+        return self._call('message', args, timeout,
+                          lambda: self.fallback.send_message(message, channel, timeout))
+
+    def spawn_session(self, task, label, cleanup='keep', timeout=30):
+        return self._call('sessions_spawn', {'task': task, 'label': label, 'cleanup': cleanup}, timeout,
+                          lambda: self.fallback.spawn_session(task, label, cleanup, timeout))
+
+    def list_sessions(self, limit=50, timeout=10):
+        return self._call('sessions_list', {'limit': limit}, timeout,
+                          lambda: self.fallback.list_sessions(limit, timeout))
+
+    def check(self, timeout=5):
+        """Health as CHECKS keys: a reachable gateway that lists sessions passes all three"""
+        if self._gateway_down():
+            return self.fallback.check(timeout)
+        try:
+            result = self.invoke('sessions_list', {'limit': 1}, timeout)
+        except TransportTimeout as e:
+            return dict({key: False for key, _ in CHECKS}, error=str(e))
+        if result is None:
+            if self.fallback is not None:
+                return self.fallback.check(timeout)
+            return dict({key: False for key, _ in CHECKS}, error=f'Clawdbot gateway unreachable at {self.url}')
+        checks = {key: result.ok for key, _ in CHECKS}
+        if not result.ok:
+            checks['error'] = result.error
+        return checks
+
+    def stats(self):
+        gateway_down = self._gateway_down()
+        with self._lock:
+            stats = dict(self.counters, transport=self.name, gateway_down=gateway_down)
+        if self.fallback is not None:
+            stats['fallback'] = self.fallback.stats()
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+def make_transport(kind='auto', url=None, token=None, pool_size=4, observer=None):
+    """'cli', 'http' (gateway with CLI fallback), or 'auto': http when a gateway url is set"""
+    if kind not in TRANSPORTS:
+        raise ValueError(f"Unknown Clawdbot transport {kind!r}; expected one of {', '.join(TRANSPORTS)}")
+    if kind == 'cli' or (kind == 'auto' and not url):
+        return CliTransport(observer=observer)
+    if not url:
+        raise ValueError('The http Clawdbot transport needs a gateway url')
+    return HttpTransport(url, token=token, pool_size=pool_size, fallback=CliTransport(observer=observer),
+                         observer=observer)
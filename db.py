@@ -0,0 +1,254 @@
+"""
+AI Activity Tracker - Database Connections
+Pool of long-lived SQLite connections in WAL mode with tuned pragmas, shared
+by request handlers and background workers. With an observer, connections
+time every statement and report it with its row count.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+PRAGMAS = {
+    'journal_mode': 'WAL',          # readers never block the writer
+    'synchronous': 'NORMAL',        # safe with WAL, avoids an fsync per commit
+    'cache_size': -16000,           # 16 MB page cache per connection
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,           # ms to wait for the write lock
+    'temp_store': 'MEMORY',
+}
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the acquire timeout"""
+
+
+_perf_counter = time.perf_counter
+_cursor_next = sqlite3.Cursor.__next__
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Reports each statement to `connection.observer(sql, params, seconds, rows)`.
+
+    A statement's time covers its execute and every fetch. It is reported
+    once its rows run out, the cursor runs the next statement, or the
+    cursor is closed or dropped; `rows` counts rows fetched, or rows
+    changed for statements that return none.
+    """
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._sql = None
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def _run(self, method, sql, parameters):
+        self._finish()
+        started = time.perf_counter()
+        method(sql, parameters)
+        self._sql, self._params, self._rows = sql, parameters, 0
+        self._seconds = time.perf_counter() - started
+        if self.description is None:  # nothing to fetch
+            self._rows = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        if self._sql is not None:
+            self._seconds += time.perf_counter() - started
+        return result
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._sql is not None:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(super().fetchmany, size)
+        if self._sql is not None:
+            self._rows += len(rows)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._sql is not None:
+            self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        # Per row, so inlined
+        started = _perf_counter()
+        try:
+            row = _cursor_next(self)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._sql is not None:
+            self._seconds += _perf_counter() - started
+            self._rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+    def _finish(self):
+        sql, self._sql = getattr(self, '_sql', None), None
+        if sql is None or self.connection.observer is None:
+            return
+        try:
+            self.connection.observer(sql, self._params, self._seconds, self._rows)
+        except Exception as e:
+            print(f"❌ SQL observer error: {e}")
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors are TimedCursors"""
+
+    observer = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # The built-in shortcuts create plain cursors, whatever cursor() returns
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        self._timed('COMMIT', super().commit)
+
+    def rollback(self):
+        self._timed('ROLLBACK', super().rollback)
+
+    def _timed(self, sql, method):
+        if not self.in_transaction:
+            return method()
+        started = time.perf_counter()
+        method()
+        try:
+            self.observer(sql, (), time.perf_counter() - started, 0)
+        except Exception as e:
+            print(f"❌ SQL observer error: {e}")
+
+
+class ConnectionPool:
+    """Fixed-size pool of sqlite3 connections.
+
+    Connections are created lazily, keep their prepared-statement cache for
+    the life of the process, and open write transactions with BEGIN IMMEDIATE
+    so concurrent writers queue on busy_timeout instead of failing with
+    "database is locked" on a read-to-write upgrade. With an `observer`,
+    statements are timed and reported as described in TimedCursor.
+    """
+
+    def __init__(self, path, size=8, pragmas=None, statement_cache=256, acquire_timeout=10, observer=None):
+        self.path = path
+        self.observer = observer
+        self.size = size
+        self.pragmas = dict(PRAGMAS, **(pragmas or {}))
+        self.statement_cache = statement_cache
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = queue.LifoQueue()  # reuse the warmest connection first
+        self._lock = threading.Lock()
+        self._created = 0
+        self.counters = {'acquired': 0, 'created': 0, 'waits': 0, 'rollbacks': 0}
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.pragmas['busy_timeout'] / 1000,
+            isolation_level='IMMEDIATE',
+            check_same_thread=False,
+            cached_statements=self.statement_cache,
+            factory=TimedConnection if self.observer else sqlite3.Connection,
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        if self.observer:
+            conn.observer = self.observer
+        return conn
+
+    def acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    self.counters['created'] += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                self.counters['waits'] += 1
+                try:
+                    conn = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    raise PoolTimeout(f'No database connection free after {self.acquire_timeout}s')
+        self.counters['acquired'] += 1
+        return conn
+
+    def release(self, conn):
+        """Return a connection, discarding any transaction left open"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+                self.counters['rollbacks'] += 1
+        except sqlite3.Error:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    def stats(self):
+        return dict(self.counters, size=self.size, open=self._created, idle=self._idle.qsize())
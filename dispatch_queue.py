@@ -0,0 +1,223 @@
+"""
+AI Activity Tracker - Dispatch Queue
+Persistent SQLite-backed job queue that hands activities to Clawdbot on a
+bounded pool of background workers, so HTTP handlers never block on a spawn.
+The dispatch_jobs table is created by migrations.py.
+"""
+
+import subprocess
+import threading
+from datetime import datetime
+
+# Job lifecycle: queued -> running -> succeeded | failed | timed_out
+ACTIVE_STATUSES = ('queued', 'running')
+
+ACTIVE_JOB_FOR_ACTIVITY = f'''
+    SELECT * FROM dispatch_jobs
+    WHERE activity_id = ? AND status IN ({",".join("?" * len(ACTIVE_STATUSES))})
+    ORDER BY id DESC LIMIT 1
+'''
+
+CLAIM_NEXT = '''
+    UPDATE dispatch_jobs
+    SET status = 'running', attempts = attempts + 1, started_at = ?,
+        deadline = datetime(?, '+' || (timeout + ?) || ' seconds')
+    WHERE id = (SELECT id FROM dispatch_jobs WHERE status = 'queued' ORDER BY id LIMIT 1)
+    RETURNING *
+'''
+
+EXPIRE_OVERDUE = '''
+    UPDATE dispatch_jobs
+    SET status = 'timed_out', finished_at = ?,
+        error = 'Watchdog: no result before deadline'
+    WHERE status = 'running' AND deadline < datetime('now', 'localtime')
+    RETURNING *
+'''
+
+
+class DispatchQueue:
+    """Drains dispatch_jobs with a fixed number of worker threads.
+
+    `connect` is a context manager factory yielding a sqlite3 connection and
+    `handler(activity, timeout)` performs the actual dispatch, returning True
+    on success and raising TimeoutError (or subprocess.TimeoutExpired) when
+    the spawn hangs.
+    `on_transition(job)`, if given, is called with the job row after every
+    state change (queued, running, and each terminal status).
+    """
+
+    def __init__(self, connect, handler, workers=2, default_timeout=30,
+                 watchdog_interval=5, poll_interval=2, grace=5, on_transition=None):
+        self.connect = connect
+        self.handler = handler
+        self.on_transition = on_transition
+        self.workers = max(1, workers)
+        self.default_timeout = default_timeout
+        self.watchdog_interval = watchdog_interval
+        self.poll_interval = poll_interval
+        self.grace = grace  # extra seconds before the watchdog gives up on a job
+
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    # Public API
+
+    def start(self):
+        """Start workers and the watchdog (safe to call more than once)"""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for n in range(self.workers):
+                t = threading.Thread(target=self._worker_loop, name=f'dispatch-worker-{n}', daemon=True)
+                t.start()
+                self._threads.append(t)
+            t = threading.Thread(target=self._watchdog_loop, name='dispatch-watchdog', daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout=None):
+        """Signal all threads to exit and wait for them"""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for t in threads:
+            t.join(timeout)
+
+    def enqueue(self, activity_id, timeout=None):
+        """Queue a dispatch for an activity and return the job row.
+
+        If the activity already has a queued or running job, that job is
+        returned instead of queueing a duplicate spawn. `timeout` is in whole
+        seconds (validated by the caller); None uses the default.
+        """
+        with self.connect() as conn:
+            # Check and insert in one write transaction, so two workers can't both queue a spawn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                existing = conn.execute(ACTIVE_JOB_FOR_ACTIVITY, (activity_id, *ACTIVE_STATUSES)).fetchone()
+                if existing:
+                    conn.rollback()
+                    return dict(existing)
+
+                cursor = conn.execute(
+                    '''INSERT INTO dispatch_jobs (activity_id, status, timeout, created_at)
+                       VALUES (?, 'queued', ?, ?)''',
+                    (activity_id, self.default_timeout if timeout is None else timeout, datetime.now().isoformat())
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            job = dict(conn.execute('SELECT * FROM dispatch_jobs WHERE id = ?', (cursor.lastrowid,)).fetchone())
+
+        self._transition(job)
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    def get_job(self, job_id):
+        with self.connect() as conn:
+            job = conn.execute('SELECT * FROM dispatch_jobs WHERE id = ?', (job_id,)).fetchone()
+        return dict(job) if job else None
+
+    def list_jobs(self, activity_id=None, status=None, limit=50):
+        query = 'SELECT * FROM dispatch_jobs WHERE 1 = 1'
+        params = []
+        if activity_id is not None:
+            query += ' AND activity_id = ?'
+            params.append(activity_id)
+        if status:
+            query += ' AND status = ?'
+            params.append(status)
+        query += ' ORDER BY id DESC LIMIT ?'
+        params.append(limit)
+        with self.connect() as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    # Workers
+
+    def _claim_next(self):
+        """Atomically move the oldest queued job to running"""
+        now = datetime.now()
+        with self.connect() as conn:
+            job = conn.execute(
+                CLAIM_NEXT,
+                (now.isoformat(), now.strftime('%Y-%m-%d %H:%M:%S'), self.grace)
+            ).fetchone()
+            job = dict(job) if job else None
+            conn.commit()
+        if job:
+            self._transition(job)
+        return job
+
+    def _finish(self, job_id, status, error=None):
+        """Record the outcome unless the watchdog already gave up on the job"""
+        with self.connect() as conn:
+            job = conn.execute(
+                '''UPDATE dispatch_jobs SET status = ?, error = ?, finished_at = ?
+                   WHERE id = ? AND status = 'running'
+                   RETURNING *''',
+                (status, error, datetime.now().isoformat(), job_id)
+            ).fetchone()
+            job = dict(job) if job else None
+            conn.commit()
+        if job:
+            self._transition(job)
+
+    def _transition(self, job):
+        if self.on_transition is None:
+            return
+        try:
+            self.on_transition(job)
+        except Exception as e:
+            print(f"❌ Dispatch transition hook error: {e}")
+
+    def _run(self, job):
+        with self.connect() as conn:
+            activity = conn.execute('SELECT * FROM activities WHERE id = ?', (job['activity_id'],)).fetchone()
+        if not activity:
+            self._finish(job['id'], 'failed', 'Activity not found')
+            return
+
+        try:
+            ok = self.handler(dict(activity), job['timeout'])
+            self._finish(job['id'], 'succeeded' if ok else 'failed', None if ok else 'Dispatch failed')
+        except (subprocess.TimeoutExpired, TimeoutError):
+            self._finish(job['id'], 'timed_out', f"Dispatch exceeded {job['timeout']}s")
+        except Exception as e:
+            self._finish(job['id'], 'failed', str(e))
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self._claim_next()
+            except Exception as e:
+                print(f"❌ Dispatch queue error: {e}")
+                job = None
+
+            if job:
+                self._run(job)
+                continue
+
+            with self._wakeup:
+                self._wakeup.wait(self.poll_interval)
+
+    def _watchdog_loop(self):
+        """Fail jobs whose worker is stuck or died past the job deadline"""
+        while not self._stop.wait(self.watchdog_interval):
+            try:
+                with self.connect() as conn:
+                    expired = [dict(row) for row in conn.execute(EXPIRE_OVERDUE, (datetime.now().isoformat(),)).fetchall()]
+                    conn.commit()
+                if expired:
+                    print(f"⏰ Dispatch watchdog expired {len(expired)} job(s)")
+                for job in expired:
+                    self._transition(job)
+            except Exception as e:
+                print(f"❌ Dispatch watchdog error: {e}")
@@ -0,0 +1,169 @@
+"""
+AI Activity Tracker - Server-Sent Events
+One in-process broadcaster fans events out to every connected /api/events
+client. Each client has its own bounded buffer, so a slow reader loses its
+backlog (and is told to resync) instead of stalling everyone else.
+"""
+
+import itertools
+import json
+import threading
+import time
+from collections import deque
+
+
+class Subscriber:
+    def __init__(self, buffer_size):
+        self.buffer = deque()
+        self.buffer_size = buffer_size
+        self.overflowed = False
+        self.cond = threading.Condition()
+        self.closed = False
+
+
+class EventBroadcaster:
+    """Publish named JSON events to all subscribers.
+
+    Events published with sticky=True are remembered and replayed to new
+    subscribers (e.g. the latest integration health snapshot).
+    """
+
+    def __init__(self, buffer_size=100, keepalive=15):
+        self.buffer_size = buffer_size
+        self.keepalive = keepalive
+        self._subscribers = set()
+        self._sticky = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.counters = {'published': 0, 'delivered': 0, 'overflows': 0, 'connects': 0}
+
+    def subscribe(self):
+        sub = Subscriber(self.buffer_size)
+        with self._lock:
+            self._subscribers.add(sub)
+            self.counters['connects'] += 1
+            sub.buffer.extend(self._sticky.values())
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+        with sub.cond:
+            sub.closed = True
+            sub.cond.notify_all()
+
+    def publish(self, event, data, sticky=False):
+        message = (next(self._ids), event, json.dumps(data, default=str))
+        with self._lock:
+            self.counters['published'] += 1
+            if sticky:
+                self._sticky[event] = message
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            with sub.cond:
+                if sub.overflowed:
+                    continue
+                if len(sub.buffer) >= sub.buffer_size:
+                    # Drop the backlog; the client re-fetches state on "resync"
+                    sub.buffer.clear()
+                    sub.overflowed = True
+                    self.counters['overflows'] += 1
+                else:
+                    sub.buffer.append(message)
+                sub.cond.notify()
+
+    def stream(self):
+        """Generator of SSE-formatted chunks for one new subscriber.
+
+        Subscribes on first iteration so a response that is never sent
+        cannot leak a subscriber.
+        """
+        sub = self.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                with sub.cond:
+                    if not sub.buffer and not sub.overflowed and not sub.closed:
+                        sub.cond.wait(self.keepalive)
+                    if sub.closed:
+                        return
+                    if sub.overflowed:
+                        sub.overflowed = False
+                        batch = [(next(self._ids), 'resync', '{}')]
+                    else:
+                        batch = list(sub.buffer)
+                        sub.buffer.clear()
+
+                if not batch:
+                    yield ": keepalive\n\n"
+                    continue
+                self.counters['delivered'] += len(batch)
+                yield ''.join(f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+                              for event_id, event, data in batch)
+        finally:
+            self.unsubscribe(sub)
+
+    def close_all(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            self.unsubscribe(sub)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, clients=len(self._subscribers))
+
+
+class ChangeWatcher:
+    """Polls a cheap version probe and publishes when it moves.
+
+    `poll(last_version)` returns (version, payload) and is called every
+    `interval` seconds, or immediately after poke(). Because it reads the
+    database rather than hooking individual handlers, writes from any code
+    path or process reach connected clients. A `sticky` event is replayed
+    to clients that connect later, so its first non-None version is
+    published as well.
+    """
+
+    def __init__(self, broadcaster, poll, event='activities', interval=1.0, sticky=False):
+        self.broadcaster = broadcaster
+        self.poll = poll
+        self.event = event
+        self.interval = interval
+        self.sticky = sticky
+        self.version = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='change-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poke(self):
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                version, payload = self.poll(self.version)
+                if version != self.version and (self.version is not None or self.sticky):
+                    self.broadcaster.publish(self.event, payload, sticky=self.sticky)
+                self.version = version
+            except Exception as e:
+                print(f"❌ Change watcher error: {e}")
+                time.sleep(self.interval)
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,142 @@
+"""
+AI Activity Tracker - Integration Health Prober
+One background thread runs the Clawdbot checks on a schedule and keeps the
+latest result as a shared snapshot, so /api/integration/health never spawns
+a process and startup never waits for one. While Clawdbot is down the probe
+backs off exponentially, with full jitter so restarted servers don't probe
+in lockstep.
+"""
+
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+# snapshot key -> command; each check passes when the command exits 0
+CHECKS = [
+    ('clawdbot_available', ['clawdbot', '--version']),
+    ('sessions_spawn_available', ['clawdbot', 'sessions', 'list', '--limit', '1']),
+    ('message_tool_available', ['clawdbot', 'message', '--help']),
+]
+
+
+def run_checks(timeout=5, command='clawdbot'):
+    """Run CHECKS in order with `command` as the clawdbot executable; the rest are skipped once it is missing"""
+    result = {key: False for key, _ in CHECKS}
+    try:
+        for key, cmd in CHECKS:
+            completed = subprocess.run([command] + cmd[1:], capture_output=True, text=True, timeout=timeout)
+            result[key] = completed.returncode == 0
+            if not result['clawdbot_available']:
+                break
+    except Exception as e:  # FileNotFoundError when clawdbot isn't installed, TimeoutExpired
+        result['error'] = str(e)
+    return result
+
+
+def healthy(result):
+    return all(result.get(key) for key, _ in CHECKS)
+
+
+class HealthProber:
+    """Refreshes a health snapshot every `interval` seconds in a daemon thread.
+
+    After a failed probe the next one waits a random time up to
+    min(max_backoff, backoff * 2**failures); a healthy probe goes back to
+    the regular interval (jittered by up to 10%). `on_change(snapshot,
+    previous)` is called whenever the check results differ from the last
+    probe, including the first one, when previous is None. `on_probe(snapshot)`
+    gets the full snapshot after every probe, e.g. to publish it elsewhere.
+    """
+
+    def __init__(self, probe=run_checks, interval=30.0, backoff=5.0, max_backoff=300.0, on_change=None,
+                 on_probe=None):
+        self.probe = probe
+        self.interval = interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_change = on_change
+        self.on_probe = on_probe
+        self.failures = 0
+        self.counters = {'probes': 0, 'failures': 0, 'changes': 0}
+        self._snapshot = None
+        self._next_check_at = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='health-prober', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poke(self):
+        """Probe now instead of at the next scheduled time"""
+        self._wake.set()
+
+    def snapshot(self):
+        """Latest probe result; `checked_at` is None until the first probe finishes"""
+        with self._lock:
+            snapshot = self._snapshot or {key: False for key, _ in CHECKS}
+            return dict(snapshot, checked_at=snapshot.get('checked_at'), next_check_at=self._next_check_at,
+                        consecutive_failures=self.failures)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, consecutive_failures=self.failures, running=bool(self._thread))
+
+    def delay(self):
+        """Seconds until the next probe, given the current failure streak"""
+        if not self.failures:
+            return self.interval * random.uniform(0.9, 1.1)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (self.failures - 1)))
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                result = self.probe()
+            except Exception as e:
+                result = {'error': str(e)}
+            wait = self._record(result)
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def _record(self, result):
+        ok = healthy(result)
+        with self._lock:
+            previous = self._snapshot
+            self.failures = 0 if ok else self.failures + 1
+            self.counters['probes'] += 1
+            if not ok:
+                self.counters['failures'] += 1
+            wait = self.delay()
+            now = time.time()
+            self._snapshot = dict(result, checked_at=datetime.fromtimestamp(now).isoformat())
+            self._next_check_at = datetime.fromtimestamp(now + wait).isoformat()
+            changed = previous is None or {k: v for k, v in previous.items() if k != 'checked_at'} != result
+            if changed:
+                self.counters['changes'] += 1
+            snapshot = dict(self._snapshot)
+        if changed and self.on_change:
+            try:
+                self.on_change(snapshot, previous)
+            except Exception as e:
+                print(f"❌ Health prober callback error: {e}")
+        if self.on_probe:
+            try:
+                self.on_probe(self.snapshot())
+            except Exception as e:
+                print(f"❌ Health prober callback error: {e}")
+        return wait
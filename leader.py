@@ -0,0 +1,103 @@
+"""
+AI Activity Tracker - Service Leader
+Some background services must run once per database rather than once per
+worker process: the Clawdbot health prober, the session registry and
+notification delivery, whose rate limits and digests live in memory. The
+process holding an exclusive lock on a file next to the database runs them.
+The others retry every few seconds and take over when the holder stops;
+the kernel drops the lock with the process, so a crash hands it on too.
+"""
+
+import fcntl
+import os
+import threading
+
+
+class LeaderLock:
+    """flock-based election among the processes sharing `path`.
+
+    `on_acquire()` is called once this process becomes the leader, from
+    start() or from the retry thread.
+    """
+
+    def __init__(self, path, on_acquire=None, interval=5.0):
+        self.path = path
+        self.on_acquire = on_acquire
+        self.interval = interval
+        self.counters = {'attempts': 0, 'acquired': 0}
+        self._fd = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Try to lead now, then keep trying in a daemon thread; returns whether this process leads"""
+        if self._stop.is_set():  # shutting down: lead on if leading, never take over
+            return self.is_leader()
+        acquired = self._try_acquire()
+        with self._lock:
+            leading = self._held()
+            if not leading and not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._loop, name='leader-election', daemon=True)
+                self._thread.start()
+        if acquired and self.on_acquire:
+            self.on_acquire()
+        return leading
+
+    def stop(self, timeout=5):
+        """End the election for this process; a lock already held is kept until release()"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def release(self):
+        with self._lock:
+            if self._held():
+                os.close(self._fd)
+            self._fd = None
+            self._pid = None
+
+    def is_leader(self):
+        with self._lock:
+            return self._held()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, leader=self._held())
+
+    def _held(self):
+        # A forked child shares the parent's lock but must not act on it
+        return self._fd is not None and self._pid == os.getpid()
+
+    def _try_acquire(self):
+        """Take the lock if it is free; True only on the call that took it"""
+        with self._lock:
+            if self._held() or self._stop.is_set():
+                return False
+            self.counters['attempts'] += 1
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            os.ftruncate(fd, 0)
+            os.write(fd, f'{os.getpid()}\n'.encode())
+            self._fd, self._pid = fd, os.getpid()
+            self.counters['acquired'] += 1
+            return True
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                acquired = self._try_acquire()
+            except OSError as e:
+                print(f"❌ Leader election error: {e}")
+                continue
+            if acquired:
+                print(f"👑 Process {os.getpid()} took over Clawdbot and notification services")
+                if self.on_acquire:
+                    self.on_acquire()
+                return
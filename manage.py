@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Maintenance commands
+
+    python manage.py migrate          # apply pending schema migrations
+    python manage.py explain          # EXPLAIN QUERY PLAN for every built-in query
+    python manage.py rebuild-rollups  # recompute the dashboard rollups and time buckets
+    python manage.py rebuild-search   # re-index activities for full-text search
+"""
+
+import argparse
+import sys
+
+import migrations
+import rollups
+import search
+import timeseries
+from app import db_connection, DATABASE
+
+
+def cmd_migrate(args):
+    with db_connection() as conn:
+        before = migrations.current_version(conn)
+        applied = migrations.migrate(conn)
+    if not applied:
+        print(f"✅ {DATABASE} already at schema version {before}")
+    else:
+        print(f"✅ {DATABASE} migrated {before} → {applied[-1][0]}")
+    return 0
+
+
+def cmd_explain(args):
+    with db_connection() as conn:
+        migrations.migrate(conn)
+        report = migrations.explain_builtin_queries(conn)
+
+    scans = 0
+    for entry in report:
+        flags = []
+        if entry['table_scan']:
+            flags.append('TABLE SCAN')
+            scans += 1
+        if entry['temp_btree']:
+            flags.append('temp b-tree')
+        print(f"{'❌' if entry['table_scan'] else '✅'} {entry['name']}{'  [' + ', '.join(flags) + ']' if flags else ''}")
+        for line in entry['plan']:
+            print(f"     {line}")
+
+    print(f"\n{len(report)} queries, {scans} with full table scans")
+    return 1 if scans else 0
+
+
+def cmd_rebuild_rollups(args):
+    with db_connection() as conn:
+        migrations.migrate(conn)
+        if args.check:
+            mismatched = rollups.drift(conn)
+            print(f"{'✅' if not mismatched else '❌'} {mismatched} rollup group(s) out of date")
+            stale = timeseries.drift(conn)
+            print(f"{'✅' if not stale else '❌'} {stale} time bucket(s) out of date")
+            return 1 if mismatched or stale else 0
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            groups = rollups.rebuild(conn)
+            buckets = timeseries.rebuild(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    print(f"✅ Rebuilt activity_rollup: {groups} group(s)")
+    print(f"✅ Rebuilt time_buckets: {buckets} bucket(s)")
+    return 0
+
+
+def cmd_rebuild_search(args):
+    with db_connection() as conn:
+        migrations.migrate(conn)
+        if args.check:
+            error = search.check(conn)
+            print(f"❌ Search index out of date: {error}" if error else "✅ Search index matches activities")
+            return 1 if error else 0
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = search.rebuild(conn)
+            search.optimize(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    print(f"✅ Rebuilt activities_fts: {rows} activities indexed")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AI Activity Tracker maintenance commands')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('migrate', help='apply pending schema migrations').set_defaults(func=cmd_migrate)
+    sub.add_parser('explain', help='show query plans for built-in queries').set_defaults(func=cmd_explain)
+    rebuild = sub.add_parser('rebuild-rollups', help='recompute the dashboard rollups and time buckets')
+    rebuild.add_argument('--check', action='store_true', help='only report groups and buckets that are out of date')
+    rebuild.set_defaults(func=cmd_rebuild_rollups)
+    reindex = sub.add_parser('rebuild-search', help='re-index activities for full-text search')
+    reindex.add_argument('--check', action='store_true', help='only check the index against activities')
+    reindex.set_defaults(func=cmd_rebuild_search)
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+AI Activity Tracker - Metrics
+Latency histograms and counters kept in process and rendered in the
+Prometheus text format for GET /api/metrics. A RequestTrace follows each
+HTTP request through its SQL statements and Clawdbot calls, so a slow
+request can be broken down into database time, Clawdbot time and the rest
+(Python and JSON serialization).
+"""
+
+import bisect
+import contextvars
+import re
+import threading
+import time
+
+# Seconds; request and Clawdbot latencies
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Seconds; single SQL statements
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+
+TRACE_MAX_STATEMENTS = 50  # statements kept per request for the slow-request log
+
+_current_trace = contextvars.ContextVar('request_trace', default=None)
+
+
+def statement_kind(sql):
+    """SELECT, INSERT, UPDATE, WITH, BEGIN, ... (the first keyword), for low-cardinality labels"""
+    match = re.match(r'\s*(\w+)', sql)
+    return match.group(1).upper() if match else 'OTHER'
+
+
+class Histogram:
+    """Cumulative-bucket histogram for one label set"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Histograms, counters and gauges by metric name and label values"""
+
+    def __init__(self):
+        self._metrics = {}  # name -> (type, help, label names, buckets, {label values: Histogram | float})
+        self._gauges = []  # (name, help, label names, callback -> {label values: value})
+        self._lock = threading.Lock()
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self._metrics.setdefault(name, ('histogram', help, labels, buckets, {}))
+
+    def counter(self, name, help, labels=()):
+        self._metrics.setdefault(name, ('counter', help, labels, None, {}))
+
+    def gauge(self, name, help, callback, labels=()):
+        """`callback()` returns {label values tuple: value}, read at render time"""
+        self._gauges.append((name, help, labels, callback))
+
+    def observe(self, name, value, *labels):
+        _, _, _, buckets, series = self._metrics[name]
+        with self._lock:
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, name, value=1, *labels):
+        series = self._metrics[name][4]
+        with self._lock:
+            series[labels] = series.get(labels, 0) + value
+
+    def render(self):
+        """Prometheus text exposition format, version 0.0.4"""
+        lines = []
+        with self._lock:
+            for name, (kind, help, label_names, buckets, series) in self._metrics.items():
+                lines += [f'# HELP {name} {help}', f'# TYPE {name} {kind}']
+                for values, value in sorted(series.items()):
+                    labels = _labels(label_names, values)
+                    if kind == 'counter':
+                        lines.append(f'{name}{_braces(labels)} {_number(value)}')
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(buckets + (float('inf'),), value.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else _number(bound)
+                        bucket_labels = labels + [f'le="{le}"']
+                        lines.append(f'{name}_bucket{_braces(bucket_labels)} {cumulative}')
+                    lines.append(f'{name}_sum{_braces(labels)} {_number(value.sum)}')
+                    lines.append(f'{name}_count{_braces(labels)} {value.count}')
+        for name, help, label_names, callback in self._gauges:
+            try:
+                series = callback()
+            except Exception as e:
+                lines.append(f'# {name} unavailable: {e}')
+                continue
+            lines += [f'# HELP {name} {help}', f'# TYPE {name} gauge']
+            for values, value in sorted(series.items()):
+                lines.append(f'{name}{_braces(_labels(label_names, values))} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(names, values):
+    return [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+
+
+def _braces(labels):
+    return '{' + ','.join(labels) + '}' if labels else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class RequestTrace:
+    """Time spent in SQL and Clawdbot calls during one request"""
+
+    def __init__(self, route, keep_statements=False):
+        self.route = route
+        self.started = time.perf_counter()
+        self.sql_seconds = 0.0
+        self.sql_count = 0
+        self.clawdbot_seconds = 0.0
+        self.clawdbot_count = 0
+        self.statements = [] if keep_statements else None  # (seconds, rows, sql)
+        self.calls = [] if keep_statements else None  # (seconds, transport, operation, outcome)
+
+    def add_statement(self, sql, seconds, rows):
+        self.sql_seconds += seconds
+        self.sql_count += 1
+        if self.statements is not None and len(self.statements) < TRACE_MAX_STATEMENTS:
+            self.statements.append((seconds, rows, sql))
+
+    def add_call(self, transport, operation, seconds, outcome):
+        self.clawdbot_seconds += seconds
+        self.clawdbot_count += 1
+        if self.calls is not None and len(self.calls) < TRACE_MAX_STATEMENTS:
+            self.calls.append((seconds, transport, operation, outcome))
+
+    def report(self, seconds):
+        """Multi-line breakdown for the slow-request log"""
+        other = max(0.0, seconds - self.sql_seconds - self.clawdbot_seconds)
+        lines = [f"🐢 Slow request {self.route}: {seconds * 1000:.1f} ms "
+                 f"(SQL {self.sql_seconds * 1000:.1f} ms in {self.sql_count}, "
+                 f"Clawdbot {self.clawdbot_seconds * 1000:.1f} ms in {self.clawdbot_count}, "
+                 f"other {other * 1000:.1f} ms)"]
+        for took, rows, sql in sorted(self.statements or [], key=lambda s: -s[0])[:10]:
+            lines.append(f"   🗄  {took * 1000:8.2f} ms {rows:>6} rows  {' '.join(sql.split())[:160]}")
+        for took, transport, operation, outcome in sorted(self.calls or [], key=lambda c: -c[0])[:10]:
+            lines.append(f"   🤖 {took * 1000:8.2f} ms {transport} {operation} ({outcome})")
+        return '\n'.join(lines)
+
+
+def start_trace(route, keep_statements=False):
+    """Trace this thread's work until end_trace()"""
+    trace = RequestTrace(route, keep_statements)
+    _current_trace.set(trace)
+    return trace
+
+
+def end_trace():
+    _current_trace.set(None)
+
+
+def current_trace():
+    return _current_trace.get()
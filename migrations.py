@@ -0,0 +1,363 @@
+"""
+AI Activity Tracker - Schema Migrations
+Ordered schema changes tracked in SQLite's `PRAGMA user_version`, plus an
+EXPLAIN QUERY PLAN report over the built-in queries.
+"""
+
+import re
+
+import queries
+import rollups
+import search
+
+# A bare "SCAN <table>" reads every row; "SCAN t USING INDEX" and "SCAN (subquery-1)" do not
+TABLE_SCAN = re.compile(r'^SCAN \w+( AS \w+)?$')
+
+def _rollup_add(row):
+    values = ', '.join('(' + ', '.join(rollups.row_values(d, row)) + ')' for d in rollups.DIMENSIONS)
+    updates = ', '.join(f'{m} = {m} + excluded.{m}' for m in rollups.MEASURES)
+    return (f"INSERT INTO activity_rollup ({', '.join(rollups.COLUMNS)}) VALUES {values} "
+            f"ON CONFLICT ({', '.join(rollups.KEY_COLUMNS)}) DO UPDATE SET {updates};")
+
+
+def _rollup_remove(row):
+    statements = []
+    for dimension in rollups.DIMENSIONS:
+        values = rollups.row_values(dimension, row)
+        match = ' AND '.join(f'{k} = {v}' for k, v in zip(rollups.KEY_COLUMNS, values))
+        updates = ', '.join(f'{m} = {m} - {v}' for m, v in zip(rollups.MEASURES, values[len(rollups.KEY_COLUMNS):]))
+        statements.append(f"UPDATE activity_rollup SET {updates} WHERE {match};")
+        statements.append(f"DELETE FROM activity_rollup WHERE {match} AND activities = 0;")
+    return '\n'.join(statements)
+
+
+def _fts_add(row):
+    return (f"INSERT INTO activities_fts(rowid, {', '.join(search.COLUMNS)}) "
+            f"VALUES ({row}.id, {', '.join(f'{row}.{c}' for c in search.COLUMNS)});")
+
+
+def _fts_remove(row):
+    # An external-content index deletes by re-supplying the indexed text
+    return (f"INSERT INTO activities_fts(activities_fts, rowid, {', '.join(search.COLUMNS)}) "
+            f"VALUES ('delete', {row}.id, {', '.join(f'{row}.{c}' for c in search.COLUMNS)});")
+
+
+# Columns that feed activity_rollup; other updates leave it alone
+ROLLUP_SOURCE_COLUMNS = ('created_at', 'ai_tool', 'project', 'outcome', 'failure_reason',
+                         'status', 'time_spent', 'iteration_count')
+
+# (version, description, steps). A step is a SQL string or a callable(conn).
+# Never edit a released migration; append a new one instead.
+MIGRATIONS = [
+    (1, 'Create activities and dispatch_jobs tables', [
+        '''
+        CREATE TABLE IF NOT EXISTS activities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            ai_tool TEXT,
+            project TEXT,
+            status TEXT DEFAULT 'todo',
+            position INTEGER DEFAULT 0,
+            time_spent INTEGER DEFAULT 0,
+            time_started TIMESTAMP,
+            outcome TEXT,
+            outcome_notes TEXT,
+            failure_reason TEXT,
+            iteration_count INTEGER DEFAULT 1,
+            calendar_event_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS dispatch_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            activity_id INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            timeout INTEGER NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at TIMESTAMP NOT NULL,
+            started_at TIMESTAMP,
+            deadline TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+        ''',
+    ]),
+    (2, 'Indexes for board, analytics, export and dispatch queries', [
+        # Board ordering; id makes the key unique for keyset pagination
+        'CREATE INDEX IF NOT EXISTS idx_activities_board ON activities(status, position, id)',
+        # Todo / in-progress columns stay small no matter how much history is done
+        "CREATE INDEX IF NOT EXISTS idx_activities_open ON activities(status, position, id) WHERE status != 'done'",
+        # Covering indexes for the GROUP BY aggregates
+        'CREATE INDEX IF NOT EXISTS idx_activities_tool ON activities(ai_tool, outcome, time_spent, iteration_count)',
+        'CREATE INDEX IF NOT EXISTS idx_activities_project ON activities(project, status, time_spent)',
+        'CREATE INDEX IF NOT EXISTS idx_activities_outcome ON activities(outcome)',
+        'CREATE INDEX IF NOT EXISTS idx_activities_failure ON activities(failure_reason)',
+        # CSV export order and calendar window
+        'CREATE INDEX IF NOT EXISTS idx_activities_created ON activities(created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_dispatch_jobs_status ON dispatch_jobs(status, id)',
+        'CREATE INDEX IF NOT EXISTS idx_dispatch_jobs_activity ON dispatch_jobs(activity_id, status)',
+    ]),
+    (3, 'Keyset pagination: non-null board keys and filtered board indexes', [
+        # (status, position, id) is the pagination key; NULLs would drop rows from later pages
+        "UPDATE activities SET status = 'todo' WHERE status IS NULL",
+        'UPDATE activities SET position = 0 WHERE position IS NULL',
+        'CREATE INDEX IF NOT EXISTS idx_activities_project_board ON activities(project, status, position)',
+        'CREATE INDEX IF NOT EXISTS idx_activities_tool_board ON activities(ai_tool, status, position)',
+    ]),
+    (4, 'Change feed: global data version, per-row versions and delete tombstones', [
+        'CREATE TABLE IF NOT EXISTS sync_state (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)',
+        'ALTER TABLE activities ADD COLUMN version INTEGER NOT NULL DEFAULT 0',
+        'UPDATE activities SET version = id',
+        'INSERT OR IGNORE INTO sync_state (id, version) SELECT 1, COALESCE(MAX(id), 0) FROM activities',
+        'CREATE INDEX IF NOT EXISTS idx_activities_version ON activities(version)',
+        '''
+        CREATE TABLE IF NOT EXISTS activity_tombstones (
+            id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL,
+            deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_activity_tombstones_version ON activity_tombstones(version)',
+        # Every write, whichever code path makes it, takes the next global version
+        '''
+        CREATE TRIGGER IF NOT EXISTS activities_version_insert AFTER INSERT ON activities
+        BEGIN
+            UPDATE sync_state SET version = version + 1 WHERE id = 1;
+            UPDATE activities SET version = (SELECT version FROM sync_state WHERE id = 1) WHERE id = NEW.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activities_version_update AFTER UPDATE ON activities
+        WHEN NEW.version = OLD.version
+        BEGIN
+            UPDATE sync_state SET version = version + 1 WHERE id = 1;
+            UPDATE activities SET version = (SELECT version FROM sync_state WHERE id = 1) WHERE id = NEW.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activities_version_delete AFTER DELETE ON activities
+        BEGIN
+            UPDATE sync_state SET version = version + 1 WHERE id = 1;
+            INSERT OR REPLACE INTO activity_tombstones (id, version)
+            VALUES (OLD.id, (SELECT version FROM sync_state WHERE id = 1));
+        END
+        ''',
+    ]),
+    (5, 'Analytics rollups maintained by triggers', [
+        '''
+        CREATE TABLE IF NOT EXISTS activity_rollup (
+            dimension TEXT NOT NULL,
+            day TEXT NOT NULL,
+            value TEXT NOT NULL,
+            activities INTEGER NOT NULL,
+            completed INTEGER NOT NULL,
+            successes INTEGER NOT NULL,
+            partials INTEGER NOT NULL,
+            failures INTEGER NOT NULL,
+            rated INTEGER NOT NULL,
+            timed INTEGER NOT NULL,
+            time_spent INTEGER NOT NULL,
+            done_timed INTEGER NOT NULL,
+            done_time_spent INTEGER NOT NULL,
+            iterated INTEGER NOT NULL,
+            iterations INTEGER NOT NULL,
+            PRIMARY KEY (dimension, day, value)
+        ) WITHOUT ROWID
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS activities_rollup_insert AFTER INSERT ON activities
+        BEGIN
+            {_rollup_add('NEW')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS activities_rollup_update AFTER UPDATE ON activities
+        WHEN {' OR '.join(f'NEW.{c} IS NOT OLD.{c}' for c in ROLLUP_SOURCE_COLUMNS)}
+        BEGIN
+            {_rollup_remove('OLD')}
+            {_rollup_add('NEW')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS activities_rollup_delete AFTER DELETE ON activities
+        BEGIN
+            {_rollup_remove('OLD')}
+        END
+        ''',
+        rollups.rebuild,
+    ]),
+    (6, 'Covering index for the calendar feed validators', [
+        # COUNT/MAX(version)/MAX(updated_at) over a created_at range without touching rows;
+        # supersedes idx_activities_created
+        'CREATE INDEX IF NOT EXISTS idx_activities_calendar ON activities(created_at, version, updated_at)',
+        'DROP INDEX IF EXISTS idx_activities_created',
+    ]),
+    (7, 'Writes may claim the next data version themselves', [
+        # PATCH sets version = sync_state.version + 1 in its own UPDATE so that
+        # RETURNING reports the new version; this advances the counter to match.
+        # (activities_version_update skips rows whose version already changed.)
+        '''
+        CREATE TRIGGER IF NOT EXISTS activities_version_claimed AFTER UPDATE ON activities
+        WHEN NEW.version > OLD.version
+        BEGIN
+            UPDATE sync_state SET version = NEW.version WHERE id = 1 AND version < NEW.version;
+        END
+        ''',
+    ]),
+    (8, 'Timer sessions and hourly/daily tracked-time buckets', [
+        '''
+        CREATE TABLE IF NOT EXISTS time_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            activity_id INTEGER NOT NULL,
+            ai_tool TEXT,
+            project TEXT,
+            started_at TIMESTAMP NOT NULL,
+            ended_at TIMESTAMP NOT NULL,
+            seconds INTEGER NOT NULL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_time_sessions_activity ON time_sessions(activity_id, started_at)',
+        # Maintained by timeseries.record_session; size is 'hour' or 'day'
+        '''
+        CREATE TABLE IF NOT EXISTS time_buckets (
+            size TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            value TEXT NOT NULL,
+            seconds INTEGER NOT NULL,
+            PRIMARY KEY (size, dimension, bucket, value)
+        ) WITHOUT ROWID
+        ''',
+    ]),
+    (9, 'Full-text search index over activity text', [
+        f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS activities_fts USING fts5(
+            {', '.join(search.COLUMNS)},
+            content='activities', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        ''',
+        f"INSERT INTO activities_fts(activities_fts, rank) VALUES ('rank', '{search.RANK}')",
+        f'''
+        CREATE TRIGGER IF NOT EXISTS activities_fts_insert AFTER INSERT ON activities
+        BEGIN
+            {_fts_add('NEW')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS activities_fts_update AFTER UPDATE ON activities
+        WHEN {' OR '.join(f'NEW.{c} IS NOT OLD.{c}' for c in search.COLUMNS)}
+        BEGIN
+            {_fts_remove('OLD')}
+            {_fts_add('NEW')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS activities_fts_delete AFTER DELETE ON activities
+        BEGIN
+            {_fts_remove('OLD')}
+        END
+        ''',
+        search.rebuild,
+    ]),
+    (10, 'Clawdbot sessions spawned for activities', [
+        # Written by session_registry: one row per spawn, closed when the listing
+        # or the completion callback reports the session finished
+        '''
+        CREATE TABLE IF NOT EXISTS clawdbot_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            activity_id INTEGER NOT NULL,
+            label TEXT NOT NULL,
+            session_key TEXT,
+            status TEXT NOT NULL,
+            spawned_at TIMESTAMP NOT NULL,
+            finished_at TIMESTAMP,
+            updated_at TIMESTAMP NOT NULL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_clawdbot_sessions_activity ON clawdbot_sessions(activity_id, id)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_clawdbot_sessions_key ON clawdbot_sessions(session_key) WHERE session_key IS NOT NULL',
+    ]),
+    (11, 'Settings shared by all worker processes', [
+        # Written by settings.py; values are JSON
+        '''
+        CREATE TABLE IF NOT EXISTS settings (
+            name TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        ) WITHOUT ROWID
+        ''',
+    ]),
+    (12, 'Notifications relayed to the process that delivers them', [
+        # Written and drained by notification_relay.py
+        '''
+        CREATE TABLE IF NOT EXISTS notification_relay (
+            id INTEGER PRIMARY KEY,
+            payload TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL
+        )
+        ''',
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn, target=LATEST_VERSION):
+    """Apply pending migrations up to `target`, each in its own transaction.
+
+    Returns the list of (version, description) that were applied.
+    """
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        if version <= current_version(conn) or version > target:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append((version, description))
+        print(f"🗄  Applied migration {version}: {description}")
+    return applied
+
+
+def explain(conn, sql, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for one statement"""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()]
+
+
+def has_table_scan(plan):
+    """True when a plan reads a whole table"""
+    # Scanning a subquery the plan materialized first reads no table
+    materialized = {line.split()[1] for line in plan if line.startswith('MATERIALIZE ')}
+    return any(TABLE_SCAN.match(line) and line.split()[1] not in materialized for line in plan)
+
+
+def explain_builtin_queries(conn):
+    """Plan every built-in query and flag full table scans and temp sorts"""
+    report = []
+    for name, (sql, params) in queries.BUILTIN_QUERIES.items():
+        plan = explain(conn, sql, params)
+        report.append({
+            'name': name,
+            'plan': plan,
+            'table_scan': has_table_scan(plan),
+            'temp_btree': any('USE TEMP B-TREE' in line for line in plan),
+        })
+    return report
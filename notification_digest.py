@@ -0,0 +1,204 @@
+"""
+AI Activity Tracker - Notification Digest and Rate Limits
+DigestScheduler sits in front of the outbox. The first routine event after
+a quiet period goes out as usual. Events that follow within the digest
+window are counted instead and sent as one summary when the window closes
+("14 completed, 2 failed, by tool ..."). Failures skip the digest and go
+out at once. Every send then takes a token from its channel's bucket in
+RateLimiter, so a burst can't exceed the channel's send rate.
+"""
+
+import threading
+import time
+from collections import Counter
+
+# Notification types that are never held for a digest
+URGENT_TYPES = ('failed', 'test')
+
+KIND_LABELS = [
+    ('completed', '✅ {} completed'),
+    ('failed', '❌ {} failed'),
+    ('created', '📋 {} created'),
+    ('moved', '🔀 {} moved'),
+    ('imported', '📥 {} imports'),
+    ('info', '📌 {} other'),
+]
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Take a token; returns 0, or the seconds until one is available (nothing taken)"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """One token bucket per channel, created on first use"""
+
+    def __init__(self, per_minute=20, burst=5):
+        self.per_minute = per_minute
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def wait(self, channel):
+        """0 when a send on `channel` may go now, else seconds until it may"""
+        if not self.per_minute:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(channel)
+            if bucket is None:
+                bucket = self._buckets[channel] = TokenBucket(self.per_minute / 60, self.burst)
+        return bucket.take()
+
+    def stats(self):
+        with self._lock:
+            return {'per_minute': self.per_minute, 'burst': self.burst,
+                    'tokens': {channel: round(bucket.tokens, 2) for channel, bucket in self._buckets.items()}}
+
+
+class Digest:
+    """Tallies for one digest window"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.kinds = Counter()
+        self.tools = Counter()
+        self.projects = Counter()
+        self.lines = []
+        self.pending = []  # (text, key, summary) not sent yet
+        self.already_sent = 0
+
+    def add(self, kind, activity, summary, message=None, sent=False):
+        self.kinds[kind] += 1
+        if activity:
+            if activity.get('ai_tool'):
+                self.tools[activity['ai_tool']] += 1
+            if activity.get('project'):
+                self.projects[activity['project']] += 1
+        if sent:
+            self.already_sent += 1
+        else:
+            self.lines.append(summary)
+            self.pending.append(message)
+
+    def render(self, max_lines=5):
+        minutes = max(1, round((time.monotonic() - self.started) / 60))
+        counts = ' · '.join(label.format(self.kinds[kind]) for kind, label in KIND_LABELS if self.kinds[kind])
+        text = f"📊 **AI Tracker digest** (last {minutes}m)\n{counts}"
+        if self.tools:
+            text += "\n🤖 By tool: " + ', '.join(f"{tool} {n}" for tool, n in self.tools.most_common(5))
+        if self.projects:
+            text += "\n📁 By project: " + ', '.join(f"{project} {n}" for project, n in self.projects.most_common(5))
+        if self.already_sent:
+            text += f"\n({self.already_sent} already sent on their own)"
+        lines = [f"• {line}" for line in self.lines[-max_lines:]]
+        if len(self.lines) > max_lines:
+            lines.insert(0, f"• … {len(self.lines) - max_lines} earlier")
+        return text + "\n\n" + "\n".join(lines)
+
+
+class DigestScheduler:
+    """Routes notifications to `submit(text, key, summary, urgent)` (the outbox).
+
+    Urgent types go straight through. A routine event goes straight through
+    when no digest window is open, and opens one for `interval` seconds;
+    routine events inside an open window are held and sent as one digest
+    (or as themselves, if only one arrived) when it closes. The window stays
+    open while events keep arriving. interval=0 turns digests off.
+    """
+
+    def __init__(self, submit, interval=60.0):
+        self.submit = submit
+        self.interval = interval
+        self.counters = {'events': 0, 'urgent': 0, 'immediate': 0, 'digested': 0, 'digests': 0}
+        self._digest = None
+        self._window_end = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def notify(self, text, kind='info', activity=None, key=None, summary=None):
+        summary = summary or text.splitlines()[0]
+        now = time.monotonic()
+        with self._cond:
+            self.counters['events'] += 1
+            if kind in URGENT_TYPES or not self.interval:
+                self.counters['urgent' if kind in URGENT_TYPES else 'immediate'] += 1
+                if self._digest is not None:
+                    self._digest.add(kind, activity, summary, sent=True)
+                held = False
+            elif now >= self._window_end:
+                self.counters['immediate'] += 1
+                self._window_end = now + self.interval
+                self._digest = Digest()
+                self._digest.add(kind, activity, summary, sent=True)
+                held = False
+            else:
+                self.counters['digested'] += 1
+                self._digest.add(kind, activity, summary, (text, key, summary))
+                held = True
+            self._cond.notify()
+        if held:
+            self._start()
+        else:
+            self.submit(text, key=key, summary=summary, urgent=kind in URGENT_TYPES)
+
+    def flush(self):
+        """Close the window now: send what it holds; returns True if anything was sent"""
+        with self._cond:
+            digest, self._digest = self._digest, None
+            self._window_end = 0
+            if digest is None or not digest.pending:
+                return False
+            if len(digest.pending) == 1:
+                self.counters['digested'] -= 1
+                message = digest.pending[0]
+            else:
+                self.counters['digests'] += 1
+                message = (digest.render(), None, f"Digest of {len(digest.pending)} updates")
+            # Traffic is still arriving: keep a window open behind this send
+            self._window_end = time.monotonic() + self.interval
+            self._digest = Digest()
+        text, key, summary = message
+        self.submit(text, key=key, summary=summary)
+        return True
+
+    def stats(self):
+        with self._cond:
+            held = len(self._digest.pending) if self._digest else 0
+            return dict(self.counters, held=held, interval=self.interval)
+
+    def _start(self):
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name='notification-digest', daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._digest is None or not self._digest.pending:
+                    if not self._cond.wait(self.interval * 2) and not (self._digest and self._digest.pending):
+                        self._thread = None
+                        return
+                wait = self._window_end - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            self.flush()
@@ -0,0 +1,182 @@
+"""
+AI Activity Tracker - Notification Outbox
+In-process queue drained by a dedicated sender thread. Notifications for the
+same activity that arrive within the coalescing window are merged into a
+single message, so a burst of board moves costs one send instead of N. With
+a rate limiter, messages that find no send token are held back and merged
+into one until the limiter allows the next send.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+
+class NotificationOutbox:
+    """Bounded, coalescing outbox in front of a blocking `deliver(text)` call.
+
+    `deliver` returns True when the message went out. Entries are keyed by
+    activity id; unkeyed messages are never merged and go out immediately.
+    `limiter()`, if given, is asked before every send and returns 0 or the
+    seconds to hold off.
+    """
+
+    def __init__(self, deliver, maxsize=200, coalesce_window=5.0, max_batched_lines=10, limiter=None):
+        self.deliver = deliver
+        self.limiter = limiter
+        self.maxsize = maxsize
+        self.coalesce_window = coalesce_window
+        self.max_batched_lines = max_batched_lines
+
+        self._pending = OrderedDict()  # key -> entry, oldest first
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+        self._unkeyed = itertools.count()
+        self._in_flight = 0
+        self._deferred_key = ('deferred', 0)
+
+        self.counters = {
+            'submitted': 0,
+            'coalesced': 0,
+            'sent': 0,
+            'failed': 0,
+            'dropped': 0,
+            'deferred': 0,
+            'merged': 0,
+            'high_water': 0,
+        }
+
+    def start(self):
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._sender_loop, name='notification-sender', daemon=True)
+            self._thread.start()
+
+    def stop(self, drain=True, timeout=10):
+        """Stop the sender, optionally sending everything still pending first"""
+        with self._cond:
+            if drain:
+                for entry in self._pending.values():
+                    entry['due'] = 0
+            else:
+                self.counters['dropped'] += len(self._pending)
+                self._pending.clear()
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, text, key=None, summary=None, urgent=False):
+        """Queue a message. Returns False when the outbox is full and it was dropped.
+
+        Urgent messages skip the coalescing window (and take pending updates
+        for the same key along with them).
+        """
+        now = time.monotonic()
+        with self._cond:
+            self.counters['submitted'] += 1
+            if key is not None and key in self._pending:
+                entry = self._pending[key]
+                entry['text'] = text
+                entry['summaries'].append(summary or text.splitlines()[0])
+                self.counters['coalesced'] += 1
+                if urgent:
+                    entry['due'] = now
+                    self._cond.notify()
+                return True
+
+            if len(self._pending) >= self.maxsize:
+                self.counters['dropped'] += 1
+                print(f"⚠️  Notification outbox full ({self.maxsize}), dropping message")
+                return False
+
+            if key is None:
+                key = ('unkeyed', next(self._unkeyed))
+                due = now
+            else:
+                due = now if urgent else now + self.coalesce_window
+            self._pending[key] = {
+                'text': text,
+                'summaries': [summary or text.splitlines()[0]],
+                'due': due,
+            }
+            self.counters['high_water'] = max(self.counters['high_water'], len(self._pending))
+            self._cond.notify()
+
+        self.start()
+        return True
+
+    def stats(self):
+        with self._cond:
+            return dict(self.counters, pending=len(self._pending), in_flight=self._in_flight,
+                        maxsize=self.maxsize, coalesce_window=self.coalesce_window)
+
+    def _render(self, entry):
+        summaries = entry['summaries']
+        if len(summaries) == 1:
+            return entry['text']
+        lines = [f"• {s}" for s in summaries[-self.max_batched_lines:]]
+        if len(summaries) > self.max_batched_lines:
+            lines.insert(0, f"• … {len(summaries) - self.max_batched_lines} earlier")
+        if entry.get('merged'):
+            return entry['text'] + "\n" + "\n".join(lines)
+        return entry['text'] + f"\n\n🗂 {len(summaries)} updates batched:\n" + "\n".join(lines)
+
+    def _defer(self, entries, wait):
+        """Out of send tokens: hold entries back as one merged message, due when the limiter allows"""
+        with self._cond:
+            self.counters['deferred'] += len(entries)
+            self._in_flight -= len(entries)
+            held = self._pending.pop(self._deferred_key, None)
+            if held is not None:
+                entries = [held] + entries
+            if len(entries) == 1:
+                merged = entries[0]
+            else:
+                self.counters['merged'] += len(entries) - 1
+                summaries = [summary for entry in entries for summary in entry['summaries']]
+                merged = {'text': f"🗂 {len(summaries)} notifications held back by the rate limit:",
+                          'summaries': summaries, 'merged': True}
+            merged['due'] = time.monotonic() + wait
+            self._pending[self._deferred_key] = merged
+            self._pending.move_to_end(self._deferred_key, last=False)
+
+    def _take_due(self):
+        """Pop every entry whose window has closed; returns (entries, seconds until next due)"""
+        now = time.monotonic()
+        ready = [key for key, entry in self._pending.items() if entry['due'] <= now]
+        entries = [self._pending.pop(key) for key in ready]
+        wait = None
+        if self._pending:
+            wait = max(0.0, min(entry['due'] for entry in self._pending.values()) - now)
+        return entries, wait
+
+    def _sender_loop(self):
+        while True:
+            with self._cond:
+                entries, wait = self._take_due()
+                while not entries:
+                    if self._stop and not self._pending:
+                        return
+                    self._cond.wait(wait)
+                    entries, wait = self._take_due()
+                self._in_flight = len(entries)
+
+            for n, entry in enumerate(entries):
+                wait = self.limiter() if self.limiter else 0
+                if wait > 0:
+                    self._defer(entries[n:], wait)
+                    break
+                try:
+                    ok = self.deliver(self._render(entry))
+                except Exception as e:
+                    print(f"❌ Notification failed: {e}")
+                    ok = False
+                with self._cond:
+                    self.counters['sent' if ok else 'failed'] += 1
+                    self._in_flight -= 1
@@ -0,0 +1,101 @@
+"""
+AI Activity Tracker - Notification Relay
+Notifications are delivered by one process (see leader.py), because the
+digest window and the rate limit live in its memory. Other worker processes
+store their notifications in the notification_relay table (created by
+migrations.py) instead; the delivering process claims them every second,
+oldest first, and feeds them to its digest as if they had been raised there.
+Rows left behind by a delivering process that stopped wait for the next one.
+"""
+
+import json
+import threading
+from datetime import datetime
+
+INSERT_RELAYED = 'INSERT INTO notification_relay (payload, created_at) VALUES (?, ?)'
+
+CLAIM_RELAYED = '''
+    DELETE FROM notification_relay
+    WHERE id IN (SELECT id FROM notification_relay ORDER BY id LIMIT ?)
+    RETURNING id, payload
+'''
+
+
+class NotificationRelay:
+    """Carries `deliver(**fields)` calls from any process to the one running start().
+
+    `connect` is a context manager factory yielding a sqlite3 connection.
+    submit() stores the keyword arguments as JSON; the relay thread claims
+    up to `batch_size` rows every `interval` seconds and delivers them.
+    """
+
+    def __init__(self, connect, deliver, interval=1.0, batch_size=100):
+        self.connect = connect
+        self.deliver = deliver
+        self.interval = interval
+        self.batch_size = batch_size
+        self.counters = {'submitted': 0, 'relayed': 0, 'errors': 0}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='notification-relay', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """Stop the relay thread after one last pass over stored notifications"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, **fields):
+        with self.connect() as conn:
+            conn.execute(INSERT_RELAYED, (json.dumps(fields, default=str), datetime.now().isoformat()))
+            conn.commit()
+        with self._lock:
+            self.counters['submitted'] += 1
+
+    def drain(self):
+        """Claim and deliver stored notifications until none are left; returns how many"""
+        relayed = 0
+        while True:
+            with self.connect() as conn:
+                rows = conn.execute(CLAIM_RELAYED, (self.batch_size,)).fetchall()
+                conn.commit()
+            for _, payload in sorted(rows, key=lambda row: row[0]):  # RETURNING has no order
+                try:
+                    self.deliver(**json.loads(payload))
+                except Exception as e:
+                    with self._lock:
+                        self.counters['errors'] += 1
+                    print(f"❌ Relayed notification error: {e}")
+                    continue
+                relayed += 1
+                with self._lock:
+                    self.counters['relayed'] += 1
+            if len(rows) < self.batch_size:
+                return relayed
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, running=bool(self._thread))
+
+    def _loop(self):
+        while True:
+            stopping = self._stop.is_set()
+            try:
+                self.drain()
+            except Exception as e:
+                print(f"❌ Notification relay error: {e}")
+            if stopping:
+                return
+            self._wake.wait(self.interval)
+            self._wake.clear()
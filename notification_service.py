@@ -1,74 +1,335 @@
 #!/usr/bin/env python3
 """
 AI Activity Tracker - Notification Service
-Monitors the notification queue and sends messages via Clawdbot
+Sends messages queued in a spool directory via Clawdbot. Each message is one
+file: producers write it under tmp/ and rename it into new/, so a reader
+never sees half a message and two producers never overwrite each other. The
+service claims files by renaming them into cur/, sends them in concurrent
+batches, deletes them once sent, and retries failures with backoff until
+they are moved to dead/. It wakes on inotify where available and otherwise
+polls. One sender runs per spool; it holds a lock file there.
+
+    python notification_service.py                 # run the sender
+    python notification_service.py send "Deployed"  # queue one message
+    python notification_service.py stats           # counters of the running sender
 """
 
+import argparse
+import ctypes
+import ctypes.util
+import fcntl
+import itertools
+import random
+import select
+import sys
 import time
 import json
 import os
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from clawdbot_transport import make_transport, TransportTimeout
+
+SPOOL_DIR = os.environ.get('AI_TRACKER_SPOOL_DIR', '/tmp/ai_tracker_spool')
+SPOOL_WORKERS = int(os.environ.get('AI_TRACKER_SPOOL_WORKERS', '8'))  # concurrent sends
+SPOOL_BATCH_SIZE = 256  # files claimed per pass
+SPOOL_MAX_ATTEMPTS = int(os.environ.get('AI_TRACKER_SPOOL_MAX_ATTEMPTS', '6'))  # then dead-lettered
+SPOOL_BACKOFF_SECONDS = 2  # first retry delay, doubling per failed attempt
+SPOOL_BACKOFF_MAX_SECONDS = 300
+SPOOL_POLL_SECONDS = float(os.environ.get('AI_TRACKER_SPOOL_POLL_SECONDS', '1'))  # without inotify
+STATS_INTERVAL_SECONDS = 30
+LEGACY_NOTIFICATION_FILE = '/tmp/ai_tracker_notification.txt'  # still picked up, one message at a time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+
+# Same transport settings as app.py
+clawdbot = make_transport(
+    os.environ.get('AI_TRACKER_CLAWDBOT_TRANSPORT', 'auto'),
+    url=os.environ.get('AI_TRACKER_CLAWDBOT_URL'),
+    token=os.environ.get('AI_TRACKER_CLAWDBOT_TOKEN'),
+)
+
 def send_telegram_notification(message):
     """Send notification via Clawdbot message tool"""
     try:
         # Use clawdbot message tool to send to Telegram
-        cmd = [
-            'clawdbot', 'message', 'send',
-            '--channel', 'telegram',
-            '--message', message
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
+        result = clawdbot.send_message(message, channel='telegram', timeout=10)
+
+        if result.ok:
             print(f"✅ Notification sent: {message[:50]}...")
             return True
         else:
-            print(f"❌ Failed to send notification: {result.stderr}")
+            print(f"❌ Failed to send notification: {result.error}")
             return False
-            
-    except subprocess.TimeoutExpired:
+
+    except TransportTimeout:
         print("⏰ Notification timeout")
         return False
     except Exception as e:
         print(f"💥 Notification error: {e}")
         return False
 
+_sequence = itertools.count()
+
+def spool_message(message, spool_dir=SPOOL_DIR):
+    """Queue one message for the sender; returns the spooled file name.
+
+    Names sort in submission order, so the sender works oldest first.
+    """
+    for sub in ('tmp', 'new'):
+        os.makedirs(os.path.join(spool_dir, sub), exist_ok=True)
+    name = f"{time.time_ns():020d}.{os.getpid()}.{next(_sequence)}.msg"
+    tmp_path = os.path.join(spool_dir, 'tmp', name)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(message)
+        f.flush()
+        os.fsync(f.fileno())
+    os.rename(tmp_path, os.path.join(spool_dir, 'new', name))
+    return name
+
+def inotify_watch(path):
+    """Non-blocking inotify fd for files renamed or written into path; None where inotify is unavailable"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):  # not Linux
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(path), IN_MOVED_TO | IN_CLOSE_WRITE) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+class SpoolBusy(RuntimeError):
+    """Another sender holds the spool's lock"""
+
+
+class SpoolSender:
+    """Drains a spool directory through `send(message) -> bool`.
+
+    Claimed files live in cur/ until they are sent (deleted) or have failed
+    `max_attempts` times (moved to dead/ with a .error note). Only the sender
+    holding sender.lock runs, so every file in cur/ at its start-up was left
+    by a crash and goes back to new/: a message may be sent twice but never
+    lost.
+    """
+
+    def __init__(self, spool_dir, send, workers=SPOOL_WORKERS, batch_size=SPOOL_BATCH_SIZE,
+                 max_attempts=SPOOL_MAX_ATTEMPTS, backoff=SPOOL_BACKOFF_SECONDS,
+                 max_backoff=SPOOL_BACKOFF_MAX_SECONDS, poll_interval=SPOOL_POLL_SECONDS, legacy_file=None):
+        self.dirs = {sub: os.path.join(spool_dir, sub) for sub in ('tmp', 'new', 'cur', 'dead')}
+        for path in self.dirs.values():
+            os.makedirs(path, exist_ok=True)
+        self.stats_path = os.path.join(spool_dir, 'stats.json')
+        self.lock_path = os.path.join(spool_dir, 'sender.lock')
+        self._lock_fd = None
+        self.send = send
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.legacy_file = legacy_file
+        self.retries = {}  # name in cur/ -> (failed attempts, monotonic time it is due again)
+        self.counters = {'sent': 0, 'failed_attempts': 0, 'retried': 0, 'dead': 0, 'empty': 0}
+        self.started = time.monotonic()
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix='spool-sender')
+        self._watch = inotify_watch(self.dirs['new'])
+
+    def acquire(self):
+        """Take the spool's sender lock, or raise SpoolBusy; the kernel drops it if this process dies"""
+        if self._lock_fd is not None:
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            raise SpoolBusy(f'another notification sender is running on {os.path.dirname(self.lock_path)}')
+        os.ftruncate(fd, 0)
+        os.write(fd, f'{os.getpid()}\n'.encode())
+        self._lock_fd = fd
+
+    def recover(self):
+        """Return files a previous run claimed but never finished to new/ (needs the lock)"""
+        for name in os.listdir(self.dirs['cur']):
+            os.rename(os.path.join(self.dirs['cur'], name), os.path.join(self.dirs['new'], name))
+
+    def import_legacy(self):
+        """Move the old single notification file into the spool"""
+        if not self.legacy_file:
+            return
+        name = f"{time.time_ns():020d}.legacy.msg"
+        try:
+            os.rename(self.legacy_file, os.path.join(self.dirs['tmp'], name))
+        except FileNotFoundError:
+            return
+        os.rename(os.path.join(self.dirs['tmp'], name), os.path.join(self.dirs['new'], name))
+
+    def claim(self):
+        """Due retries plus the oldest new files, up to batch_size, renamed into cur/"""
+        now = time.monotonic()
+        batch = [name for name, (_, due) in self.retries.items() if due <= now][:self.batch_size]
+        for name in sorted(os.listdir(self.dirs['new']))[:self.batch_size - len(batch)]:
+            try:
+                os.rename(os.path.join(self.dirs['new'], name), os.path.join(self.dirs['cur'], name))
+            except FileNotFoundError:  # removed since the listing
+                continue
+            batch.append(name)
+        return batch
+
+    def _deliver(self, name):
+        """True sent, False failed, None empty, or why the file can't be read"""
+        try:
+            with open(os.path.join(self.dirs['cur'], name), encoding='utf-8') as f:
+                message = f.read().strip()
+        except (OSError, ValueError) as e:  # UnicodeDecodeError is a ValueError
+            return f'unreadable: {e}'
+        if not message:
+            return None
+        try:
+            return bool(self.send(message))
+        except Exception as e:
+            print(f"💥 Notification error: {e}")
+            return False
+
+    def process(self, batch):
+        """Send a claimed batch concurrently and settle every file"""
+        for name, ok in zip(batch, self._pool.map(self._deliver, batch)):
+            path = os.path.join(self.dirs['cur'], name)
+            if isinstance(ok, str):
+                self.retries.pop(name, None)
+                self.dead_letter(name, ok)
+            elif ok is None:
+                self.counters['empty'] += 1
+                os.remove(path)
+                self.retries.pop(name, None)
+            elif ok:
+                self.counters['sent'] += 1
+                os.remove(path)
+                self.retries.pop(name, None)
+            else:
+                self.counters['failed_attempts'] += 1
+                self.fail(name)
+
+    def fail(self, name):
+        attempts = self.retries.get(name, (0, 0))[0] + 1
+        if attempts >= self.max_attempts:
+            self.retries.pop(name, None)
+            self.dead_letter(name, f'gave up after {attempts} attempts')
+            return
+        self.counters['retried'] += 1
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+        self.retries[name] = (attempts, time.monotonic() + delay)
+
+    def dead_letter(self, name, reason):
+        """Move a file from cur/ to dead/ next to a .error note"""
+        self.counters['dead'] += 1
+        os.rename(os.path.join(self.dirs['cur'], name), os.path.join(self.dirs['dead'], name))
+        with open(os.path.join(self.dirs['dead'], name + '.error'), 'w') as f:
+            f.write(f"{datetime.now().isoformat()} {reason}\n")
+        print(f"☠️  Notification dead-lettered ({reason}): {name}")
+
+    def wait(self):
+        """Sleep until a file arrives, a retry is due, or the poll interval passes"""
+        timeout = self.poll_interval if self._watch is None or self.legacy_file else STATS_INTERVAL_SECONDS
+        if self.retries:
+            timeout = min(timeout, max(0, min(due for _, due in self.retries.values()) - time.monotonic()))
+        if self._watch is None:
+            time.sleep(timeout)
+            return
+        if select.select([self._watch], [], [], timeout)[0]:
+            try:
+                while os.read(self._watch, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started
+        return dict(self.counters, queued=len(os.listdir(self.dirs['new'])), retrying=len(self.retries),
+                    sent_per_second=round(self.counters['sent'] / elapsed, 1) if elapsed else 0.0,
+                    inotify=self._watch is not None, updated_at=datetime.now().isoformat())
+
+    def write_stats(self):
+        """stats.json in the spool directory, replaced atomically"""
+        tmp_path = os.path.join(self.dirs['tmp'], 'stats.json')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.stats(), f)
+        os.replace(tmp_path, self.stats_path)
+
+    def run(self, until_empty=False):
+        """Send until interrupted, or with until_empty=True until nothing is queued or retrying"""
+        self.acquire()
+        self.recover()
+        next_stats = time.monotonic() + STATS_INTERVAL_SECONDS
+        try:
+            while True:
+                self.import_legacy()
+                batch = self.claim()
+                if batch:
+                    self.process(batch)
+                elif until_empty and not self.retries:
+                    break
+                else:
+                    self.wait()
+                if time.monotonic() >= next_stats:
+                    self.write_stats()
+                    next_stats = time.monotonic() + STATS_INTERVAL_SECONDS
+        finally:
+            self.write_stats()
+
+    def close(self):
+        self._pool.shutdown()
+        if self._watch is not None:
+            os.close(self._watch)
+            self._watch = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
 def monitor_notifications():
-    """Monitor for notification requests"""
-    notification_file = '/tmp/ai_tracker_notification.txt'
-    last_modified = 0
-    
+    """Send spooled notifications until interrupted"""
+    sender = SpoolSender(SPOOL_DIR, send_telegram_notification, legacy_file=LEGACY_NOTIFICATION_FILE)
+
     print("🔍 Starting AI Tracker notification monitor...")
-    
-    while True:
+    print(f"📂 Spool: {SPOOL_DIR} ({SPOOL_WORKERS} senders, "
+          f"{'inotify' if sender.stats()['inotify'] else f'polling every {SPOOL_POLL_SECONDS}s'})")
+
+    try:
+        sender.run()
+    except SpoolBusy as e:
+        print(f"❌ Not starting: {e}")
+        return 1
+    except KeyboardInterrupt:
+        print(f"\n👋 Notification monitor stopped: {sender.stats()}")
+    finally:
+        sender.close()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command')
+    send = sub.add_parser('send', help='queue one message')
+    send.add_argument('message')
+    sub.add_parser('stats', help='counters written by the running sender')
+    args = parser.parse_args()
+
+    if args.command == 'send':
+        print(f"📨 Queued {spool_message(args.message)}")
+    elif args.command == 'stats':
         try:
-            if os.path.exists(notification_file):
-                current_modified = os.path.getmtime(notification_file)
-                
-                if current_modified > last_modified:
-                    # Read and send notification
-                    with open(notification_file, 'r') as f:
-                        message = f.read().strip()
-                    
-                    if message:
-                        success = send_telegram_notification(message)
-                        if success:
-                            # Clear the notification file
-                            os.remove(notification_file)
-                    
-                    last_modified = current_modified
-            
-            time.sleep(2)  # Check every 2 seconds
-            
-        except KeyboardInterrupt:
-            print("\n👋 Notification monitor stopped")
-            break
-        except Exception as e:
-            print(f"❌ Monitor error: {e}")
-            time.sleep(5)
+            with open(os.path.join(SPOOL_DIR, 'stats.json')) as f:
+                print(json.dumps(json.load(f), indent=2))
+        except FileNotFoundError:
+            print("No stats yet; is the notification service running?")
+            return 1
+    else:
+        return monitor_notifications()
+    return 0
 
 if __name__ == '__main__':
-    monitor_notifications()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+AI Activity Tracker - Built-in Queries
+Read queries used by the API, kept in one place so `python manage.py explain`
+can check every one of them against the current indexes.
+"""
+
+from dispatch_queue import ACTIVE_JOB_FOR_ACTIVITY, CLAIM_NEXT, EXPIRE_OVERDUE
+from session_registry import OPEN_SESSION_FOR_ACTIVITY, SESSION_BY_KEY
+
+ACTIVITY_BY_ID = 'SELECT * FROM activities WHERE id = ?'
+
+ACTIVITY_COMPLETION = 'SELECT status, completed_at FROM activities WHERE id = ?'
+
+BOARD = 'SELECT * FROM activities ORDER BY status, position'
+
+# Active columns only; served by the partial idx_activities_open index
+BOARD_OPEN = "SELECT * FROM activities WHERE status != 'done' ORDER BY status, position"
+
+# Columns callers may request with ?fields=; keyset columns and version are always returned
+ACTIVITY_FIELDS = (
+    'id', 'title', 'description', 'ai_tool', 'project', 'status', 'position',
+    'time_spent', 'time_started', 'outcome', 'outcome_notes', 'failure_reason',
+    'iteration_count', 'calendar_event_id', 'created_at', 'updated_at', 'completed_at',
+    'version',
+)
+KEYSET_FIELDS = ('status', 'position', 'id')
+ALWAYS_FIELDS = KEYSET_FIELDS + ('version',)
+
+
+def _columns(fields):
+    if not fields:
+        return ', '.join(ACTIVITY_FIELDS)
+    return ', '.join(f for f in ACTIVITY_FIELDS if f in fields or f in ALWAYS_FIELDS)
+
+
+def activities_page(fields=None, statuses=None, open_only=False, project=None, ai_tool=None,
+                    created_from=None, created_to=None, updated_from=None, updated_to=None,
+                    after=None, limit=200):
+    """Build a keyset-paginated board query in (status, position, id) order.
+
+    `after` is the (status, position, id) of the last row of the previous page.
+    Date bounds are inclusive `from`, exclusive `to`. Returns (sql, params).
+    """
+    columns = _columns(fields)
+    where, params = [], []
+    if open_only:
+        where.append("status != 'done'")
+    if statuses:
+        where.append(f"status IN ({','.join('?' * len(statuses))})")
+        params.extend(statuses)
+    for column, value in (('project', project), ('ai_tool', ai_tool)):
+        if value is not None:
+            where.append(f'{column} = ?')
+            params.append(value)
+    for column, op, value in (('created_at', '>=', created_from), ('created_at', '<', created_to),
+                              ('updated_at', '>=', updated_from), ('updated_at', '<', updated_to)):
+        if value is not None:
+            where.append(f'{column} {op} ?')
+            params.append(value)
+
+    def branch(extra, extra_params):
+        clauses = where + extra
+        sql = f"SELECT {columns} FROM activities"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        return sql + ' ORDER BY status, position, id LIMIT ?', params + extra_params + [limit]
+
+    if after is None:
+        sql, branch_params = branch([], [])
+        return sql, tuple(branch_params)
+
+    # (status, position, id) > (?, ?, ?) as three disjoint ranges. SQLite seeks a
+    # row-value comparison on (status, position) only and then walks every row
+    # sharing that prefix; each branch below is a tight index seek instead.
+    status, position, last_id = after
+    branches = [
+        branch(['status = ?', 'position = ?', 'id > ?'], [status, position, last_id]),
+        branch(['status = ?', 'position > ?'], [status, position]),
+    ]
+    if statuses:
+        # Jump straight to the remaining requested columns instead of walking the ones between
+        later = sorted(s for s in statuses if s > status)
+        if later:
+            branches.append(branch([f"status IN ({','.join('?' * len(later))})"], later))
+    else:
+        branches.append(branch(['status > ?'], [status]))
+    sql = (f"SELECT * FROM ({' UNION ALL '.join(f'SELECT * FROM ({b})' for b, _ in branches)}) "
+           "ORDER BY status, position, id LIMIT ?")
+    return sql, tuple(p for _, branch_params in branches for p in branch_params) + (limit,)
+
+
+# Neighbours of a card slot within one board column, for gap-based moves.
+# Params: (status, moving id, position, id of the card the slot is next to)
+COLUMN_NEXT = '''
+    SELECT id, position FROM activities
+    WHERE status = ? AND id != ? AND (position, id) > (?, ?)
+    ORDER BY position, id LIMIT 1
+'''
+
+COLUMN_PREVIOUS = '''
+    SELECT id, position FROM activities
+    WHERE status = ? AND id != ? AND (position, id) < (?, ?)
+    ORDER BY position DESC, id DESC LIMIT 1
+'''
+
+# Params: (status, moving id)
+COLUMN_LAST = '''
+    SELECT id, position FROM activities
+    WHERE status = ? AND id != ?
+    ORDER BY position DESC, id DESC LIMIT 1
+'''
+
+ACTIVITY_SLOT = 'SELECT id, status, position FROM activities WHERE id = ?'
+
+# Params: (JSON array of ids)
+ACTIVITIES_BY_IDS = 'SELECT * FROM activities WHERE id IN (SELECT value FROM json_each(?))'
+
+
+SYNC_VERSION = 'SELECT version FROM sync_state WHERE id = 1'
+
+
+def activity_changes(fields=None):
+    """Rows written after a version, oldest change first. Params: (since, limit)"""
+    return f'SELECT {_columns(fields)} FROM activities WHERE version > ? ORDER BY version LIMIT ?'
+
+
+TOMBSTONES_BETWEEN = 'SELECT id, version FROM activity_tombstones WHERE version > ? AND version <= ? ORDER BY version'
+
+
+# Dashboard and report aggregates read activity_rollup (see rollups.py), so
+# they cost O(days x groups) rather than O(activities). Param: first day
+# (YYYY-MM-DD, '' for all time).
+DASHBOARD_OVERVIEW = '''
+    SELECT COALESCE(SUM(activities), 0) as total,
+           COALESCE(SUM(completed), 0) as completed,
+           COALESCE(SUM(time_spent), 0) as total_time
+    FROM activity_rollup
+    WHERE dimension = 'all' AND day >= ?
+'''
+
+DASHBOARD_OUTCOMES = '''
+    SELECT value as outcome, SUM(activities) as count
+    FROM activity_rollup
+    WHERE dimension = 'outcome' AND day >= ? AND value != ''
+    GROUP BY value
+'''
+
+DASHBOARD_TOOL_STATS = '''
+    SELECT value as ai_tool, SUM(activities) as total,
+           SUM(successes) as successes,
+           SUM(partials) as partials,
+           SUM(failures) as failures,
+           SUM(time_spent) as total_time,
+           SUM(time_spent) * 1.0 / NULLIF(SUM(timed), 0) as avg_time,
+           SUM(iterations) * 1.0 / NULLIF(SUM(iterated), 0) as avg_iterations
+    FROM activity_rollup
+    WHERE dimension = 'ai_tool' AND day >= ? AND value != ''
+    GROUP BY value
+'''
+
+DASHBOARD_FAILURE_REASONS = '''
+    SELECT value as failure_reason, SUM(activities) as count
+    FROM activity_rollup
+    WHERE dimension = 'failure_reason' AND day >= ? AND value != ''
+    GROUP BY value
+    ORDER BY count DESC
+'''
+
+DASHBOARD_PROJECT_STATS = '''
+    SELECT value as project, SUM(activities) as total,
+           SUM(completed) as completed,
+           SUM(time_spent) as total_time
+    FROM activity_rollup
+    WHERE dimension = 'project' AND day >= ? AND value != ''
+    GROUP BY value
+'''
+
+# Tracked time from time_buckets (see timeseries.py).
+# Params: (size, dimension, first bucket, end bucket exclusive)
+TIMESERIES_BUCKETS = '''
+    SELECT bucket, value, seconds
+    FROM time_buckets
+    WHERE size = ? AND dimension = ? AND bucket >= ? AND bucket < ?
+'''
+
+# Daily buckets summed into weeks starting on Monday. Params: (dimension, first day, end day exclusive)
+TIMESERIES_WEEKS = '''
+    SELECT date(bucket, 'weekday 0', '-6 days') as bucket, value, SUM(seconds) as seconds
+    FROM time_buckets
+    WHERE size = 'day' AND dimension = ? AND bucket >= ? AND bucket < ?
+    GROUP BY 1, 2
+'''
+
+SEARCH_FIELDS = ('id', 'title', 'ai_tool', 'project', 'status', 'outcome', 'created_at', 'updated_at')
+SEARCH_FACETS = ('status', 'ai_tool', 'project')
+
+
+def _search_filters(statuses=None, ai_tool=None, project=None):
+    where, params = [], []
+    if statuses:
+        where.append(f"a.status IN ({','.join('?' * len(statuses))})")
+        params.extend(statuses)
+    for column, value in (('ai_tool', ai_tool), ('project', project)):
+        if value is not None:
+            where.append(f'a.{column} = ?')
+            params.append(value)
+    return ''.join(f' AND {w}' for w in where), params
+
+
+# Matches counted up to a cap. Params: (match, cap)
+SEARCH_MATCH_COUNT = '''
+    SELECT COUNT(*) FROM (SELECT rowid FROM activities_fts WHERE activities_fts MATCH ? LIMIT ?)
+'''
+
+
+def search_results(match, statuses=None, ai_tool=None, project=None, limit=20, offset=0, order='rank'):
+    """One page of full-text matches with highlighted title and snippets.
+
+    `match` is an FTS5 expression (see search.match_expression). order='rank'
+    sorts by bm25, which scores every match; order='recent' walks the index
+    newest first and stops at the page, and never computes bm25 (its corpus
+    statistics alone cost a pass over the term's postings). Returns (sql, params).
+    """
+    filters, params = _search_filters(statuses, ai_tool, project)
+    marks = "char(57344), char(57345)"  # search.MARK_OPEN / MARK_CLOSE
+    sql = f'''
+        SELECT {', '.join('a.' + f for f in SEARCH_FIELDS)},
+               highlight(activities_fts, 0, {marks}) as title_marked,
+               snippet(activities_fts, 1, {marks}, '…', 16) as description_marked,
+               snippet(activities_fts, 2, {marks}, '…', 16) as outcome_notes_marked,
+               {'rank' if order == 'rank' else 'NULL as rank'}
+        FROM activities_fts JOIN activities a ON a.id = activities_fts.rowid
+        WHERE activities_fts MATCH ?{filters}
+        ORDER BY {'rank' if order == 'rank' else 'activities_fts.rowid DESC'} LIMIT ? OFFSET ?
+    '''
+    return sql, (match, *params, limit, offset)
+
+
+def search_facets(match, statuses=None, ai_tool=None, project=None, sample=None):
+    """Match counts per (status, ai_tool, project) combination under the same filters.
+
+    One pass over the matches, or over only the newest `sample` of them; the
+    caller folds the combinations into one count list per facet.
+    Returns (sql, params).
+    """
+    filters, params = _search_filters(statuses, ai_tool, project)
+    columns = ', '.join('a.' + f for f in SEARCH_FACETS)
+    if sample is None:
+        sql = f'''
+            SELECT {columns}, COUNT(*) as count
+            FROM activities_fts JOIN activities a ON a.id = activities_fts.rowid
+            WHERE activities_fts MATCH ?{filters}
+            GROUP BY {columns}
+        '''
+        return sql, (match, *params)
+    sql = f'''
+        SELECT {columns}, COUNT(*) as count
+        FROM (SELECT rowid as id FROM activities_fts WHERE activities_fts MATCH ?
+              ORDER BY rowid DESC LIMIT ?) as matched
+        JOIN activities a ON a.id = matched.id
+        WHERE 1{filters}
+        GROUP BY {columns}
+    '''
+    return sql, (match, sample, *params)
+
+
+EXPORT_COLUMNS = (
+    'id', 'title', 'description', 'ai_tool', 'project', 'status', 'time_spent',
+    'outcome', 'outcome_notes', 'failure_reason', 'iteration_count',
+    'created_at', 'completed_at',
+)
+
+
+def export_rows(project=None, ai_tool=None, created_from=None, created_to=None,
+                columns=EXPORT_COLUMNS):
+    """Rows for the CSV / NDJSON exports, newest first. Returns (sql, params)"""
+    where, params = [], []
+    for column, op, value in (('project', '=', project), ('ai_tool', '=', ai_tool),
+                              ('created_at', '>=', created_from), ('created_at', '<', created_to)):
+        if value is not None:
+            where.append(f'{column} {op} ?')
+            params.append(value)
+    sql = f"SELECT {', '.join(columns)} FROM activities"
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    return sql + ' ORDER BY created_at DESC', tuple(params)
+
+
+REPORT_OVERVIEW = '''
+    SELECT COALESCE(SUM(activities), 0) as total,
+           COALESCE(SUM(completed), 0) as completed,
+           SUM(time_spent) as total_time,
+           SUM(done_time_spent) * 1.0 / NULLIF(SUM(done_timed), 0) as avg_time
+    FROM activity_rollup
+    WHERE dimension = 'all'
+'''
+
+REPORT_TOOL_STATS = '''
+    SELECT value as ai_tool, SUM(activities) as total,
+           SUM(successes) as successes,
+           ROUND(SUM(successes) * 100.0 / NULLIF(SUM(rated), 0), 1) as success_rate,
+           SUM(time_spent) as total_time
+    FROM activity_rollup
+    WHERE dimension = 'ai_tool' AND value != ''
+    GROUP BY value
+'''
+
+# Calendar feed over a created_at range: [from, to). The stamp query is served
+# entirely from idx_activities_calendar and drives ETag / Last-Modified.
+CALENDAR_STAMP = '''
+    SELECT COUNT(*) as events, MAX(version) as version, MAX(updated_at) as updated_at
+    FROM activities
+    WHERE created_at >= ? AND created_at < ?
+'''
+
+CALENDAR_RANGE = '''
+    SELECT id, version, title, ai_tool, project, outcome, iteration_count, time_spent, created_at
+    FROM activities
+    WHERE created_at >= ? AND created_at < ?
+    ORDER BY created_at DESC
+'''
+
+# Spawn history for one activity, newest first
+ACTIVITY_SESSIONS = '''
+    SELECT id, label, session_key, status, spawned_at, finished_at, updated_at
+    FROM clawdbot_sessions
+    WHERE activity_id = ?
+    ORDER BY id DESC
+    LIMIT ?
+'''
+
+# Shared runtime settings (settings.py)
+SETTING = 'SELECT value, updated_at FROM settings WHERE name = ?'
+
+# name -> (sql, sample parameters used for EXPLAIN QUERY PLAN)
+BUILTIN_QUERIES = {
+    'activity_by_id': (ACTIVITY_BY_ID, (1,)),
+    'activity_completion': (ACTIVITY_COMPLETION, (1,)),
+    'board': (BOARD, ()),
+    'board_open': (BOARD_OPEN, ()),
+    'board_page': activities_page(after=('todo', 0, 1)),
+    'board_page_open': activities_page(open_only=True, after=('in-progress', 0, 1)),
+    'board_page_project': activities_page(project='General', after=('todo', 0, 1)),
+    'column_next': (COLUMN_NEXT, ('todo', 1, 1024, 2)),
+    'column_previous': (COLUMN_PREVIOUS, ('todo', 1, 1024, 2)),
+    'column_last': (COLUMN_LAST, ('todo', 1)),
+    'activity_slot': (ACTIVITY_SLOT, (1,)),
+    'activities_by_ids': (ACTIVITIES_BY_IDS, ('[1, 2]',)),
+    'sync_version': (SYNC_VERSION, ()),
+    'activity_changes': (activity_changes(), (100, 500)),
+    'tombstones_between': (TOMBSTONES_BETWEEN, (100, 200)),
+    'dashboard_overview': (DASHBOARD_OVERVIEW, ('2026-01-01',)),
+    'dashboard_outcomes': (DASHBOARD_OUTCOMES, ('2026-01-01',)),
+    'dashboard_tool_stats': (DASHBOARD_TOOL_STATS, ('2026-01-01',)),
+    'dashboard_failure_reasons': (DASHBOARD_FAILURE_REASONS, ('2026-01-01',)),
+    'dashboard_project_stats': (DASHBOARD_PROJECT_STATS, ('2026-01-01',)),
+    'timeseries_days': (TIMESERIES_BUCKETS, ('day', 'ai_tool', '2026-01-01', '2026-02-01')),
+    'timeseries_hours': (TIMESERIES_BUCKETS, ('hour', 'all', '2026-01-01 00:00', '2026-01-02 00:00')),
+    'timeseries_weeks': (TIMESERIES_WEEKS, ('project', '2026-01-05', '2026-03-02')),
+    'search': search_results('"deploy"*'),
+    'search_filtered': search_results('"deploy"*', statuses=['done'], ai_tool='Claude'),
+    'search_recent': search_results('"deploy"*', ai_tool='Claude', order='recent'),
+    'search_count': (SEARCH_MATCH_COUNT, ('"deploy"*', 2001)),
+    'search_facets': search_facets('"deploy"*', project='General'),
+    'search_facets_sample': search_facets('"deploy"*', sample=2000),
+    'export_csv': export_rows(),
+    'export_csv_range': export_rows(created_from='2026-01-01', created_to='2026-02-01'),
+    'export_csv_project': export_rows(project='General'),
+    'export_ndjson': export_rows(columns=ACTIVITY_FIELDS),
+    'report_overview': (REPORT_OVERVIEW, ()),
+    'report_tool_stats': (REPORT_TOOL_STATS, ()),
+    'calendar_stamp': (CALENDAR_STAMP, ('2026-01-01', '2026-02-01')),
+    'calendar_range': (CALENDAR_RANGE, ('2026-01-01', '2026-02-01')),
+    'dispatch_active_job': (ACTIVE_JOB_FOR_ACTIVITY, (1, 'queued', 'running')),
+    'dispatch_claim_next': (CLAIM_NEXT, ('2026-01-01T00:00:00', '2026-01-01 00:00:00', 5)),
+    'dispatch_expire_overdue': (EXPIRE_OVERDUE, ('2026-01-01T00:00:00',)),
+    'activity_sessions': (ACTIVITY_SESSIONS, (1, 10)),
+    'session_open': (OPEN_SESSION_FOR_ACTIVITY, (1,)),
+    'session_by_key': (SESSION_BY_KEY, ('agent:main:subagent:1',)),
+    'setting': (SETTING, ('notifications_enabled',)),
+}
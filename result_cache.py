@@ -0,0 +1,121 @@
+"""
+AI Activity Tracker - Result Cache
+In-process LRU caches. ResultCache holds read-only endpoint results tagged
+with the data generation they were computed at; bump() after any write makes
+every older entry a miss, so nothing needs to be tracked per key.
+VersionedCache holds per-row renderings tagged with the row's version.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Byte-capped LRU of (generation, value) entries.
+
+    get() only returns values computed at the current generation and younger
+    than `ttl` seconds. Callers read `generation` before computing a value and
+    store it with that generation, so a write that lands mid-computation
+    leaves the result already stale.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, ttl=300):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.generation = 0
+        self._entries = OrderedDict()  # key -> (generation, stored_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def bump(self):
+        """Invalidate everything cached so far"""
+        with self._lock:
+            self.generation += 1
+            self.counters['invalidations'] += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+            generation, stored_at, size, value = entry
+            if generation != self.generation or time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._bytes -= size
+                self.counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return value
+
+    def put(self, key, generation, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return  # a write landed while the value was computed
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (generation, time.monotonic(), size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[2]
+                self.counters['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['misses']
+            return dict(
+                self.counters,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                generation=self.generation,
+                hit_rate=round(self.counters['hits'] / lookups, 3) if lookups else 0,
+            )
+
+
+class VersionedCache:
+    """LRU of per-row values tagged with the row version they were built from.
+
+    A lookup with a different version is a miss, so every write to the row
+    (which bumps its version) invalidates its entry.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (version, value)
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return entry[1]
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, entries=len(self._entries), max_entries=self.max_entries)
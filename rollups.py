@@ -0,0 +1,80 @@
+"""
+AI Activity Tracker - Analytics Rollups
+activity_rollup holds per-day counts and sums for each dashboard dimension
+(ai_tool, project, outcome, failure_reason, plus an 'all' total), so the
+dashboard aggregates a few hundred groups instead of every activity.
+Triggers from migration 5 keep it current in the same transaction as each
+write; rebuild() recomputes it from scratch for repair.
+"""
+
+# dimension -> SQL for its value in an activities row. NULL and '' share a
+# group: the dashboard ignores both.
+DIMENSIONS = {
+    'all': lambda row: "''",
+    'ai_tool': lambda row: f"COALESCE({row}.ai_tool, '')",
+    'project': lambda row: f"COALESCE({row}.project, '')",
+    'outcome': lambda row: f"COALESCE({row}.outcome, '')",
+    'failure_reason': lambda row: f"COALESCE({row}.failure_reason, '')",
+}
+
+# measure -> SQL for one row's contribution
+MEASURES = {
+    'activities': lambda row: '1',
+    'completed': lambda row: f"({row}.status IS 'done')",
+    'successes': lambda row: f"({row}.outcome IS 'success')",
+    'partials': lambda row: f"({row}.outcome IS 'partial')",
+    'failures': lambda row: f"({row}.outcome IS 'failed')",
+    'rated': lambda row: f"(COALESCE({row}.outcome, '') != '')",
+    'timed': lambda row: f'({row}.time_spent IS NOT NULL)',
+    'time_spent': lambda row: f'COALESCE({row}.time_spent, 0)',
+    'done_timed': lambda row: f"({row}.status IS 'done' AND {row}.time_spent IS NOT NULL)",
+    'done_time_spent': lambda row: f"(CASE WHEN {row}.status IS 'done' THEN COALESCE({row}.time_spent, 0) ELSE 0 END)",
+    'iterated': lambda row: f'({row}.iteration_count IS NOT NULL)',
+    'iterations': lambda row: f'COALESCE({row}.iteration_count, 0)',
+}
+
+KEY_COLUMNS = ('dimension', 'day', 'value')
+COLUMNS = KEY_COLUMNS + tuple(MEASURES)
+
+
+def day_value(row):
+    return f"COALESCE(date({row}.created_at), '')"
+
+
+def row_values(dimension, row):
+    """SQL expressions for every column of `row`'s contribution to one dimension"""
+    return ((f"'{dimension}'", day_value(row), DIMENSIONS[dimension](row))
+            + tuple(measure(row) for measure in MEASURES.values()))
+
+
+AGGREGATE = ' UNION ALL '.join(
+    f"SELECT '{dimension}', {day_value('a')}, {value('a')}, "
+    + ', '.join(f'SUM({measure("a")})' for measure in MEASURES.values())
+    + ' FROM activities a GROUP BY 2, 3'
+    for dimension, value in DIMENSIONS.items()
+)
+
+REBUILD = f'INSERT INTO activity_rollup ({", ".join(COLUMNS)}) {AGGREGATE}'
+
+DRIFT = f'''
+    SELECT COUNT(*) FROM (
+        SELECT * FROM (SELECT {", ".join(COLUMNS)} FROM activity_rollup EXCEPT SELECT * FROM ({AGGREGATE}))
+        UNION ALL
+        SELECT * FROM (SELECT * FROM ({AGGREGATE}) EXCEPT SELECT {", ".join(COLUMNS)} FROM activity_rollup)
+    )
+'''
+
+
+def rebuild(conn):
+    """Recompute activity_rollup from activities inside the caller's transaction.
+
+    Returns the number of groups written.
+    """
+    conn.execute('DELETE FROM activity_rollup')
+    conn.execute(REBUILD)
+    return conn.execute('SELECT COUNT(*) FROM activity_rollup').fetchone()[0]
+
+
+def drift(conn):
+    """Number of rollup groups that disagree with a fresh aggregate (0 when healthy)"""
+    return conn.execute(DRIFT).fetchone()[0]
@@ -0,0 +1,67 @@
+"""
+AI Activity Tracker - Full-Text Search
+activities_fts is an FTS5 index over title, description and outcome_notes.
+It is external-content (the text lives only in activities), and the triggers
+from migration 9 keep it in step with every write. Free text from the search
+box is turned into a MATCH expression that can't fail to parse. Highlights
+come back with private-use marker characters, which render_marked() turns
+into escaped HTML.
+"""
+
+import html
+import re
+
+COLUMNS = ('title', 'description', 'outcome_notes')
+
+# bm25 weights per column, in COLUMNS order: a title hit outranks a notes hit,
+# which outranks a description hit
+RANK = 'bm25(10.0, 2.0, 4.0)'
+
+# Unicode private-use characters, which activity text has no reason to contain
+MARK_OPEN, MARK_CLOSE = '\ue000', '\ue001'
+
+TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def match_expression(text, prefix=False):
+    """Search-box text -> FTS5 query in which every word must match.
+
+    With prefix=True the last word also matches longer words, for a word
+    that is still being typed. A prefix query merges the posting lists of
+    every word it expands to, so it is only used when whole words find
+    too little. Returns None when the text has no searchable words.
+    """
+    words = TOKEN.findall(text or '')
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if prefix:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def render_marked(text):
+    """Escape FTS output for HTML and turn the markers into <mark> tags"""
+    if text is None:
+        return None
+    return html.escape(text).replace(MARK_OPEN, '<mark>').replace(MARK_CLOSE, '</mark>')
+
+
+def rebuild(conn):
+    """Re-index every activity inside the caller's transaction; returns the row count"""
+    conn.execute("INSERT INTO activities_fts(activities_fts) VALUES ('rebuild')")
+    return conn.execute('SELECT COUNT(*) FROM activities').fetchone()[0]
+
+
+def check(conn):
+    """Compare the index with the activities table; returns an error message or None"""
+    try:
+        conn.execute("INSERT INTO activities_fts(activities_fts, rank) VALUES ('integrity-check', 1)")
+    except Exception as e:  # sqlite3.DatabaseError: database disk image is malformed
+        return str(e)
+    return None
+
+
+def optimize(conn):
+    """Merge the index b-trees into one; worth running after a large import"""
+    conn.execute("INSERT INTO activities_fts(activities_fts) VALUES ('optimize')")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+AI Activity Tracker - Production Server
+Serves the app with gunicorn: several worker processes, each with a pool of
+request threads, behind one port. The app is imported and the schema
+migrated once in the master, then forked, so workers start without
+re-importing anything. Each worker starts its dispatch workers and change
+watchers after the fork; one of them, elected with a lock file (leader.py),
+also runs the Clawdbot prober, the session registry and notification
+delivery, and the others relay to it through the database. On SIGTERM a
+worker ends its event streams and, while in-flight requests finish, lets
+running dispatches complete and sends pending notifications before it
+exits. Settings changed at runtime are shared through the database.
+
+    python serve.py                                  # 127.0.0.1:8080, AI_TRACKER_WORKERS x AI_TRACKER_THREADS
+    python serve.py --bind 0.0.0.0:8080 --workers 4 --threads 16
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+
+from gunicorn.app.base import BaseApplication
+
+WORKERS = int(os.environ.get('AI_TRACKER_WORKERS', str(min(os.cpu_count() or 1, 4))))
+THREADS = int(os.environ.get('AI_TRACKER_THREADS', '16'))  # per worker; each open /api/events stream holds one
+
+
+class TrackerServer(BaseApplication):
+    """gunicorn application with the tracker's lifecycle hooks"""
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for name, value in self.options.items():
+            self.cfg.set(name, value)
+
+    def load(self):
+        # Runs once in the master (preload_app): import, migrate, then drop the
+        # pooled connections, which must not be shared with forked workers
+        import app as tracker
+        tracker.init_db()
+        tracker.db_pool.close_all()
+        print(f"✅ Database initialized ({tracker.DATABASE})")
+        return tracker.app
+
+
+def post_worker_init(worker):
+    import app as tracker
+    tracker.start_background_services()
+    worker.shutdown_deadline = None
+    worker.drain_thread = None
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def on_term(sig, frame):
+        # gunicorn only runs worker_exit once its connections have closed, which
+        # idle keep-alive clients can stretch to the whole graceful timeout, so
+        # the drain starts now and runs alongside the last requests. Event
+        # streams never end on their own and are closed here too.
+        if worker.drain_thread is None:
+            worker.shutdown_deadline = time.monotonic() + worker.cfg.graceful_timeout - 1
+            tracker.begin_shutdown()
+            worker.drain_thread = threading.Thread(
+                target=tracker.stop_background_services, kwargs={'timeout': worker.cfg.graceful_timeout - 1},
+                name='shutdown-drain')
+            worker.drain_thread.start()
+        handle_exit(sig, frame)
+
+    signal.signal(signal.SIGTERM, on_term)
+    role = ', runs Clawdbot and notification services' if tracker.service_leader.is_leader() else ''
+    print(f"🧵 Worker {worker.pid} ready ({worker.cfg.threads} threads, {tracker.DISPATCH_WORKERS} dispatch workers{role})")
+
+
+def worker_exit(server, worker):
+    import app as tracker
+    deadline = getattr(worker, 'shutdown_deadline', None) or time.monotonic() + worker.cfg.graceful_timeout - 1
+    if getattr(worker, 'drain_thread', None):
+        worker.drain_thread.join(max(0.0, deadline - time.monotonic()))
+    # Drains here if SIGTERM didn't start it (e.g. gunicorn restarting the worker); a no-op otherwise
+    tracker.stop_background_services(timeout=max(1.0, deadline - time.monotonic()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bind', default=f"127.0.0.1:{os.environ.get('AI_TRACKER_PORT', '8080')}")
+    parser.add_argument('--workers', type=int, default=WORKERS, help='worker processes')
+    parser.add_argument('--threads', type=int, default=THREADS, help='request threads per worker')
+    parser.add_argument('--access-log', action='store_true', help='log every request to stdout')
+    args = parser.parse_args()
+
+    drain = int(float(os.environ.get('AI_TRACKER_DRAIN_SECONDS', '30')))
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'preload_app': True,
+        'graceful_timeout': drain,
+        'timeout': 60,  # a worker that stops heartbeating this long is restarted
+        'keepalive': 5,
+        'accesslog': '-' if args.access_log else None,
+        'post_worker_init': post_worker_init,
+        'worker_exit': worker_exit,
+        'proc_name': 'ai-tracker',
+    }
+    print(f"🚀 Starting AI Activity Tracker Pro on {args.bind}: {args.workers} workers x {args.threads} threads")
+    TrackerServer(options).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+AI Activity Tracker - Clawdbot Session Registry
+Dispatched tasks run in Clawdbot sessions labelled ai-tracker-<tool>-<id>.
+One background thread lists the sessions every refresh interval, parses the
+listing, and indexes the tracker's sessions by activity id, so requests read
+session state from memory instead of forking the CLI. Spawn and finish times
+are stored in the clawdbot_sessions table (created by migrations.py), which
+also keeps them across restarts and sessions that drop out of the listing.
+"""
+
+import json
+import re
+import threading
+from datetime import datetime, timedelta
+
+LABEL = re.compile(r'ai-tracker-(?P<tool>.+?)-(?P<activity_id>\d+)(?![\w-])')
+
+# Listing statuses after which a session does no more work
+FINISHED_STATUSES = {'done', 'completed', 'complete', 'finished', 'ended', 'failed', 'error', 'errored',
+                     'killed', 'aborted', 'cancelled', 'canceled', 'timeout', 'timed_out'}
+STATUS_WORDS = FINISHED_STATUSES | {'running', 'active', 'busy', 'working', 'idle', 'queued', 'pending'}
+
+# A listed session that started this long before an open spawn record belongs to an earlier run
+SPAWN_SLACK = timedelta(seconds=60)
+
+INSERT_SESSION = '''
+    INSERT INTO clawdbot_sessions (activity_id, label, session_key, status, spawned_at, finished_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+UPDATE_SESSION = '''
+    UPDATE clawdbot_sessions
+    SET session_key = COALESCE(?, session_key), status = ?,
+        finished_at = COALESCE(finished_at, ?), updated_at = ?
+    WHERE id = ?
+'''
+
+SESSION_BY_KEY = 'SELECT id FROM clawdbot_sessions WHERE session_key = ?'
+
+OPEN_SESSION_FOR_ACTIVITY = '''
+    SELECT id, session_key, spawned_at FROM clawdbot_sessions
+    WHERE activity_id = ? AND finished_at IS NULL
+    ORDER BY id DESC LIMIT 1
+'''
+
+
+def session_label(ai_tool, activity_id):
+    return f"ai-tracker-{ai_tool.lower() if ai_tool else 'auto'}-{activity_id}"
+
+
+def _timestamp(value):
+    """Listing timestamp (ISO string, epoch seconds or milliseconds) -> local ISO string"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value).isoformat()
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _first(entry, *keys):
+    for key in keys:
+        if entry.get(key) not in (None, ''):
+            return entry[key]
+    return None
+
+
+def parse_entry(entry):
+    """One session object from a JSON listing -> registry entry, or None if not ours"""
+    if not isinstance(entry, dict):
+        return None
+    label = str(_first(entry, 'label', 'name', 'displayName') or '')
+    match = LABEL.search(label)
+    if not match:
+        return None
+    status = str(_first(entry, 'status', 'state') or 'running').lower()
+    return {
+        'activity_id': int(match['activity_id']),
+        'label': match.group(0),
+        'key': _first(entry, 'key', 'sessionKey', 'id'),
+        'status': status,
+        'finished': status in FINISHED_STATUSES,
+        'started_at': _timestamp(_first(entry, 'startedAt', 'createdAt', 'started_at', 'created_at')),
+        'ended_at': _timestamp(_first(entry, 'endedAt', 'finishedAt', 'completedAt', 'ended_at')),
+    }
+
+
+def parse_line(line):
+    """One line of the plain-text listing -> registry entry, or None if not ours"""
+    match = LABEL.search(line)
+    if not match:
+        return None
+    words = re.findall(r'[a-z_]+', line.lower())
+    status = next((word for word in words if word in STATUS_WORDS), 'running')
+    return {
+        'activity_id': int(match['activity_id']),
+        'label': match.group(0),
+        'key': None,
+        'status': status,
+        'finished': status in FINISHED_STATUSES,
+        'started_at': None,
+        'ended_at': None,
+    }
+
+
+def parse_listing(listing):
+    """Session listing (decoded JSON, JSON text or plain text) -> tracker session entries"""
+    data = listing
+    if isinstance(listing, str):
+        try:
+            data = json.loads(listing)
+        except ValueError:
+            data = None
+    if data is None or isinstance(data, str):
+        entries = map(parse_line, (listing or '').splitlines())
+    else:
+        if isinstance(data, dict):
+            data = _first(data, 'sessions', 'items') or []
+        entries = map(parse_entry, data if isinstance(data, list) else [])
+    return [entry for entry in entries if entry]
+
+
+def record_spawn(conn, activity_id, label, spawned_at, session_key=None):
+    """Store a newly spawned session inside the caller's transaction"""
+    conn.execute(INSERT_SESSION, (activity_id, label, session_key, 'spawned', spawned_at, None, spawned_at))
+
+
+def record_finish(conn, activity_id, status, finished_at):
+    """Close the activity's open session (e.g. from the completion callback); returns True if one was open"""
+    row = conn.execute(OPEN_SESSION_FOR_ACTIVITY, (activity_id,)).fetchone()
+    if row:
+        conn.execute(UPDATE_SESSION, (None, status, finished_at, finished_at, row['id']))
+    return row is not None
+
+
+def record_listed(conn, entry, now):
+    """Store what the listing says about one session inside the caller's transaction.
+
+    A session is matched by its key, then to the activity's open spawn record
+    (unless it started before that spawn, e.g. a finished earlier run with the
+    same label); otherwise it was spawned elsewhere and gets its own record.
+    """
+    finished_at = (entry['ended_at'] or now) if entry['finished'] else None
+    row = conn.execute(SESSION_BY_KEY, (entry['key'],)).fetchone() if entry['key'] else None
+    if row is None:
+        open_row = conn.execute(OPEN_SESSION_FOR_ACTIVITY, (entry['activity_id'],)).fetchone()
+        earlier = entry['started_at'] and open_row and datetime.fromisoformat(entry['started_at']) < \
+            datetime.fromisoformat(str(open_row['spawned_at'])) - SPAWN_SLACK
+        if open_row and open_row['session_key'] is None and not earlier:
+            row = open_row
+    if row is None:
+        conn.execute(INSERT_SESSION, (entry['activity_id'], entry['label'], entry['key'], entry['status'],
+                                      entry['started_at'] or now, finished_at, now))
+    else:
+        conn.execute(UPDATE_SESSION, (entry['key'], entry['status'], finished_at, now, row['id']))
+
+
+class SessionRegistry:
+    """Lists Clawdbot sessions every `interval` seconds in a daemon thread.
+
+    `connect` is a context manager factory yielding a sqlite3 connection and
+    `transport` the clawdbot_transport used to list sessions. Listings are
+    skipped while `available()` returns False (Clawdbot down). Only sessions
+    whose status changed since the previous listing are written, and
+    `on_change(entries)` is called with them. `on_refresh(snapshot)` gets
+    snapshot() after every pass of the refresh thread.
+    """
+
+    def __init__(self, connect, transport, interval=10.0, limit=50, available=None, on_change=None,
+                 on_refresh=None):
+        self.connect = connect
+        self.transport = transport
+        self.limit = limit
+        self.interval = interval
+        self.available = available
+        self.on_change = on_change
+        self.on_refresh = on_refresh
+        self.counters = {'refreshes': 0, 'errors': 0, 'skipped': 0, 'changes': 0}
+        self._by_activity = {}
+        self._seen = {}
+        self._checked_at = None
+        self._error = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='session-registry', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poke(self):
+        """Refresh now, e.g. right after a spawn"""
+        self._wake.set()
+
+    def live(self, activity_id):
+        """The activity's session from the latest listing, or None"""
+        with self._lock:
+            return self._by_activity.get(activity_id)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checked_at': self._checked_at,
+                'error': self._error,
+                'sessions': sorted(self._by_activity.values(), key=lambda e: e['activity_id']),
+            }
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, tracked=len(self._by_activity), running=bool(self._thread))
+
+    def refresh(self):
+        """List, parse and index the sessions; returns the entries that changed"""
+        if self.available and not self.available():
+            with self._lock:
+                self.counters['skipped'] += 1
+            return []
+        try:
+            listing = self.transport.list_sessions(self.limit)
+            if not listing.ok:
+                raise RuntimeError(listing.error)
+            entries = parse_listing(listing.data)
+        except Exception as e:
+            with self._lock:
+                self.counters['errors'] += 1
+                self._error = str(e)
+            return []
+
+        by_activity = {}
+        for entry in entries:
+            # Retries reuse the label; the newest run represents the activity
+            current = by_activity.get(entry['activity_id'])
+            if current is None or (entry['started_at'] or '') > (current['started_at'] or ''):
+                by_activity[entry['activity_id']] = entry
+        with self._lock:
+            changed = [e for e in entries if self._seen.get(e['key'] or e['label']) != (e['status'], e['ended_at'])]
+        now = datetime.now().isoformat()
+        if changed:
+            with self.connect() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    for entry in changed:
+                        record_listed(conn, entry, now)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+        with self._lock:
+            self._seen = {e['key'] or e['label']: (e['status'], e['ended_at']) for e in entries}
+            self._by_activity = by_activity
+            self._checked_at = now
+            self._error = None
+            self.counters['refreshes'] += 1
+            self.counters['changes'] += len(changed)
+        if changed and self.on_change:
+            self.on_change(changed)
+        return changed
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                if self.on_refresh:
+                    self.on_refresh(self.snapshot())
+            except Exception as e:
+                print(f"❌ Session registry error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,72 @@
+"""
+AI Activity Tracker - Shared Settings
+Settings changed at runtime through the API (notifications on/off) live in
+the settings table rather than in module globals, so every worker process
+of a multi-worker server sees the same value. Each process caches a value
+for `ttl` seconds; a change made in one worker reaches the others within
+that time. Names without a row read as their default, which comes from the
+environment as before. The same table carries what the leader process (see
+leader.py) publishes for the other workers, such as its latest health check.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+
+import queries
+
+
+class Settings:
+    """Typed, cached access to the settings table.
+
+    `connect` is a context manager factory yielding a sqlite3 connection;
+    `defaults` maps every known setting name to its value when unset.
+    """
+
+    def __init__(self, connect, defaults, ttl=1.0):
+        self.connect = connect
+        self.defaults = dict(defaults)
+        self.ttl = ttl
+        self._cache = {}  # name -> (read_at, value)
+        self._lock = threading.Lock()
+        self.counters = {'reads': 0, 'hits': 0, 'writes': 0}
+
+    def get(self, name, fresh=False):
+        """Current value; `fresh` skips the cache, e.g. before a read-modify-write"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(name)
+            if not fresh and cached is not None and now - cached[0] < self.ttl:
+                self.counters['hits'] += 1
+                return cached[1]
+        default = self.defaults[name]
+        with self.connect() as conn:
+            row = conn.execute(queries.SETTING, (name,)).fetchone()
+        value = json.loads(row[0]) if row else default
+        with self._lock:
+            self.counters['reads'] += 1
+            self._cache[name] = (now, value)
+        return value
+
+    def set(self, name, value):
+        if name not in self.defaults:
+            raise KeyError(name)
+        with self.connect() as conn:
+            conn.execute(
+                '''INSERT INTO settings (name, value, updated_at) VALUES (?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at''',
+                (name, json.dumps(value), datetime.now().isoformat())
+            )
+            conn.commit()
+        with self._lock:
+            self.counters['writes'] += 1
+            self._cache[name] = (time.monotonic(), value)
+        return value
+
+    def all(self):
+        return {name: self.get(name) for name in self.defaults}
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, ttl=self.ttl)
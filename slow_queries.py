@@ -0,0 +1,183 @@
+"""
+AI Activity Tracker - Slow Query Log
+Statements slower than a threshold are logged with their parameters and row
+count, and aggregated by normalized SQL (literals and IN lists folded), so
+the same query with different ids is one entry. Each entry carries the
+statement's EXPLAIN QUERY PLAN, captured on its own connection when the
+query is first seen and again once it is older than `plan_ttl`; a plan that
+differs from the previous capture is flagged, which is how a dropped or
+unused index shows up.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import migrations
+from metrics import statement_kind
+
+# Statement types EXPLAIN QUERY PLAN says something useful about
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+
+def normalize_sql(sql):
+    """Whitespace collapsed, literals replaced by ?, IN lists of any length folded to (?, ...)"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = ' '.join(sql.split())
+    return _LIST.sub('(?, ...)', sql)
+
+
+def preview(params, limit=200):
+    text = repr(params)
+    return text if len(text) <= limit else text[:limit] + '…'
+
+
+def bindable(params):
+    """Parameters EXPLAIN can bind: the first set of an executemany, None if they're gone"""
+    if isinstance(params, dict):
+        return params
+    if isinstance(params, (list, tuple)):
+        if params and isinstance(params[0], (list, tuple, dict)):
+            return params[0]
+        return params
+    return None
+
+
+class SlowQueryLog:
+    """Aggregates statements slower than `threshold_ms`; threshold 0 turns it off"""
+
+    def __init__(self, path, threshold_ms=100, plan_ttl=300, max_entries=200, max_recent=50):
+        self.path = path
+        self.threshold = threshold_ms / 1000
+        self.plan_ttl = plan_ttl
+        self.max_entries = max_entries
+        self.max_recent = max_recent
+        self.counters = {'slow': 0, 'plans': 0, 'plan_changes': 0, 'plan_errors': 0, 'evictions': 0}
+        self._entries = OrderedDict()  # normalized sql -> entry dict, least recently slow first
+        self._recent = []  # (when, ms, rows, sql, params), newest last
+        self._lock = threading.Lock()
+
+    def record(self, sql, params, seconds, rows):
+        """SQL observer hook; cheap for statements under the threshold"""
+        if not self.threshold or seconds < self.threshold:
+            return
+        kind = statement_kind(sql)
+        key = normalize_sql(sql)
+        now = time.time()
+        with self._lock:
+            self.counters['slow'] += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    'sql': key, 'statement': kind, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'rows': 0, 'max_rows': 0, 'first_seen': now, 'slowest_sql': None,
+                    'slowest_params': None, 'plan': None, 'plan_at': 0, 'previous_plan': None,
+                }
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.counters['evictions'] += 1
+            else:
+                self._entries.move_to_end(key)
+            entry['count'] += 1
+            entry['total_ms'] += seconds * 1000
+            entry['rows'] += rows
+            entry['max_rows'] = max(entry['max_rows'], rows)
+            entry['last_seen'] = now
+            if seconds * 1000 >= entry['max_ms']:
+                entry['max_ms'] = seconds * 1000
+                entry['slowest_sql'] = ' '.join(sql.split())
+                entry['slowest_params'] = preview(params)
+            self._recent.append((now, seconds * 1000, rows, ' '.join(sql.split()), preview(params)))
+            del self._recent[:-self.max_recent]
+            refresh = kind in EXPLAINABLE and now - entry['plan_at'] >= self.plan_ttl
+            if refresh:
+                entry['plan_at'] = now  # claimed; concurrent slow runs don't explain it again
+
+        print(f"🐌 Slow query {seconds * 1000:.1f} ms, {rows} rows: {' '.join(sql.split())[:300]} "
+              f"params={preview(params)}")
+        if refresh:
+            self._capture_plan(entry, sql, params)
+
+    def _capture_plan(self, entry, sql, params):
+        bound = bindable(params)
+        failed = True
+        if bound is None:
+            plan = ['(parameters unavailable)']
+            self.counters['plan_errors'] += 1
+        else:
+            try:
+                # A fresh connection each time: EXPLAIN alone never reloads a cached schema,
+                # so a long-lived one would keep planning with dropped indexes
+                conn = sqlite3.connect(self.path)
+                try:
+                    plan = migrations.explain(conn, sql, bound)
+                finally:
+                    conn.close()
+                self.counters['plans'] += 1
+                failed = False
+            except sqlite3.Error as e:
+                # e.g. a table created in a transaction that hasn't committed yet
+                plan = [f'(EXPLAIN failed: {e})']
+                self.counters['plan_errors'] += 1
+        with self._lock:
+            previous = entry['plan']
+            known = previous is not None and not previous[0].startswith('(')
+            changed = False
+            if failed:
+                entry['plan_at'] = 0  # try again on the next slow run
+                if previous is None:
+                    entry['plan'] = plan
+            else:
+                changed = known and previous != plan
+                if changed:
+                    entry['previous_plan'] = previous
+                    self.counters['plan_changes'] += 1
+                    print(f"⚠️  Query plan changed for: {entry['sql'][:200]}")
+                entry['plan'] = plan
+        if changed or not known:
+            print('\n'.join(f"     {line}" for line in plan))
+
+    def report(self, sort='total', limit=50):
+        """Aggregated entries, slowest first by total, max, count or recent"""
+        keys = {
+            'total': lambda e: e['total_ms'],
+            'max': lambda e: e['max_ms'],
+            'count': lambda e: e['count'],
+            'recent': lambda e: e['last_seen'],
+        }
+        with self._lock:
+            entries = sorted(self._entries.values(), key=keys.get(sort, keys['total']), reverse=True)[:limit]
+            entries = [dict(e) for e in entries]
+            recent = list(reversed(self._recent))
+        for e in entries:
+            e['avg_ms'] = round(e['total_ms'] / e['count'], 2)
+            e['total_ms'] = round(e['total_ms'], 2)
+            e['max_ms'] = round(e['max_ms'], 2)
+            e['plan_changed'] = e['previous_plan'] is not None
+            e['table_scan'] = migrations.has_table_scan(e['plan'] or [])
+            for field in ('first_seen', 'last_seen', 'plan_at'):
+                e[field] = datetime.fromtimestamp(e[field]).isoformat(timespec='seconds') if e[field] else None
+        return {
+            'threshold_ms': self.threshold * 1000,
+            'stats': self.stats(),
+            'queries': entries,
+            'recent': [{'at': datetime.fromtimestamp(at).isoformat(timespec='seconds'), 'ms': round(ms, 2),
+                        'rows': rows, 'sql': sql, 'params': params} for at, ms, rows, sql, params in recent],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._recent.clear()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, entries=len(self._entries), threshold_ms=self.threshold * 1000)
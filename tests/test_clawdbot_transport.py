@@ -0,0 +1,159 @@
+"""
+HttpTransport against benchmarks/stub_clawdbot.py: gateway calls, the CLI
+fallback when the gateway can't be reached (refused or connect timeout), and
+how a gateway timeout ends a dispatch job.
+"""
+
+import os
+import socket
+import sys
+import time
+
+import pytest
+import requests
+
+import migrations
+from clawdbot_transport import CliTransport, HttpTransport, TransportTimeout, make_transport
+from db import ConnectionPool
+from dispatch_queue import DispatchQueue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from stub_clawdbot import start_server, write_fake_cli  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**options):
+        server, state, url = start_server(**options)
+        servers.append(server)
+        return state, url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    """The stub's `clawdbot` script first on PATH, as make_transport's fallback finds it"""
+    write_fake_cli(str(tmp_path / 'bin'))
+    monkeypatch.setenv('PATH', f"{tmp_path / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}")
+
+
+def closed_port_url():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{s.getsockname()[1]}'
+
+
+def test_http_path(stub):
+    state, url = stub()
+    transport = HttpTransport(url)
+
+    sent = transport.send_message('hello', channel='ops')
+    assert sent.ok and sent.data == {'messageId': 1, 'channel': 'ops'}
+    spawned = transport.spawn_session('do it', 'label-1')
+    assert spawned.ok and spawned.data['childSessionKey'] == 'agent:main:subagent:1'
+    listed = transport.list_sessions(limit=5)
+    assert listed.ok and [s['label'] for s in listed.data['sessions']] == ['label-1']
+    assert all(transport.check().values())
+
+    assert state.counters['message'] == 1 and state.counters['sessions_spawn'] == 1
+    stats = transport.stats()
+    assert stats['calls'] == 4 and stats['failures'] == 0 and not stats['gateway_down']
+    transport.close()
+
+
+def test_gateway_errors_are_returned_without_fallback(stub, fake_cli):
+    _, url = stub(failure_rate=1.0)
+    transport = make_transport('http', url)
+
+    result = transport.send_message('hello')
+    assert not result.ok and result.error == 'Stub failure'
+    stats = transport.stats()
+    assert stats['failures'] == 1 and stats['fallbacks'] == 0 and not stats['gateway_down']
+    transport.close()
+
+
+def test_fallback_when_gateway_refuses(fake_cli):
+    transport = make_transport('http', closed_port_url())
+
+    result = transport.spawn_session('do it', 'label-1')
+    assert result.ok and result.data['childSessionKey'] == 'agent:main:subagent:cli'
+    stats = transport.stats()
+    assert stats['gateway_down'] and stats['fallbacks'] == 1 and stats['fallback']['calls'] == 1
+
+    # Within retry_after the gateway isn't tried again
+    assert transport.list_sessions().ok
+    stats = transport.stats()
+    assert stats['calls'] == 1 and stats['fallbacks'] == 2
+    transport.close()
+
+
+def test_fallback_on_connect_timeout(stub, fake_cli, monkeypatch):
+    state, url = stub()
+    transport = make_transport('http', url)
+
+    def connect_timeout(*args, **kwargs):
+        raise requests.ConnectTimeout('connect timed out')
+
+    monkeypatch.setattr(transport.session, 'post', connect_timeout)
+    result = transport.send_message('hello')
+    assert result.ok
+    stats = transport.stats()
+    assert stats['timeouts'] == 0 and stats['failures'] == 1
+    assert stats['gateway_down'] and stats['fallbacks'] == 1
+    assert state.counters['message'] == 0
+    transport.close()
+
+
+def test_read_timeout_is_a_task_timeout(stub, fake_cli):
+    _, url = stub(latency=1.0)
+    transport = make_transport('http', url)
+
+    with pytest.raises(TransportTimeout):
+        transport.spawn_session('do it', 'label-1', timeout=0.2)
+    stats = transport.stats()
+    assert stats['timeouts'] == 1 and stats['fallbacks'] == 0 and not stats['gateway_down']
+    transport.close()
+
+
+def test_dispatch_job_times_out_on_gateway_timeout(tmp_path, stub):
+    _, url = stub(latency=1.0)
+    transport = HttpTransport(url)
+    pool = ConnectionPool(str(tmp_path / 'dispatch.db'), size=4)
+    with pool.connection() as conn:
+        migrations.migrate(conn)
+        activity_id = conn.execute(
+            "INSERT INTO activities (title, status, position) VALUES ('slow spawn', 'todo', 0)").lastrowid
+        conn.commit()
+
+    def handler(activity, timeout):
+        return transport.spawn_session(activity['title'], f"activity-{activity['id']}", timeout=timeout).ok
+
+    # Fractional timeouts only here; the API accepts whole seconds
+    queue = DispatchQueue(pool.connection, handler, workers=1, default_timeout=0.2, poll_interval=0.1)
+    job = queue.enqueue(activity_id)
+    deadline = time.monotonic() + 10
+    while queue.get_job(job['id'])['status'] in ('queued', 'running') and time.monotonic() < deadline:
+        time.sleep(0.05)
+    queue.stop(timeout=5)
+
+    finished = queue.get_job(job['id'])
+    assert finished['status'] == 'timed_out'
+    assert finished['error'] == 'Dispatch exceeded 0.2s'
+    assert transport.stats()['timeouts'] == 1
+    transport.close()
+    pool.close_all()
+
+
+def test_cli_check_runs_the_configured_command(tmp_path, monkeypatch):
+    command = write_fake_cli(str(tmp_path / 'elsewhere'))
+    monkeypatch.setenv('PATH', str(tmp_path / 'empty'))  # no clawdbot to find by name
+
+    checks = CliTransport(command=command).check()
+    assert checks == {'clawdbot_available': True, 'sessions_spawn_available': True, 'message_tool_available': True}
+    assert not CliTransport().check()['clawdbot_available']
@@ -0,0 +1,112 @@
+"""
+Concurrent writers and readers on ConnectionPool: no "database is locked",
+and every write takes exactly one data version (see migration 4).
+"""
+
+import threading
+
+import pytest
+
+import migrations
+from db import ConnectionPool, PoolTimeout
+
+WRITERS = 8
+READERS = 4
+WRITES = 50  # per writer; each is an insert followed by an update
+
+
+def run_threads(targets):
+    errors = []
+
+    def guarded(target, *args):
+        try:
+            target(*args)
+        except Exception as e:  # collected, so a failing thread fails the test
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=guarded, args=(target, *args)) for target, *args in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(120)
+    return errors
+
+
+@pytest.mark.parametrize('observer', [None, lambda sql, params, seconds, rows: None], ids=['plain', 'timed'])
+def test_concurrent_writers_and_readers(tmp_path, observer):
+    pool = ConnectionPool(str(tmp_path / 'stress.db'), size=WRITERS + READERS, observer=observer)
+    with pool.connection() as conn:
+        migrations.migrate(conn)
+        start_version = conn.execute('SELECT version FROM sync_state').fetchone()[0]
+
+    done = threading.Event()
+    seen_versions = []
+
+    def writer(n):
+        for i in range(WRITES):
+            with pool.connection() as conn:
+                activity_id = conn.execute(
+                    "INSERT INTO activities (title, status, position) VALUES (?, 'todo', ?)",
+                    (f'writer {n} #{i}', n * WRITES + i)).lastrowid
+                conn.commit()
+            with pool.connection() as conn:
+                conn.execute('UPDATE activities SET title = ? WHERE id = ?', (f'edited {n} #{i}', activity_id))
+                conn.commit()
+
+    def reader():
+        last = start_version
+        while not done.is_set():
+            with pool.connection() as conn:
+                version = conn.execute('SELECT version FROM sync_state').fetchone()[0]
+                conn.execute("SELECT COUNT(*) FROM activities WHERE status = 'todo'").fetchone()
+            assert version >= last, f'data version went back from {last} to {version}'
+            last = version
+        seen_versions.append(last)
+
+    writer_errors = []
+
+    def writers_then_stop():
+        writer_errors.extend(run_threads([(writer, n) for n in range(WRITERS)]))
+        done.set()
+
+    errors = run_threads([(writers_then_stop,)] + [(reader,) for _ in range(READERS)])
+    errors += writer_errors
+    assert not [e for e in errors if 'locked' in e], errors
+    assert not errors
+
+    with pool.connection() as conn:
+        rows = conn.execute('SELECT COUNT(*), COUNT(DISTINCT version), MAX(version) FROM activities').fetchone()
+        version = conn.execute('SELECT version FROM sync_state').fetchone()[0]
+        edited = conn.execute("SELECT COUNT(*) FROM activities WHERE title LIKE 'edited %'").fetchone()[0]
+    assert rows[0] == WRITERS * WRITES
+    assert edited == WRITERS * WRITES
+    assert version == start_version + 2 * WRITERS * WRITES  # one insert and one update per write
+    assert rows[1] == rows[0] and rows[2] == version  # every row holds a distinct version
+    assert len(seen_versions) == READERS
+    assert pool.stats()['rollbacks'] == 0
+    pool.close_all()
+
+
+def test_pool_times_out_when_exhausted(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'small.db'), size=1, acquire_timeout=0.2)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(held)
+    with pool.connection() as conn:
+        assert conn.execute('SELECT 1').fetchone()[0] == 1
+    pool.close_all()
+
+
+def test_release_rolls_back_open_transaction(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'rollback.db'), size=2)
+    with pool.connection() as conn:
+        conn.execute('CREATE TABLE t (x)')
+        conn.commit()
+    conn = pool.acquire()
+    conn.execute('INSERT INTO t VALUES (1)')
+    pool.release(conn)
+    with pool.connection() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 0
+    assert pool.stats()['rollbacks'] == 1
+    pool.close_all()
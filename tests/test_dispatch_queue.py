@@ -0,0 +1,46 @@
+"""
+DispatchQueue.enqueue from many threads at once: one active job per activity.
+"""
+
+import threading
+
+import migrations
+from db import ConnectionPool
+from dispatch_queue import DispatchQueue
+
+THREADS = 16
+
+
+def test_concurrent_enqueues_queue_one_job(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'dispatch.db'), size=THREADS)
+    with pool.connection() as conn:
+        migrations.migrate(conn)
+        activity_id = conn.execute(
+            "INSERT INTO activities (title, status, position) VALUES ('spawn once', 'todo', 0)").lastrowid
+        conn.commit()
+
+    release = threading.Event()
+    queue = DispatchQueue(pool.connection, lambda activity, timeout: release.wait(10), workers=1, poll_interval=0.1)
+    start = threading.Barrier(THREADS)
+    jobs, errors = [], []
+
+    def enqueue():
+        start.wait()
+        try:
+            jobs.append(queue.enqueue(activity_id)['id'])
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=enqueue) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    release.set()
+    queue.stop(timeout=5)
+
+    assert not errors
+    assert len(set(jobs)) == 1
+    with pool.connection() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM dispatch_jobs').fetchone()[0] == 1
+    pool.close_all()
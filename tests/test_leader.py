@@ -0,0 +1,51 @@
+"""
+One leader per lock file, takeover when it lets go, and notifications
+relayed through the database to the leader in submission order.
+"""
+
+import threading
+
+import migrations
+from db import ConnectionPool
+from leader import LeaderLock
+from notification_relay import NotificationRelay
+
+
+def test_one_leader_and_takeover(tmp_path):
+    path = str(tmp_path / 'tracker.db.leader')
+    took_over = threading.Event()
+    first = LeaderLock(path, interval=0.05)
+    second = LeaderLock(path, on_acquire=took_over.set, interval=0.05)
+
+    assert first.start()
+    assert not second.start()
+    assert first.is_leader() and not second.is_leader()
+
+    first.stop()
+    first.release()
+    assert took_over.wait(5)
+    assert second.is_leader() and not first.is_leader()
+    assert second.stats()['acquired'] == 1 and second.stats()['leader']
+
+    # A stopped process doesn't take over again
+    assert not first.start()
+    second.stop()
+    second.release()
+
+
+def test_relayed_notifications_reach_the_leader_in_order(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'relay.db'), size=4)
+    with pool.connection() as conn:
+        migrations.migrate(conn)
+    delivered = []
+    follower = NotificationRelay(pool.connection, deliver=None)
+    leader = NotificationRelay(pool.connection, lambda **fields: delivered.append(fields), batch_size=2)
+
+    for n in range(5):
+        follower.submit(text=f'message {n}', kind='info', activity={'id': n}, key=n, summary=None)
+    assert leader.drain() == 5
+    assert [f['text'] for f in delivered] == [f'message {n}' for n in range(5)]
+    assert delivered[0] == {'text': 'message 0', 'kind': 'info', 'activity': {'id': 0}, 'key': 0, 'summary': None}
+    assert leader.drain() == 0
+    assert follower.stats()['submitted'] == 5 and leader.stats()['relayed'] == 5
+    pool.close_all()
@@ -0,0 +1,65 @@
+"""
+SpoolSender start-up: one sender per spool, and recovery of a crashed
+sender's claims that leaves a running sender's cur/ alone.
+"""
+
+import os
+
+import pytest
+
+from notification_service import SpoolBusy, SpoolSender, spool_message
+
+
+def test_second_sender_does_not_recover_running_claims(tmp_path):
+    spool = str(tmp_path / 'spool')
+    sent = []
+    first = SpoolSender(spool, lambda message: sent.append(message) or True, workers=1, legacy_file=None)
+    spool_message('in flight', spool)
+    first.acquire()
+    first.recover()
+    claimed = first.claim()
+    assert len(claimed) == 1
+
+    second = SpoolSender(spool, lambda message: sent.append(message) or True, workers=1, legacy_file=None)
+    with pytest.raises(SpoolBusy):
+        second.run(until_empty=True)
+    assert os.listdir(first.dirs['cur']) == claimed and sent == []
+    second.close()
+
+    first.process(claimed)
+    assert sent == ['in flight']
+    first.close()
+
+
+def test_claims_of_a_crashed_sender_are_sent_again(tmp_path):
+    spool = str(tmp_path / 'spool')
+    crashed = SpoolSender(spool, lambda message: True, workers=1, legacy_file=None)
+    spool_message('interrupted', spool)
+    crashed.acquire()
+    assert len(crashed.claim()) == 1
+    crashed.close()  # releases the lock, as the kernel does when the process dies
+
+    sent = []
+    sender = SpoolSender(spool, lambda message: sent.append(message) or True, workers=1, legacy_file=None)
+    sender.run(until_empty=True)
+    sender.close()
+    assert sent == ['interrupted']
+    assert os.listdir(sender.dirs['cur']) == []
+
+
+def test_unreadable_file_is_dead_lettered(tmp_path):
+    spool = str(tmp_path / 'spool')
+    sent = []
+    sender = SpoolSender(spool, lambda message: sent.append(message) or True, workers=1, legacy_file=None)
+    with open(os.path.join(sender.dirs['new'], '00000000000000000001.bad.msg'), 'wb') as f:
+        f.write(b'\xff\xfe not utf-8')
+    spool_message('fine', spool)
+
+    sender.run(until_empty=True)
+    sender.close()
+    assert sent == ['fine']
+    assert sorted(os.listdir(sender.dirs['dead'])) == ['00000000000000000001.bad.msg',
+                                                       '00000000000000000001.bad.msg.error']
+    with open(os.path.join(sender.dirs['dead'], '00000000000000000001.bad.msg.error')) as f:
+        assert 'unreadable' in f.read()
+    assert os.listdir(sender.dirs['cur']) == []
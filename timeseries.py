@@ -0,0 +1,107 @@
+"""
+AI Activity Tracker - Tracked Time Series
+Every stopped timer is stored as an interval in time_sessions and split into
+hourly and daily buckets in time_buckets, per tool, per project and in total.
+The buckets are written in the same transaction as the session (a trigger
+can't split an interval, so the timer endpoints call record_session), which
+keeps a year of daily totals a few thousand rows however many sessions exist.
+Times are local, like the rest of the activity timestamps.
+"""
+
+from datetime import datetime, timedelta
+
+# bucket size -> (label format, length of a bucket)
+SIZES = {
+    'hour': ('%Y-%m-%d %H:00', timedelta(hours=1)),
+    'day': ('%Y-%m-%d', timedelta(days=1)),
+}
+
+# dimension -> the session column it groups by (None for the overall total)
+DIMENSIONS = {
+    'all': None,
+    'ai_tool': 'ai_tool',
+    'project': 'project',
+}
+
+UPSERT_BUCKET = '''
+    INSERT INTO time_buckets (size, dimension, bucket, value, seconds)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (size, dimension, bucket, value) DO UPDATE SET seconds = seconds + excluded.seconds
+'''
+
+INSERT_SESSION = '''
+    INSERT INTO time_sessions (activity_id, ai_tool, project, started_at, ended_at, seconds)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+def bucket_start(moment, size):
+    if size == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def split(started, seconds, size):
+    """Yield (bucket label, seconds) for an interval of whole seconds"""
+    label, length = SIZES[size]
+    cursor, end = started, started + timedelta(seconds=seconds)
+    while cursor < end:
+        boundary = min(end, bucket_start(cursor, size) + length)
+        yield cursor.strftime(label), int((boundary - cursor).total_seconds())
+        cursor = boundary
+
+
+def bucket_rows(started, seconds, ai_tool, project):
+    """time_buckets rows for one session"""
+    values = {'ai_tool': ai_tool or '', 'project': project or ''}
+    rows = []
+    for size in SIZES:
+        for label, part in split(started, seconds, size):
+            for dimension, column in DIMENSIONS.items():
+                rows.append((size, dimension, label, values[column] if column else '', part))
+    return rows
+
+
+def record_session(conn, activity, started_at, ended_at):
+    """Store one timer interval and add it to the buckets, inside the caller's transaction.
+
+    `activity` supplies id, ai_tool and project; the session keeps the tool
+    and project it was tracked under. Returns the session length in seconds.
+    """
+    started = datetime.fromisoformat(started_at).replace(microsecond=0)
+    seconds = max(0, int((ended_at - started).total_seconds()))
+    conn.execute(INSERT_SESSION, (activity['id'], activity['ai_tool'], activity['project'],
+                                  started.isoformat(), (started + timedelta(seconds=seconds)).isoformat(), seconds))
+    conn.executemany(UPSERT_BUCKET, bucket_rows(started, seconds, activity['ai_tool'], activity['project']))
+    return seconds
+
+
+def expected_buckets(conn):
+    """{(size, dimension, bucket, value): seconds} recomputed from time_sessions"""
+    totals = {}
+    for session in conn.execute('SELECT ai_tool, project, started_at, seconds FROM time_sessions'):
+        started = datetime.fromisoformat(session['started_at'])
+        for size, dimension, label, value, part in bucket_rows(started, session['seconds'],
+                                                               session['ai_tool'], session['project']):
+            key = (size, dimension, label, value)
+            totals[key] = totals.get(key, 0) + part
+    return totals
+
+
+def rebuild(conn):
+    """Recompute time_buckets from time_sessions inside the caller's transaction.
+
+    Returns the number of buckets written.
+    """
+    totals = expected_buckets(conn)
+    conn.execute('DELETE FROM time_buckets')
+    conn.executemany(UPSERT_BUCKET, [key + (seconds,) for key, seconds in totals.items()])
+    return len(totals)
+
+
+def drift(conn):
+    """Number of buckets that disagree with time_sessions (0 when healthy)"""
+    expected = expected_buckets(conn)
+    stored = {tuple(row[:4]): row[4] for row in
+              conn.execute('SELECT size, dimension, bucket, value, seconds FROM time_buckets')}
+    return sum(1 for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))